@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Measure how long it takes to build the model with and without the contracts.
+
+The contracts are enabled or disabled when the modules are imported, so each
+setting is measured in a separate process.
+"""
+import argparse
+import os
+import pathlib
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from typing import List
+
+import rasaeco.contracts
+import rasaeco.et
+import rasaeco.model
+
+
+def _build(scenario_count: int) -> None:
+    """Build an ontology of the given number of synthetic scenarios."""
+    scenarios = []  # type: List[rasaeco.model.Scenario]
+    relations = []  # type: List[rasaeco.model.Relation]
+
+    for i in range(scenario_count):
+        volumetric = [
+            rasaeco.model.Cubelet(
+                aspect_range=rasaeco.model.AspectRange(
+                    first=rasaeco.model.ASPECTS[j % len(rasaeco.model.ASPECTS)],
+                    last=rasaeco.model.ASPECTS[-1],
+                ),
+                phase_range=rasaeco.model.PhaseRange(
+                    first=rasaeco.model.PHASES[j % len(rasaeco.model.PHASES)],
+                    last=rasaeco.model.PHASES[-1],
+                ),
+                level_range=rasaeco.model.LevelRange(
+                    first=rasaeco.model.LEVELS[j % len(rasaeco.model.LEVELS)],
+                    last=rasaeco.model.LEVELS[-1],
+                ),
+            )
+            for j in range(i % 5 + 1)
+        ]
+
+        scenarios.append(
+            rasaeco.model.Scenario(
+                identifier=f"scenario{i}",
+                title=f"Scenario {i}",
+                contact="Somebody",
+                volumetric=volumetric,
+                definitions=rasaeco.model.Definitions(
+                    model_set=set(), def_set=set(), test_set=set(), acceptance_set=set()
+                ),
+                relative_path=pathlib.Path(f"scenario{i}/scenario.md"),
+            )
+        )
+
+        if i > 0:
+            relations.append(
+                rasaeco.model.Relation(
+                    source=f"scenario{i}", target=f"scenario{i // 2}", nature="refines"
+                )
+            )
+
+        for j in range(10):
+            element = ET.Element("ref", {"name": f"scenario{i // 2}#definition{j}"})
+            rasaeco.et.parse_reference_element(element=element)
+
+    rasaeco.model.Ontology(scenarios=scenarios, relations=relations)
+
+
+def _measure(scenario_count: int, repeat: int) -> float:
+    """Measure the best time of building the ontology in this process in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _build(scenario_count=scenario_count)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main() -> int:
+    """Execute the main routine."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scenarios", help="Number of synthetic scenarios", type=int, default=5000
+    )
+    parser.add_argument(
+        "--repeat", help="Number of repetitions per setting", type=int, default=3
+    )
+    parser.add_argument(
+        "--measure",
+        help="Only measure this process and print the time in seconds",
+        action="store_true",
+    )
+    args = parser.parse_args()
+
+    if args.measure:
+        print(_measure(scenario_count=args.scenarios, repeat=args.repeat))
+        return 0
+
+    results = []  # type: List[float]
+    for fast in [False, True]:
+        env = os.environ.copy()
+        env.pop(rasaeco.contracts.FAST_ENVIRONMENT_VARIABLE, None)
+        if fast:
+            env[rasaeco.contracts.FAST_ENVIRONMENT_VARIABLE] = "1"
+
+        output = subprocess.check_output(
+            [
+                sys.executable,
+                __file__,
+                "--measure",
+                "--scenarios",
+                str(args.scenarios),
+                "--repeat",
+                str(args.repeat),
+            ],
+            env=env,
+            encoding="utf-8",
+        )
+        results.append(float(output))
+
+    with_contracts, without_contracts = results
+
+    print(f"Building the model of {args.scenarios} scenarios:")
+    print(f"  with contracts:    {with_contracts:.3f} s")
+    print(f"  without contracts: {without_contracts:.3f} s")
+    print(f"  speed-up:          {with_contracts / without_contracts:.1f}×")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
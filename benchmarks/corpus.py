@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic corpus of scenarios to benchmark the rendering.
+
+The scenarios resemble the sample scenarios: each one has a meta block with
+cubelets and relations, defines models, definitions, test cases and acceptance
+criteria, and references the definitions of its own and of other scenarios.
+The corpus is generated deterministically from the seed.
+"""
+import argparse
+import json
+import pathlib
+import random
+import sys
+from typing import List
+
+import rasaeco.model
+
+#: Number of scenarios grouped in a directory
+GROUP_SIZE = 100
+
+#: Number of definitions of each kind in every scenario
+MODEL_COUNT = 2
+DEF_COUNT = 4
+TEST_COUNT = 1
+ACCEPTANCE_COUNT = 1
+
+_WORDS = (
+    "scaffold crane worker site plan model schedule task defect element "
+    "reception platform permission alert zone machine crew delivery cost "
+    "inspection safety helmet barrier concrete formwork sensor drone"
+).split()
+
+
+def identifier(index: int) -> str:
+    """Generate the identifier of the scenario at the given ``index``."""
+    return f"group{index // GROUP_SIZE}/scenario{index}"
+
+
+def _sentence(rng: random.Random, word_count: int) -> str:
+    """Generate a sentence of filler words."""
+    words = [rng.choice(_WORDS) for _ in range(word_count)]
+    return " ".join(words).capitalize() + "."
+
+
+def _range(rng: random.Random, values: List[str]) -> List[str]:
+    """Pick a random valid range over the ``values``."""
+    first = rng.randrange(len(values))
+    last = rng.randrange(first, min(first + 3, len(values)))
+    return [values[first], values[last]]
+
+
+def scenario_text(
+    index: int, scenario_count: int, relations: int, references: int, seed: int
+) -> str:
+    """
+    Generate the markdown of a scenario.
+
+    The scenario relates to up to ``relations`` other scenarios and contains
+    ``references`` references to the definitions of other scenarios.
+    """
+    rng = random.Random(f"{seed}-{index}")
+
+    def other() -> str:
+        """Pick another scenario at random."""
+        if scenario_count == 1:
+            return identifier(index)
+
+        other_index = rng.randrange(scenario_count - 1)
+        return identifier(other_index if other_index < index else other_index + 1)
+
+    volumetric = []
+    for _ in range(rng.randint(1, 3)):
+        aspect_from, aspect_to = _range(rng, rasaeco.model.ASPECTS)
+        phase_from, phase_to = _range(rng, rasaeco.model.PHASES)
+        level_from, level_to = _range(rng, rasaeco.model.LEVELS)
+
+        volumetric.append(
+            {
+                "aspect_from": aspect_from,
+                "aspect_to": aspect_to,
+                "phase_from": phase_from,
+                "phase_to": phase_to,
+                "level_from": level_from,
+                "level_to": level_to,
+            }
+        )
+
+    targets = sorted(
+        {other() for _ in range(rng.randint(0, relations))} - {identifier(index)}
+    )
+
+    meta = {
+        "title": f"Scenario {index}: {_sentence(rng, 3)[:-1]}",
+        "contact": f"Somebody {index % 37} <somebody{index % 37}@example.com>",
+        "relations": [
+            {"target": target, "nature": rng.choice(["refines", "is instance of"])}
+            for target in targets
+        ],
+        "volumetric": volumetric,
+    }
+
+    parts = [
+        "<rasaeco-meta>",
+        json.dumps(meta, indent=4),
+        "</rasaeco-meta>",
+        "",
+        "## Summary",
+        "",
+        " ".join(_sentence(rng, 12) for _ in range(4)),
+        "",
+        "## Models",
+        "",
+    ]
+
+    for i in range(MODEL_COUNT):
+        parts.extend(
+            [f'<model name="model{i}">', "", _sentence(rng, 15), "", "</model>"]
+        )
+        parts.append("")
+
+    parts.extend(["## Definitions", ""])
+    for i in range(DEF_COUNT):
+        parts.extend(
+            [
+                f'<def name="def{i}">',
+                "",
+                "```bim",
+                f"def{i} is IfcBuildingElementType modeled in model{i % MODEL_COUNT}",
+                "```",
+                "",
+                "</def>",
+                "",
+            ]
+        )
+
+    parts.extend(["## Scenario", ""])
+
+    local_refs = [f'<ref name="def{i}" />' for i in range(DEF_COUNT)] + [
+        f'<modelref name="model{i}" />' for i in range(MODEL_COUNT)
+    ]
+
+    foreign_refs = []  # type: List[str]
+    for _ in range(references):
+        target = other()
+        if rng.random() < 0.75:
+            foreign_refs.append(
+                f'<ref name="{target}#def{rng.randrange(DEF_COUNT)}" />'
+            )
+        else:
+            foreign_refs.append(
+                f'<modelref name="{target}#model{rng.randrange(MODEL_COUNT)}" />'
+            )
+
+    refs = local_refs + foreign_refs
+    rng.shuffle(refs)
+
+    for i in range(0, len(refs), 3):
+        parts.append(
+            " ".join(f"{_sentence(rng, 8)[:-1]} {ref}." for ref in refs[i : i + 3])
+        )
+        parts.append("")
+
+    phase = rng.choice(rasaeco.model.PHASES)
+    level = rng.choice(rasaeco.model.LEVELS)
+    parts.extend(
+        [
+            f'<phase name="{phase}">',
+            f"    {_sentence(rng, 10)}",
+            f'    On <level name="{level}">the {level}</level>.',
+            "</phase>",
+            "",
+            f'See also <scenarioref name="{other()}" />.',
+            "",
+            "## Test Cases",
+            "",
+        ]
+    )
+
+    for i in range(TEST_COUNT):
+        parts.extend(
+            [
+                f'<test name="test{i}">',
+                "",
+                _sentence(rng, 20),
+                "",
+                "</test>",
+                "",
+                f'Tested in <testref name="test{i}" />.',
+                "",
+            ]
+        )
+
+    parts.extend(["## Acceptance Criteria", ""])
+    for i in range(ACCEPTANCE_COUNT):
+        parts.extend(
+            [
+                f'<acceptance name="acceptance{i}">',
+                "",
+                _sentence(rng, 20),
+                "",
+                "</acceptance>",
+                "",
+                f'Accepted by <acceptanceref name="acceptance{i}" />.',
+                "",
+            ]
+        )
+
+    return "\n".join(parts)
+
+
+def generate(
+    scenarios_dir: pathlib.Path,
+    scenario_count: int,
+    relations: int = 3,
+    references: int = 5,
+    seed: int = 0,
+) -> List[pathlib.Path]:
+    """
+    Generate the corpus in the ``scenarios_dir``.
+
+    Return the paths to the generated scenario files.
+    """
+    pths = []  # type: List[pathlib.Path]
+
+    for index in range(scenario_count):
+        pth = scenarios_dir / identifier(index) / "scenario.md"
+        pth.parent.mkdir(parents=True, exist_ok=True)
+
+        pth.write_text(
+            scenario_text(
+                index=index,
+                scenario_count=scenario_count,
+                relations=relations,
+                references=references,
+                seed=seed,
+            ),
+            encoding="utf-8",
+        )
+
+        pths.append(pth)
+
+    return pths
+
+
+def main() -> int:
+    """Execute the main routine."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scenarios_dir", help="Directory to generate the corpus in", required=True
+    )
+    parser.add_argument(
+        "--scenarios", help="Number of scenarios", type=int, default=1000
+    )
+    parser.add_argument(
+        "--relations",
+        help="Maximum number of relations of a scenario",
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        "--references",
+        help="Number of references to other scenarios in a scenario",
+        type=int,
+        default=5,
+    )
+    parser.add_argument("--seed", help="Seed of the generator", type=int, default=0)
+    args = parser.parse_args()
+
+    generate(
+        scenarios_dir=pathlib.Path(args.scenarios_dir),
+        scenario_count=args.scenarios,
+        relations=args.relations,
+        references=args.references,
+        seed=args.seed,
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
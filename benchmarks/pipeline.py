@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Time the stages of the rendering on synthetic corpora and report them as JSON.
+
+Each corpus is rendered three times: from scratch ("cold"), once more without
+any change ("warm") and after a single scenario changed ("incremental").
+The times of the stages are taken from the report of the rendering:
+
+* ``intermediate``: rendering the markdown to the intermediate XML,
+* ``ontology``: loading the ontology, including the validation of references,
+* ``references``: validating the references,
+* ``plots``: rendering the volumetric plots,
+* ``ontology_page``: rendering the ontology page,
+* ``coverage``: rendering the coverage report, and
+* ``html``: rendering the scenarios to HTML.
+"""
+import argparse
+import json
+import pathlib
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, List, Mapping, Optional
+
+import rasaeco
+import rasaeco.contracts
+import rasaeco.manifest
+import rasaeco.render
+
+# The directory of the script is on the path so that we can import the generator.
+import corpus
+
+
+def _render(
+    scenarios_dir: pathlib.Path,
+    jobs: int,
+    changed: Optional[List[pathlib.Path]] = None,
+) -> Mapping[str, Any]:
+    """Render the corpus and return the times in seconds."""
+    report = rasaeco.manifest.Report()
+
+    start = time.perf_counter()
+    errors = rasaeco.render.once(
+        scenarios_dir=scenarios_dir, report=report, jobs=jobs, changed=changed
+    )
+    total = time.perf_counter() - start
+
+    if errors:
+        raise RuntimeError(
+            f"Unexpected errors when rendering the corpus in {scenarios_dir}:\n"
+            + "\n".join(errors)
+        )
+
+    return {
+        "total": total,
+        "stages": dict(report.timings),
+        "rendered": len(report.rendered),
+        "skipped": len(report.skipped),
+    }
+
+
+def _benchmark(
+    scenarios_dir: pathlib.Path,
+    scenario_count: int,
+    relations: int,
+    references: int,
+    seed: int,
+    jobs: int,
+) -> Mapping[str, Any]:
+    """Generate a corpus in the ``scenarios_dir`` and time its rendering."""
+    start = time.perf_counter()
+    pths = corpus.generate(
+        scenarios_dir=scenarios_dir,
+        scenario_count=scenario_count,
+        relations=relations,
+        references=references,
+        seed=seed,
+    )
+    generation = time.perf_counter() - start
+
+    cold = _render(scenarios_dir=scenarios_dir, jobs=jobs)
+    warm = _render(scenarios_dir=scenarios_dir, jobs=jobs)
+
+    changed_pth = pths[0]
+    with changed_pth.open("at", encoding="utf-8") as fid:
+        fid.write("\nThis scenario has been changed for the benchmark.\n")
+
+    incremental = _render(scenarios_dir=scenarios_dir, jobs=jobs, changed=[changed_pth])
+
+    return {
+        "scenarios": scenario_count,
+        "relations": relations,
+        "references": references,
+        "generation": generation,
+        "cold": cold,
+        "warm": warm,
+        "incremental": incremental,
+    }
+
+
+def main() -> int:
+    """Execute the main routine."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--scenarios",
+        help="Sizes of the corpora to benchmark",
+        type=int,
+        nargs="+",
+        default=[100, 1000],
+    )
+    parser.add_argument(
+        "--relations",
+        help="Maximum number of relations of a scenario",
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        "--references",
+        help="Number of references to other scenarios in a scenario",
+        type=int,
+        default=5,
+    )
+    parser.add_argument("--seed", help="Seed of the generator", type=int, default=0)
+    parser.add_argument(
+        "-j", "--jobs", help="Number of rendering processes", type=int, default=1
+    )
+    parser.add_argument(
+        "--output", help="Path to the JSON report; if not set, printed to STDOUT"
+    )
+    args = parser.parse_args()
+
+    runs = []  # type: List[Mapping[str, Any]]
+    for scenario_count in args.scenarios:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            runs.append(
+                _benchmark(
+                    scenarios_dir=pathlib.Path(tmp_dir),
+                    scenario_count=scenario_count,
+                    relations=args.relations,
+                    references=args.references,
+                    seed=args.seed,
+                    jobs=args.jobs,
+                )
+            )
+
+        print(
+            f"Benchmarked {scenario_count} scenarios "
+            f"in {runs[-1]['cold']['total']:.1f} seconds (cold).",
+            file=sys.stderr,
+        )
+
+    result = {
+        "rasaeco": rasaeco.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "contracts": rasaeco.contracts.ENABLED,
+        "jobs": args.jobs,
+        "seed": args.seed,
+        "runs": runs,
+    }
+
+    text = json.dumps(result, indent=2)
+    if args.output is not None:
+        pathlib.Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
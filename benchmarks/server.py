@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Measure the throughput and the latency of the demo server under concurrent clients.
+
+A synthetic corpus is rendered and served. Each client requests the rendered
+pages and plots at random over a persistent connection for the given duration.
+The results are reported as JSON.
+"""
+import argparse
+import http.client
+import io
+import json
+import pathlib
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, List, Mapping
+
+import rasaeco.live_reload
+import rasaeco.pyrasaeco_render
+import rasaeco.render
+import rasaeco.serving
+
+# The directory of the script is on the path so that we can import the generator.
+import corpus
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Compute the percentile of the sorted ``values`` by the nearest rank."""
+    if not values:
+        return float("nan")
+
+    rank = max(0, min(len(values) - 1, int(round(percent / 100.0 * len(values))) - 1))
+    return values[rank]
+
+
+def _client(
+    port: int,
+    paths: List[str],
+    deadline: float,
+    seed: int,
+    latencies: List[float],
+    failures: List[str],
+) -> None:
+    """Request the paths at random over a persistent connection until the deadline."""
+    rng = random.Random(seed)
+
+    connection = http.client.HTTPConnection("localhost", port, timeout=30.0)
+    try:
+        while time.perf_counter() < deadline:
+            path = rng.choice(paths)
+
+            start = time.perf_counter()
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException) as exception:
+                failures.append(f"{path}: {exception}")
+                connection.close()
+                continue
+
+            if response.status != 200:
+                failures.append(f"{path}: {response.status}")
+                continue
+
+            latencies.append(time.perf_counter() - start)
+    finally:
+        connection.close()
+
+
+def _benchmark(
+    scenarios_dir: pathlib.Path,
+    clients: int,
+    duration: float,
+    workers: int,
+    max_pending: int,
+) -> Mapping[str, Any]:
+    """Serve the rendered ``scenarios_dir`` and load it with the ``clients``."""
+    paths = sorted(
+        "/" + pth.relative_to(scenarios_dir).as_posix()
+        for pattern in ["**/*.html", "**/volumetric*.svg"]
+        for pth in scenarios_dir.glob(pattern)
+    )
+
+    server = rasaeco.pyrasaeco_render.ThreadedServer(
+        port=0,
+        scenarios_dir=scenarios_dir,
+        stdout=io.StringIO(),
+        stderr=io.StringIO(),
+        hub=rasaeco.live_reload.Hub(),
+        workers=workers,
+        max_pending=max_pending,
+    )
+
+    latencies_per_client = [[] for _ in range(clients)]  # type: List[List[float]]
+    failures_per_client = [[] for _ in range(clients)]  # type: List[List[str]]
+
+    with server:
+        deadline = time.perf_counter() + duration
+        threads = [
+            threading.Thread(
+                target=_client,
+                args=(
+                    server.port,
+                    paths,
+                    deadline,
+                    i,
+                    latencies_per_client[i],
+                    failures_per_client[i],
+                ),
+            )
+            for i in range(clients)
+        ]
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(
+        latency
+        for client_latencies in latencies_per_client
+        for latency in client_latencies
+    )
+    failures = [
+        failure
+        for client_failures in failures_per_client
+        for failure in client_failures
+    ]
+
+    return {
+        "clients": clients,
+        "workers": workers,
+        "max_pending": max_pending,
+        "duration": elapsed,
+        "requests": len(latencies),
+        "failures": len(failures),
+        "requests_per_second": len(latencies) / elapsed,
+        "latency_ms": {
+            "p50": 1000.0 * _percentile(latencies, 50.0),
+            "p90": 1000.0 * _percentile(latencies, 90.0),
+            "p99": 1000.0 * _percentile(latencies, 99.0),
+            "max": 1000.0 * latencies[-1] if latencies else float("nan"),
+        },
+    }
+
+
+def main() -> int:
+    """Execute the main routine."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--clients",
+        help="Numbers of concurrent clients to benchmark",
+        type=int,
+        nargs="+",
+        default=[1, 12, 48],
+    )
+    parser.add_argument(
+        "--duration", help="Seconds to load the server", type=float, default=5.0
+    )
+    parser.add_argument(
+        "--workers",
+        help="Number of threads of the server",
+        type=int,
+        default=rasaeco.serving.DEFAULT_WORKERS,
+    )
+    parser.add_argument(
+        "--max_pending",
+        help="Number of connections waiting for a thread of the server",
+        type=int,
+        default=rasaeco.serving.DEFAULT_MAX_PENDING,
+    )
+    parser.add_argument(
+        "--scenarios", help="Number of synthetic scenarios", type=int, default=50
+    )
+    parser.add_argument(
+        "--output", help="Path to the JSON report; if not set, printed to STDOUT"
+    )
+    args = parser.parse_args()
+
+    runs = []  # type: List[Mapping[str, Any]]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        scenarios_dir = pathlib.Path(tmp_dir)
+        corpus.generate(scenarios_dir=scenarios_dir, scenario_count=args.scenarios)
+
+        errors = rasaeco.render.once(scenarios_dir=scenarios_dir)
+        if errors:
+            print("\n".join(errors), file=sys.stderr)
+            return 1
+
+        for clients in args.clients:
+            runs.append(
+                _benchmark(
+                    scenarios_dir=scenarios_dir,
+                    clients=clients,
+                    duration=args.duration,
+                    workers=args.workers,
+                    max_pending=args.max_pending,
+                )
+            )
+
+            print(
+                f"Benchmarked {clients} clients: "
+                f"{runs[-1]['requests_per_second']:.0f} requests/s, "
+                f"p99 {runs[-1]['latency_ms']['p99']:.1f} ms.",
+                file=sys.stderr,
+            )
+
+    text = json.dumps({"scenarios": args.scenarios, "runs": runs}, indent=2)
+    if args.output is not None:
+        pathlib.Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
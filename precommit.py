@@ -36,6 +36,7 @@ def main() -> int:
         "precommit.py",
         "setup.py",
         "package_sample_scenarios.py",
+        "benchmarks",
     ]
 
     if overwrite:
@@ -44,7 +45,7 @@ def main() -> int:
         subprocess.check_call(["black", "--check"] + black_targets, cwd=str(repo_root))
 
     print("Mypy'ing...")
-    mypy_targets = ["rasaeco", "tests"]
+    mypy_targets = ["rasaeco", "tests", "benchmarks"]
     subprocess.check_call(["mypy", "--strict"] + mypy_targets, cwd=str(repo_root))
 
     print("Pydocstyle'ing...")
@@ -55,6 +56,9 @@ def main() -> int:
         env = os.environ.copy()
         env["ICONTRACT_SLOW"] = "true"
 
+        # The tests need to check the contracts on the hot paths as well.
+        env.pop("RASAECO_FAST", None)
+
         subprocess.check_call(
             ["coverage", "run", "--source", "rasaeco", "-m", "unittest", "discover"],
             cwd=str(repo_root),
@@ -1 +1,3 @@
 """Help analyze software requirements in AECO industry."""
+
+__version__ = "0.0.15"
@@ -0,0 +1,12 @@
+"""Decide whether the contracts on the hot paths are checked at runtime."""
+import os
+
+#: Environment variable which disables the contracts on the hot paths if set to 1
+FAST_ENVIRONMENT_VARIABLE = "RASAECO_FAST"
+
+#: Indicate whether the contracts on the hot paths are checked.
+#:
+#: The contracts are enabled or disabled once when the modules are imported,
+#: so that the disabled contracts incur no overhead at all. Hence the environment
+#: variable needs to be set before the program starts.
+ENABLED = os.environ.get(FAST_ENVIRONMENT_VARIABLE, "") != "1"
@@ -0,0 +1,229 @@
+"""Analyze how the scenarios cover the scenario space and how they overlap."""
+import dataclasses
+import xml.sax.saxutils
+from typing import List, Sequence
+
+import icontract
+import numpy as np
+
+import rasaeco.model
+import rasaeco.volumetric
+
+#: Version of the coverage report; bump it whenever the report changes
+VERSION = 1
+
+#: Default number of the most overlapping pairs of scenarios to report
+DEFAULT_PAIR_LIMIT = 100
+
+# Upper bound on the number of entries of the overlap matrix computed at once so
+# that the memory stays bounded on large corpora
+_CHUNK = 1 << 22
+
+
+@icontract.ensure(lambda result: result.shape == rasaeco.volumetric.SHAPE)
+def count(masks: Sequence[int]) -> np.ndarray:
+    """Count for each voxel of the scenario space how many occupancy masks cover it."""
+    return rasaeco.volumetric.unpack(masks=masks).sum(axis=0, dtype=np.int64)
+
+
+@dataclasses.dataclass
+class Pair:
+    """Represent the overlap between two scenarios given by their indices."""
+
+    first: int
+    second: int
+
+    #: Number of voxels occupied by both scenarios
+    shared: int
+
+    #: Jaccard index of the occupied voxels
+    jaccard: float
+
+
+def _best(
+    jaccard: np.ndarray, shared: np.ndarray, indices: np.ndarray, limit: int
+) -> np.ndarray:
+    """
+    Select the ``limit`` best among the ``indices`` of the pairs.
+
+    The pairs are ordered by descending Jaccard index, descending number of shared
+    voxels and ascending index.
+    """
+    if len(indices) <= limit:
+        return indices
+
+    # Only the ties at the threshold need to be ordered in full.
+    threshold = -np.partition(-jaccard[indices], limit - 1)[limit - 1]
+
+    better = indices[jaccard[indices] > threshold]
+    ties = indices[jaccard[indices] == threshold]
+
+    ties = ties[np.lexsort((ties, -shared[ties]))[: limit - len(better)]]
+
+    return np.concatenate([better, ties])
+
+
+@icontract.require(lambda limit: limit >= 0)
+@icontract.ensure(lambda limit, result: len(result) <= limit)
+@icontract.ensure(lambda result: all(pair.first < pair.second for pair in result))
+def most_overlapping(masks: Sequence[int], limit: int) -> List[Pair]:
+    """
+    Find the pairs of masks with the highest Jaccard index.
+
+    The overlap matrix is computed in batches of rows as matrix products over
+    all the masks. Only the pairs which share at least one voxel are reported.
+
+    Return at most ``limit`` pairs, sorted by descending Jaccard index,
+    descending number of shared voxels and the indices.
+    """
+    if limit == 0 or len(masks) < 2:
+        return []
+
+    # Single-precision products count the voxels exactly as there are only 245
+    # voxels, while they are considerably faster than the integer products.
+    voxels = rasaeco.volumetric.unpack(masks=masks).reshape(len(masks), -1)
+    voxels = voxels.astype(np.float32)
+
+    counts = voxels.sum(axis=1, dtype=np.float64)
+
+    rows = max(1, _CHUNK // len(masks))
+
+    firsts = []  # type: List[np.ndarray]
+    seconds = []  # type: List[np.ndarray]
+    shareds = []  # type: List[np.ndarray]
+    jaccards = []  # type: List[np.ndarray]
+
+    for start in range(0, len(masks), rows):
+        end = min(start + rows, len(masks))
+
+        # Consider each pair only once and without the pairs of a mask with itself
+        shared = np.triu(
+            np.matmul(voxels[start:end], voxels.T).astype(np.float64), k=start + 1
+        )
+
+        united = counts[start:end, None] + counts[None, :] - shared
+        jaccard = np.divide(
+            shared, united, out=np.zeros_like(shared), where=shared > 0
+        ).ravel()
+
+        candidates = _best(
+            jaccard=jaccard,
+            shared=shared.ravel(),
+            indices=np.flatnonzero(jaccard),
+            limit=limit,
+        )
+
+        first, second = np.divmod(candidates, len(masks))
+        firsts.append(first + start)
+        seconds.append(second)
+        shareds.append(shared.ravel()[candidates])
+        jaccards.append(jaccard[candidates])
+
+    first = np.concatenate(firsts)
+    second = np.concatenate(seconds)
+    shared = np.concatenate(shareds)
+    jaccard = np.concatenate(jaccards)
+
+    order = np.lexsort((second, first, -shared, -jaccard))[:limit]
+
+    return [
+        Pair(
+            first=int(first[i]),
+            second=int(second[i]),
+            shared=int(round(float(shared[i]))),
+            jaccard=float(jaccard[i]),
+        )
+        for i in order
+    ]
+
+
+# Size of a cell of the heatmap in pixels
+_CELL = 28
+
+# Margins of the heatmap for the labels in pixels
+_LEFT = 110
+_TOP = 30
+_BOTTOM = 90
+_GAP = 20
+
+# Color of the cells covered by the most scenarios
+_FULL = (27, 103, 156)
+
+
+@icontract.require(lambda coverage: coverage.shape == rasaeco.volumetric.SHAPE)
+def to_svg(coverage: np.ndarray) -> str:
+    """
+    Draw the coverage as a heatmap with a panel of levels × aspects per phase.
+
+    The darker the cell, the more scenarios cover it. The uncovered cells are white.
+    """
+    phase_count, level_count, aspect_count = rasaeco.volumetric.SHAPE
+
+    panel_width = aspect_count * _CELL
+    width = _LEFT + phase_count * panel_width + (phase_count - 1) * _GAP + _GAP
+    height = _TOP + level_count * _CELL + _BOTTOM
+
+    maximum = max(1, int(coverage.max()))
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" version="1.1" '
+        f'width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" '
+        f'font-family="sans-serif" font-size="11">\n'
+    ]
+
+    for i, level in enumerate(rasaeco.model.LEVELS):
+        y = _TOP + (i + 0.5) * _CELL
+        parts.append(
+            f'<text x="{_LEFT - 6}" y="{y:g}" text-anchor="end" '
+            f'dominant-baseline="middle" fill="#ff0000">'
+            f"{xml.sax.saxutils.escape(level)}</text>\n"
+        )
+
+    for phase_index, phase in enumerate(rasaeco.model.PHASES):
+        left = _LEFT + phase_index * (panel_width + _GAP)
+
+        parts.append(
+            f'<text x="{left + panel_width / 2:g}" y="{_TOP - 10}" '
+            f'text-anchor="middle" fill="#008000">'
+            f"{xml.sax.saxutils.escape(phase)}</text>\n"
+        )
+
+        for level_index in range(level_count):
+            for aspect_index in range(aspect_count):
+                value = int(coverage[phase_index, level_index, aspect_index])
+                ratio = value / maximum
+
+                fill = tuple(
+                    int(round(255 + (channel - 255) * ratio)) for channel in _FULL
+                )
+
+                x = left + aspect_index * _CELL
+                y = _TOP + level_index * _CELL
+
+                parts.append(
+                    f'<rect x="{x}" y="{y}" width="{_CELL}" height="{_CELL}" '
+                    f'fill="#{fill[0]:02x}{fill[1]:02x}{fill[2]:02x}" '
+                    f'stroke="#cccccc" stroke-width="0.5"/>\n'
+                )
+
+                if value > 0:
+                    parts.append(
+                        f'<text x="{x + _CELL / 2:g}" y="{y + _CELL / 2:g}" '
+                        f'text-anchor="middle" dominant-baseline="middle" '
+                        f'fill="{"#ffffff" if ratio > 0.5 else "#000000"}">'
+                        f"{value}</text>\n"
+                    )
+
+        for aspect_index, aspect in enumerate(rasaeco.model.ASPECTS):
+            x = left + (aspect_index + 0.5) * _CELL
+            y = _TOP + level_count * _CELL + 6
+            parts.append(
+                f'<text x="{x:g}" y="{y}" text-anchor="end" '
+                f'transform="rotate(-60 {x:g} {y})" fill="#0000ff">'
+                f"{xml.sax.saxutils.escape(aspect)}</text>\n"
+            )
+
+    parts.append("</svg>\n")
+
+    return "".join(parts)
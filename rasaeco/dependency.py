@@ -0,0 +1,360 @@
+"""Track the dependencies between the scenarios to limit re-validation and re-rendering."""
+import json
+import pathlib
+import xml.etree.ElementTree as ET
+from typing import (
+    MutableMapping,
+    Set,
+    Optional,
+    Tuple,
+    Any,
+    Iterable,
+    List,
+    Mapping,
+    cast,
+)
+
+import rasaeco
+import rasaeco.et
+import rasaeco.manifest
+import rasaeco.meta
+import rasaeco.model
+import rasaeco.output
+
+#: Version of the format of the stored graph; graphs in any other format are ignored
+FORMAT = 3
+
+
+class Reference:
+    """Represent a reference in the body of a scenario."""
+
+    def __init__(
+        self, tag: str, scenario_id: Optional[str], name: str, element_text: str
+    ) -> None:
+        """
+        Initialize with the given values.
+
+        The ``scenario_id`` is None if the reference is local to the scenario.
+        For ``<scenarioref>``, both ``scenario_id`` and ``name`` refer to
+        the referenced scenario. The ``element_text`` is used in the messages.
+        """
+        self.tag = tag
+        self.scenario_id = scenario_id
+        self.name = name
+        self.element_text = element_text
+
+
+class Summary:
+    """Summarize a scenario as far as the other scenarios are concerned."""
+
+    def __init__(
+        self,
+        digest: str,
+        meta: rasaeco.meta.Meta,
+        definitions: rasaeco.model.Definitions,
+        references: List[Reference],
+        relation_targets: Set[str],
+        validated: bool,
+    ) -> None:
+        """
+        Initialize with the given values.
+
+        The ``digest`` stands for the content of the scenario the summary was
+        extracted from. The ``meta`` is kept so that the unchanged scenarios need
+        not be read again. The ``references`` are given in the body, while
+        the ``relation_targets`` are the identifiers of the scenarios related to
+        in the meta information.
+        """
+        self.digest = digest
+        self.meta = meta
+        self.definitions = definitions
+        self.references = references
+        self.relation_targets = relation_targets
+        self.validated = validated
+
+        self.referenced_scenarios = {
+            reference.scenario_id
+            for reference in references
+            if reference.scenario_id is not None
+        }  # type: Set[str]
+
+
+def extract_references(root: ET.Element) -> List[Reference]:
+    """
+    Collect the references in the element tree.
+
+    The references are grouped by the tag and given in the document order
+    within a group.
+    """
+    result = []  # type: List[Reference]
+
+    for tag in ["modelref", "ref", "testref", "acceptanceref"]:
+        for element in root.iter(tag):
+            scenario_id, name = rasaeco.et.parse_reference_element(element=element)
+            result.append(
+                Reference(
+                    tag=tag,
+                    scenario_id=scenario_id,
+                    name=name,
+                    element_text=rasaeco.et.to_str(element),
+                )
+            )
+
+    for element in root.iter("scenarioref"):
+        result.append(
+            Reference(
+                tag="scenarioref",
+                scenario_id=element.attrib["name"],
+                name=element.attrib["name"],
+                element_text=rasaeco.et.to_str(element),
+            )
+        )
+
+    return result
+
+
+class Graph:
+    """Represent the dependencies between the scenarios together with a reverse index."""
+
+    def __init__(self) -> None:
+        """Initialize as an empty graph."""
+        self._summaries = dict()  # type: MutableMapping[str, Summary]
+
+        # Reverse index: scenario → scenarios referencing it in their bodies
+        self._referrers = dict()  # type: MutableMapping[str, Set[str]]
+
+        # Reverse index: scenario → scenarios relating to it in their meta information
+        self._relation_sources = dict()  # type: MutableMapping[str, Set[str]]
+
+    @property
+    def summaries(self) -> Mapping[str, Summary]:
+        """Map scenario identifiers to their summaries."""
+        return self._summaries
+
+    def put(self, identifier: str, summary: Summary) -> None:
+        """Set the summary of the scenario and update the reverse index."""
+        self.remove(identifier=identifier)
+
+        self._summaries[identifier] = summary
+
+        for target in summary.referenced_scenarios:
+            self._referrers.setdefault(target, set()).add(identifier)
+
+        for target in summary.relation_targets:
+            self._relation_sources.setdefault(target, set()).add(identifier)
+
+    def remove(self, identifier: str) -> None:
+        """Remove the summary of the scenario, if any, and update the reverse index."""
+        summary = self._summaries.pop(identifier, None)
+        if summary is None:
+            return
+
+        for reverse_index, targets in [
+            (self._referrers, summary.referenced_scenarios),
+            (self._relation_sources, summary.relation_targets),
+        ]:
+            for target in targets:
+                sources = reverse_index.get(target, None)
+                if sources is not None:
+                    sources.discard(identifier)
+                    if len(sources) == 0:
+                        del reverse_index[target]
+
+    def referrers(self, identifiers: Iterable[str]) -> Set[str]:
+        """Find the scenarios which reference any of the given ones in their bodies."""
+        result = set()  # type: Set[str]
+        for identifier in identifiers:
+            result.update(self._referrers.get(identifier, set()))
+
+        return result
+
+    def relation_sources(self, identifier: str) -> Set[str]:
+        """Find the scenarios which relate to the given one in their meta information."""
+        return set(self._relation_sources.get(identifier, set()))
+
+    def dependents(self, identifiers: Iterable[str]) -> Set[str]:
+        """
+        Find the scenarios whose rendering depends on any of the given ones.
+
+        These are the scenarios which reference the given scenarios in their bodies,
+        the scenarios referenced by the given ones as they list their referrers,
+        as well as the scenarios in relation with the given scenarios (in either
+        direction).
+        """
+        result = set()  # type: Set[str]
+        for identifier in identifiers:
+            result.update(self._referrers.get(identifier, set()))
+            result.update(self._relation_sources.get(identifier, set()))
+
+            summary = self._summaries.get(identifier, None)
+            if summary is not None:
+                result.update(summary.referenced_scenarios)
+                result.update(summary.relation_targets)
+
+        return result
+
+
+def graph_path(scenarios_dir: pathlib.Path) -> pathlib.Path:
+    """Generate the path to the stored dependency graph of the scenarios directory."""
+    return scenarios_dir / rasaeco.manifest.CACHE_DIR / "dependencies.json"
+
+
+def _summary_from_jsonable(data: Any) -> Optional[Summary]:
+    """Parse the summary from its JSON-able representation, if possible."""
+    try:
+        definitions = data["definitions"]
+
+        # The meta information has been validated before it was stored.
+        if not isinstance(data["meta"], dict):
+            return None
+
+        return Summary(
+            digest=str(data["digest"]),
+            meta=cast(rasaeco.meta.Meta, data["meta"]),
+            definitions=rasaeco.model.Definitions(
+                model_set=set(map(str, definitions["model_set"])),
+                def_set=set(map(str, definitions["def_set"])),
+                test_set=set(map(str, definitions["test_set"])),
+                acceptance_set=set(map(str, definitions["acceptance_set"])),
+            ),
+            references=[
+                Reference(
+                    tag=str(reference["tag"]),
+                    scenario_id=(
+                        None
+                        if reference["scenario_id"] is None
+                        else str(reference["scenario_id"])
+                    ),
+                    name=str(reference["name"]),
+                    element_text=str(reference["element_text"]),
+                )
+                for reference in data["references"]
+            ],
+            relation_targets=set(map(str, data["relation_targets"])),
+            validated=bool(data["validated"]),
+        )
+    except (KeyError, TypeError):
+        return None
+
+
+def _summary_to_jsonable(summary: Summary) -> Mapping[str, Any]:
+    """Convert the summary to its JSON-able representation."""
+    return {
+        "digest": summary.digest,
+        "meta": summary.meta,
+        "definitions": {
+            "model_set": sorted(summary.definitions.model_set),
+            "def_set": sorted(summary.definitions.def_set),
+            "test_set": sorted(summary.definitions.test_set),
+            "acceptance_set": sorted(summary.definitions.acceptance_set),
+        },
+        "references": [
+            {
+                "tag": reference.tag,
+                "scenario_id": reference.scenario_id,
+                "name": reference.name,
+                "element_text": reference.element_text,
+            }
+            for reference in summary.references
+        ],
+        "relation_targets": sorted(summary.relation_targets),
+        "validated": summary.validated,
+    }
+
+
+def load(scenarios_dir: pathlib.Path) -> Tuple[Graph, Optional[str]]:
+    """
+    Load the dependency graph of the scenarios directory.
+
+    If the graph is missing or can not be used, an empty graph is returned.
+
+    Return (graph, the reason why the stored graph was discarded if any).
+    """
+    graph = Graph()
+
+    pth = graph_path(scenarios_dir=scenarios_dir)
+    if not pth.exists():
+        return graph, None
+
+    data = None  # type: Optional[Any]
+    try:
+        data = json.loads(pth.read_text(encoding="utf-8"))
+    except Exception as exception:
+        return graph, f"Failed to read the dependency graph {pth}: {exception}"
+
+    if (
+        not isinstance(data, dict)
+        or data.get("format", None) != FORMAT
+        or not isinstance(data.get("summaries", None), dict)
+    ):
+        return graph, f"The dependency graph {pth} is in an unexpected format."
+
+    # The scenarios might be parsed or validated differently by another version
+    # of rasaeco even though they did not change.
+    if data.get("version", None) != rasaeco.__version__:
+        return (
+            graph,
+            f"The dependency graph {pth} has been recorded by rasaeco "
+            f"{data.get('version', None)}, not by {rasaeco.__version__}.",
+        )
+
+    for identifier, summary_data in data["summaries"].items():
+        summary = _summary_from_jsonable(summary_data)
+        if summary is None:
+            return Graph(), f"The dependency graph {pth} is in an unexpected format."
+
+        graph.put(identifier=identifier, summary=summary)
+
+    return graph, None
+
+
+def save(graph: Graph, scenarios_dir: pathlib.Path) -> Optional[str]:
+    """
+    Store the dependency graph in the cache directory of the scenarios.
+
+    Return error if any.
+    """
+    pth = graph_path(scenarios_dir=scenarios_dir)
+    tmp_pth = pth.parent / (pth.name + ".tmp")
+
+    summaries = {
+        identifier: _summary_to_jsonable(graph.summaries[identifier])
+        for identifier in sorted(graph.summaries)
+    }
+
+    # No indentation so that the fast C encoder is used on large trees
+    data = json.dumps(
+        {"format": FORMAT, "version": rasaeco.__version__, "summaries": summaries}
+    ).encode("utf-8")
+
+    try:
+        if rasaeco.output.unchanged(path=pth, data=data):
+            return None
+
+        pth.parent.mkdir(exist_ok=True)
+        tmp_pth.write_bytes(data)
+        tmp_pth.replace(pth)
+    except Exception as exception:
+        return f"Failed to store the dependency graph to {pth}: {exception}"
+
+    return None
+
+
+def stale_identifiers(graph: Graph, digests: Mapping[str, str]) -> List[str]:
+    """
+    Determine the scenarios whose summaries in the graph are out-of-date.
+
+    The ``digests`` map the identifiers of all the current scenarios to the digests
+    of their content. The scenarios which do not exist anymore are also stale.
+    """
+    result = []  # type: List[str]
+    for identifier, digest in digests.items():
+        summary = graph.summaries.get(identifier, None)
+        if summary is None or summary.digest != digest:
+            result.append(identifier)
+
+    for identifier in graph.summaries:
+        if identifier not in digests:
+            result.append(identifier)
+
+    return sorted(result)
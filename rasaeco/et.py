@@ -6,6 +6,8 @@ from typing import Tuple, Optional
 
 import icontract
 
+import rasaeco.contracts
+
 
 def to_str(element: ET.Element) -> str:
     """Dump the element to a string."""
@@ -20,7 +22,8 @@ def to_str(element: ET.Element) -> str:
 
 
 @icontract.require(
-    lambda element: element.tag in ["ref", "modelref", "testref", "acceptanceref"]
+    lambda element: element.tag in ["ref", "modelref", "testref", "acceptanceref"],
+    enabled=rasaeco.contracts.ENABLED,
 )
 def parse_reference_element(element: ET.Element) -> Tuple[Optional[str], str]:
     """Extract the scenario identifier and the name from a reference element."""
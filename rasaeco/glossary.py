@@ -0,0 +1,65 @@
+"""Index which scenarios reference the definitions of the other scenarios."""
+from typing import Dict, List, Mapping, MutableMapping, Tuple
+
+import rasaeco.dependency
+
+#: Map the reference tags to the tags of the definitions they refer to
+TARGET_TAGS = {
+    "modelref": "model",
+    "ref": "def",
+    "testref": "test",
+    "acceptanceref": "acceptance",
+}
+
+
+class Referrer:
+    """Represent a scenario referencing a definition of another scenario."""
+
+    def __init__(self, identifier: str, title: str) -> None:
+        """Initialize with the given values."""
+        self.identifier = identifier
+        self.title = title
+
+
+#: Definition as (tag of the definition, name) → scenarios referencing it
+Backlinks = Mapping[Tuple[str, str], List[Referrer]]
+
+
+def index(
+    summaries: Mapping[str, rasaeco.dependency.Summary]
+) -> Mapping[str, Backlinks]:
+    """
+    Collect the backlinks of the definitions from the references of all scenarios.
+
+    Each reference is visited once. The referrers of a definition are listed once
+    each and ordered by their identifiers. The references within a scenario to
+    its own definitions are not considered.
+
+    Return scenario identifier → backlinks of its definitions.
+    """
+    result = dict()  # type: MutableMapping[str, Dict[Tuple[str, str], List[Referrer]]]
+
+    # The scenarios are visited in order so that the referrers come sorted and
+    # the repeated references from the same scenario are consecutive.
+    for identifier in sorted(summaries):
+        summary = summaries[identifier]
+
+        for reference in summary.references:
+            target_tag = TARGET_TAGS.get(reference.tag, None)
+            if (
+                target_tag is None
+                or reference.scenario_id is None
+                or reference.scenario_id == identifier
+            ):
+                continue
+
+            referrers = result.setdefault(reference.scenario_id, dict()).setdefault(
+                (target_tag, reference.name), []
+            )
+
+            if len(referrers) == 0 or referrers[-1].identifier != identifier:
+                referrers.append(
+                    Referrer(identifier=identifier, title=summary.meta["title"])
+                )
+
+    return result
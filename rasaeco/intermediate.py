@@ -1,16 +1,33 @@
-"""Render the scenarios to the intermediate representation as XML files."""
+"""Render the scenarios to the intermediate representation as XML element trees."""
 import itertools
-import json
 import pathlib
 import xml.etree.ElementTree as ET
-from typing import List, Optional, MutableMapping, Set, Tuple, Protocol
+from typing import (
+    List,
+    Optional,
+    MutableMapping,
+    Set,
+    Tuple,
+    Protocol,
+    Mapping,
+    Any,
+    Dict,
+    Iterable,
+)
 
 import icontract
 import marko
 
+import rasaeco.contracts
+import rasaeco.dependency
 import rasaeco.et
+import rasaeco.manifest
+import rasaeco.markdown_cache
 import rasaeco.meta
 import rasaeco.model
+import rasaeco.output
+import rasaeco.profiling
+import rasaeco.search
 
 
 def as_xml_path(scenario_path: pathlib.Path) -> pathlib.Path:
@@ -18,15 +35,80 @@ def as_xml_path(scenario_path: pathlib.Path) -> pathlib.Path:
     return scenario_path.parent / (scenario_path.stem + ".xml")
 
 
-def _verify_all_tags_closed(xml_text: str) -> Optional[str]:
+class Intermediate:
     """
-    Verify that all the tags were properly closed in the XML given as text.
+    Represent the intermediate representation of a scenario in memory.
 
-    Return error if any.
+    The element tree is carried between the rendering stages so that a scenario
+    is parsed only once. When pickled, *e.g.*, to be sent to a worker process,
+    only the text is transferred and the tree is parsed anew on the other side.
+    """
+
+    def __init__(
+        self,
+        digest: str,
+        text: str,
+        root: Optional[ET.Element],
+        definitions: rasaeco.model.Definitions,
+        references: List[rasaeco.dependency.Reference],
+        meta: Optional[rasaeco.meta.Meta],
+        meta_errors: List[str],
+        terms: Mapping[str, int],
+    ) -> None:
+        """
+        Initialize with the given values.
+
+        The ``digest`` stands for the content of the scenario markdown while
+        the ``text`` is the intermediate representation as XML.
+
+        The ``meta`` is parsed from the same content so that the scenario markdown
+        need not be read again when loading the ontology. If it could not be parsed,
+        the ``meta_errors`` tell why.
+
+        The ``terms`` map the terms of the scenario to their scores in the search
+        index so that the index need not parse the scenario again.
+        """
+        self.digest = digest
+        self.text = text
+        self._root = root
+        self.definitions = definitions
+        self.references = references
+        self.meta = meta
+        self.meta_errors = meta_errors
+        self.terms = terms
+
+    def root(self) -> ET.Element:
+        """Get the root of the element tree, parsing the text if necessary."""
+        if self._root is None:
+            self._root = ET.fromstring(self.text)
+
+        return self._root
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Leave out the element tree when pickling."""
+        state = self.__dict__.copy()
+        state["_root"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore from the pickled state."""
+        self.__dict__.update(state)
+
+
+def _parse_verifying_tags_closed(
+    xml_text: str,
+) -> Tuple[Optional[ET.Element], Optional[str]]:
+    """
+    Parse the XML given as text and verify that all the tags were properly closed.
+
+    Return (root element, error if any).
     """
     parser = ET.XMLPullParser(["start", "end"])
     parser.feed(xml_text.encode("utf-8"))
 
+    root = None  # type: Optional[ET.Element]
+    root_closed = False
+
     open_tags = []  # type: List[ET.Element]
 
     iterator = parser.read_events()
@@ -40,7 +122,7 @@ def _verify_all_tags_closed(xml_text: str) -> Optional[str]:
             line = xml_text.splitlines()[lineno - 1]
 
             if exception.msg.startswith("mismatched tag:"):
-                return (
+                return None, (
                     f"{exception.msg}; the line was: {line!r}, "
                     f"the open tag(s) up to that point: "
                     f"{list(map(rasaeco.et.to_str, open_tags))}. "
@@ -50,19 +132,22 @@ def _verify_all_tags_closed(xml_text: str) -> Optional[str]:
                     f"in case you have missing or too many new lines."
                 )
             else:
-                return f"{exception.msg}; the line was: {line!r}"
+                return None, f"{exception.msg}; the line was: {line!r}"
 
         if event == "start":
+            if root is None:
+                root = element
+
             open_tags.append(element)
         elif event == "end":
             if len(open_tags) == 0:
-                return (
+                return None, (
                     f"Unexpected closing tag "
                     f"{rasaeco.et.to_str(element)} and no open tags"
                 )
 
             elif open_tags[-1].tag != element.tag:
-                return (
+                return None, (
                     f"Unexpected closing tag "
                     f"{rasaeco.et.to_str(element)} as the last opened "
                     f"tag was: {rasaeco.et.to_str(open_tags[-1])}"
@@ -71,6 +156,9 @@ def _verify_all_tags_closed(xml_text: str) -> Optional[str]:
             elif open_tags[-1].tag == element.tag:
                 open_tags.pop()
 
+                if element is root:
+                    root_closed = True
+
             else:
                 raise AssertionError(
                     f"Unhandled case: "
@@ -82,19 +170,59 @@ def _verify_all_tags_closed(xml_text: str) -> Optional[str]:
         else:
             raise AssertionError(f"Unhandled event: {event}")
 
-    return None
+    if root is None or not root_closed:
+        return None, "The XML document is incomplete."
+
+    return root, None
+
+
+def _extract_definitions(root: ET.Element) -> rasaeco.model.Definitions:
+    """Extract the definitions from the intermediate representation of a scenario."""
+    pass  # for pydocstyle
+
+    def collect_set_of_named_references(tag: str) -> Set[str]:
+        """Collect the set of references for the given specification tag."""
+        result = set()  # type: Set[str]
+        for element in root.iter(tag):
+            name = element.attrib["name"]
+            result.add(name)
+        return result
+
+    return rasaeco.model.Definitions(
+        model_set=collect_set_of_named_references(tag="model"),
+        def_set=collect_set_of_named_references(tag="def"),
+        test_set=collect_set_of_named_references(tag="test"),
+        acceptance_set=collect_set_of_named_references(tag="acceptance"),
+    )
 
 
 @icontract.require(lambda scenario_path: scenario_path.suffix == ".md")
-@icontract.require(lambda xml_path: xml_path.suffix == ".xml")
-def _render_scenario_to_xml(
-    scenario_path: pathlib.Path, xml_path: pathlib.Path
-) -> List[str]:
-    """Render the scenario to an intermediate XML representation."""
+@icontract.require(
+    lambda xml_path: xml_path is None or xml_path.suffix == ".xml",
+    "Intermediate XML representation must be stored with the .xml suffix",
+)
+def render_scenario_to_intermediate(
+    scenario_path: pathlib.Path,
+    xml_path: Optional[pathlib.Path] = None,
+    markdown_cache_dir: Optional[pathlib.Path] = None,
+) -> Tuple[Optional[Intermediate], List[str]]:
+    """
+    Render the scenario to an intermediate representation in memory.
+
+    If ``xml_path`` is given, the intermediate representation is also stored there
+    for debugging.
+
+    If ``markdown_cache_dir`` is given, the conversion of the markdown and
+    its verification are skipped if the same markdown has been converted before.
+
+    Return (intermediate representation, errors if any).
+    """
     try:
         text = scenario_path.read_text(encoding="utf-8")
     except Exception as exception:
-        return [str(exception)]
+        return None, [str(exception)]
+
+    digest = rasaeco.manifest.digest(text)
 
     ##
     # Remove <rasaeco-meta>
@@ -102,12 +230,33 @@ def _render_scenario_to_xml(
 
     meta_range, meta_errors = rasaeco.meta.find_meta(text=text)
     if meta_errors:
-        return meta_errors
+        return None, meta_errors
 
     assert meta_range is not None
 
+    # The errors in the meta information are reported when loading the ontology.
+    meta, meta_errors = rasaeco.meta.parse_meta(text=text, meta_range=meta_range)
+
     text = text[: meta_range.block_start] + text[meta_range.block_end + 1 :]
 
+    cache_key = None  # type: Optional[str]
+    if markdown_cache_dir is not None:
+        cache_key = rasaeco.markdown_cache.key(body=text)
+        cached_html_text = rasaeco.markdown_cache.fetch(
+            directory=markdown_cache_dir, key=cache_key
+        )
+
+        if cached_html_text is not None:
+            return _finish_intermediate(
+                digest=digest,
+                meta=meta,
+                meta_errors=meta_errors,
+                html_text=cached_html_text,
+                root=ET.fromstring(cached_html_text),
+                xml_path=xml_path,
+                scenario_path=scenario_path,
+            )
+
     ##
     # Convert to HTML
     ##
@@ -115,7 +264,7 @@ def _render_scenario_to_xml(
     try:
         document = marko.convert(text)
     except Exception as exception:
-        return [f"Failed to convert the scenario markdown to HTML: {exception}"]
+        return None, [f"Failed to convert the scenario markdown to HTML: {exception}"]
 
     ##
     # Parse as HTML
@@ -128,21 +277,14 @@ def _render_scenario_to_xml(
         f"</body>\n</html>"
     )
 
-    error = _verify_all_tags_closed(xml_text=html_text)
+    root, error = _parse_verifying_tags_closed(xml_text=html_text)
     if error:
-        return [f"Failed to parse the scenario markdown converted to HTML: {error}"]
-
-    try:
-        root = ET.fromstring(html_text)
-    except ET.ParseError as exception:
-        lineno, _ = exception.position
-        line = html_text.splitlines()[lineno - 1]
-
-        return [
-            f"Failed to parse the scenario markdown "
-            f"converted to HTML: {exception}; the line was: {json.dumps(line)}"
+        return None, [
+            f"Failed to parse the scenario markdown converted to HTML: {error}"
         ]
 
+    assert root is not None
+
     ##
     # Perform basic validation
     ##
@@ -172,98 +314,241 @@ def _render_scenario_to_xml(
             )
 
     if errors:
-        return errors
+        return None, errors
 
-    try:
-        xml_path.write_text(html_text)
-    except Exception as error:
-        return [
-            f"Failed to store the intermediate XML representation "
-            f"of a scenario {scenario_path} to {xml_path}: {error}"
-        ]
+    if markdown_cache_dir is not None:
+        assert cache_key is not None
 
-    return []
+        # The cache is merely an optimization so that we ignore the failures.
+        rasaeco.markdown_cache.store(
+            directory=markdown_cache_dir, key=cache_key, html_text=html_text
+        )
+
+    return _finish_intermediate(
+        digest=digest,
+        meta=meta,
+        meta_errors=meta_errors,
+        html_text=html_text,
+        root=root,
+        xml_path=xml_path,
+        scenario_path=scenario_path,
+    )
 
 
-def render_scenarios_to_xml(scenarios_dir: pathlib.Path) -> List[str]:
+def _finish_intermediate(
+    digest: str,
+    meta: Optional[rasaeco.meta.Meta],
+    meta_errors: List[str],
+    html_text: str,
+    root: ET.Element,
+    xml_path: Optional[pathlib.Path],
+    scenario_path: pathlib.Path,
+) -> Tuple[Optional[Intermediate], List[str]]:
     """
-    Render all the scenarios to the intermediate XML representation.
+    Extract the definitions and references from the verified HTML of a scenario.
+
+    If ``xml_path`` is given, the intermediate representation is also stored there
+    for debugging.
 
-    Return errors if any.
+    Return (intermediate representation, errors if any).
     """
-    errors = []  # type: List[str]
+    if xml_path is not None:
+        try:
+            rasaeco.output.write_if_changed(xml_path, html_text.encode("utf-8"))
+        except Exception as error:
+            return None, [
+                f"Failed to store the intermediate XML representation "
+                f"of a scenario {scenario_path} to {xml_path}: {error}"
+            ]
+
+    return (
+        Intermediate(
+            digest=digest,
+            text=html_text,
+            root=root,
+            definitions=_extract_definitions(root=root),
+            references=rasaeco.dependency.extract_references(root=root),
+            meta=meta,
+            meta_errors=meta_errors,
+            terms=rasaeco.search.extract_terms(
+                root=root, title=meta["title"] if meta is not None else None
+            ),
+        ),
+        [],
+    )
+
+
+def _identifier(scenarios_dir: pathlib.Path, scenario_path: pathlib.Path) -> str:
+    """Determine the identifier of the scenario given its path."""
+    return scenario_path.parent.relative_to(scenarios_dir).as_posix()
 
-    scenario_pths = sorted(scenarios_dir.glob("**/scenario.md"))
-    for pth in scenario_pths:
-        to_xml_errors = _render_scenario_to_xml(
-            scenario_path=pth, xml_path=as_xml_path(pth)
-        )
-        for error in to_xml_errors:
-            errors.append(
-                f"When rendering {pth} to intermediate XML representation: {error}"
-            )
 
-        if errors:
+def changed_scenario_paths(
+    scenarios_dir: pathlib.Path, paths: Iterable[pathlib.Path]
+) -> Set[pathlib.Path]:
+    """Select the scenario files in the scenarios directory among the ``paths``."""
+    result = set()  # type: Set[pathlib.Path]
+    for pth in paths:
+        if pth.name != "scenario.md":
             continue
 
-    return errors
+        try:
+            relative_pth = pth.relative_to(scenarios_dir)
+        except ValueError:
+            try:
+                relative_pth = pth.resolve().relative_to(scenarios_dir.resolve())
+            except ValueError:
+                continue
+
+        result.add(scenarios_dir / relative_pth)
 
+    return result
 
-@icontract.require(lambda xml_path: xml_path.suffix == ".xml")
-def _extract_definitions(
-    xml_path: pathlib.Path,
-) -> Tuple[Optional[rasaeco.model.Definitions], List[str]]:
+
+def scenario_paths(
+    scenarios_dir: pathlib.Path,
+    graph: Optional[rasaeco.dependency.Graph] = None,
+    changed: Optional[Set[pathlib.Path]] = None,
+) -> List[pathlib.Path]:
     """
-    Extract the definitions from the intermediate representation of a scenario.
+    List the scenario files in the scenarios directory.
 
-    Return (definitions, errors if any).
+    If the ``changed`` scenario files are given together with the ``graph``,
+    the directory is not scanned. The scenarios are taken from the ``graph``
+    instead and updated with the changed scenarios which have been created or
+    removed in the meanwhile.
     """
-    try:
-        text = xml_path.read_text(encoding="utf-8")
-    except Exception as exception:
-        return None, [
-            f"Failed to read the intermediate representation "
-            f"of the scenario {xml_path}: {exception}"
-        ]
+    if graph is None or changed is None:
+        return sorted(scenarios_dir.glob("**/scenario.md"))
 
-    root = ET.fromstring(text)
+    pth_set = {
+        scenarios_dir / identifier / "scenario.md" for identifier in graph.summaries
+    }
 
-    def collect_set_of_named_references(tag: str) -> Set[str]:
-        """Collect the set of references for the given specification tag."""
-        result = set()  # type: Set[str]
-        for element in root.iter(tag):
-            name = element.attrib["name"]
-            result.add(name)
-        return result
+    for pth in changed:
+        if pth.exists():
+            pth_set.add(pth)
+        else:
+            pth_set.discard(pth)
 
-    return (
-        rasaeco.model.Definitions(
-            model_set=collect_set_of_named_references(tag="model"),
-            def_set=collect_set_of_named_references(tag="def"),
-            test_set=collect_set_of_named_references(tag="test"),
-            acceptance_set=collect_set_of_named_references(tag="acceptance"),
-        ),
-        [],
+    return sorted(pth_set)
+
+
+def render_scenarios_to_intermediate(
+    scenarios_dir: pathlib.Path,
+    graph: Optional[rasaeco.dependency.Graph] = None,
+    report: Optional[rasaeco.manifest.Report] = None,
+    jobs: int = 1,
+    write_xml: bool = False,
+    changed: Optional[Set[pathlib.Path]] = None,
+    unchanged: Optional[Set[pathlib.Path]] = None,
+) -> Tuple[MutableMapping[pathlib.Path, Intermediate], List[str]]:
+    """
+    Render the scenarios to the intermediate representation in memory.
+
+    If the dependency ``graph`` is given, only the scenarios which changed since
+    their summaries have been recorded in the graph are rendered.
+
+    If the ``changed`` scenario files are given as well, only these are inspected
+    while the graph is trusted for all the other scenarios.
+
+    The scenarios are rendered in a pool of ``jobs`` processes.
+
+    If ``write_xml`` is set, the intermediate representation of the rendered
+    scenarios is also stored as XML files next to them for debugging.
+
+    If ``unchanged`` is given, the scenarios which have not been rendered as they
+    match their summaries in the graph are added to it.
+
+    Return (scenario path → intermediate representation, errors if any).
+    """
+    report = report if report is not None else rasaeco.manifest.Report()
+
+    scenario_pths = scenario_paths(
+        scenarios_dir=scenarios_dir, graph=graph, changed=changed
+    )
+
+    error_map = dict()  # type: MutableMapping[pathlib.Path, List[str]]
+
+    pths_to_render = []  # type: List[pathlib.Path]
+    for pth in scenario_pths:
+        if graph is not None:
+            summary = graph.summaries.get(
+                _identifier(scenarios_dir=scenarios_dir, scenario_path=pth), None
+            )
+
+            if (
+                summary is not None
+                and changed is not None
+                and pth not in changed
+                and (not write_xml or as_xml_path(pth).exists())
+            ):
+                if unchanged is not None:
+                    unchanged.add(pth)
+                continue
+
+            if summary is not None:
+                try:
+                    digest = rasaeco.manifest.digest(pth.read_text(encoding="utf-8"))
+                except Exception as exception:
+                    error_map[pth] = [f"Failed to read the scenario {pth}: {exception}"]
+                    continue
+
+                if summary.digest == digest and (
+                    not write_xml or as_xml_path(pth).exists()
+                ):
+                    report.explanations.append(
+                        f"Skipping the rendering of {pth} to the intermediate "
+                        f"representation as the scenario did not change."
+                    )
+                    if unchanged is not None:
+                        unchanged.add(pth)
+                    continue
+
+        pths_to_render.append(pth)
+
+    results = rasaeco.profiling.map_in_order(
+        function=render_scenario_to_intermediate,
+        kwargs_list=[
+            {
+                "scenario_path": pth,
+                "xml_path": as_xml_path(pth) if write_xml else None,
+                "markdown_cache_dir": rasaeco.markdown_cache.cache_dir(
+                    scenarios_dir=scenarios_dir
+                ),
+            }
+            for pth in pths_to_render
+        ],
+        jobs=jobs,
+        name="intermediate",
+        scenarios=[str(pth) for pth in pths_to_render],
+        spans=report.spans,
     )
 
+    intermediate_map = dict()  # type: MutableMapping[pathlib.Path, Intermediate]
+
+    for pth, (intermediate, to_intermediate_errors) in zip(pths_to_render, results):
+        error_map[pth] = [
+            f"When rendering {pth} to intermediate XML representation: {error}"
+            for error in to_intermediate_errors
+        ]
+
+        if intermediate is not None:
+            intermediate_map[pth] = intermediate
+
+    errors = []  # type: List[str]
+    for pth in scenario_pths:
+        errors.extend(error_map.get(pth, []))
+
+    return intermediate_map, errors
+
 
-@icontract.require(lambda xml_path: xml_path.suffix == ".xml")
 def _validate_references(
     scenario: rasaeco.model.Scenario,
     ontology: rasaeco.model.Ontology,
-    xml_path: pathlib.Path,
+    references: List[rasaeco.dependency.Reference],
 ) -> List[str]:
     """Validate that all the references are valid in the given scenario."""
-    try:
-        text = xml_path.read_text(encoding="utf-8")
-    except Exception as exception:
-        return [
-            f"Failed to read the intermediate representation "
-            f"of the scenario {xml_path}: {exception}"
-        ]
-
-    root = ET.fromstring(text)
-
     ##
     # Validate the references for different tags
     ##
@@ -274,7 +559,8 @@ def _validate_references(
 
     @icontract.require(
         lambda reference_tag: reference_tag
-        in ["modelref", "ref", "testref", "acceptanceref"]
+        in ["modelref", "ref", "testref", "acceptanceref"],
+        enabled=rasaeco.contracts.ENABLED,
     )
     def validate_references_for_tag(
         reference_tag: str, set_getter_for_scenario: SetGetterForScenario
@@ -282,20 +568,25 @@ def _validate_references(
         """Validate that the reference tags refer to the actual definitions."""
         errors = []  # type: List[str]
 
-        for element in root.iter(reference_tag):
-            scenario_id, name = rasaeco.et.parse_reference_element(element=element)
+        for reference in references:
+            if reference.tag != reference_tag:
+                continue
+
             scenario_id = (
-                scenario_id if scenario_id is not None else scenario.identifier
+                reference.scenario_id
+                if reference.scenario_id is not None
+                else scenario.identifier
             )
+            name = reference.name
 
             if scenario_id not in ontology.scenario_map:
                 errors.append(
-                    f"The {reference_tag} is invalid: {rasaeco.et.to_str(element)}; "
+                    f"The {reference_tag} is invalid: {reference.element_text}; "
                     f"the scenario with the identifier {scenario_id} does not exist."
                 )
             elif name not in set_getter_for_scenario(scenario_id=scenario_id):
                 errors.append(
-                    f"The {reference_tag} is invalid: {rasaeco.et.to_str(element)!r}; "
+                    f"The {reference_tag} is invalid: {reference.element_text!r}; "
                     f"the specified target {name!r} is missing in the scenario {scenario_id}."
                 )
             else:
@@ -346,51 +637,124 @@ def _validate_references(
     # Validate the scenario references as a special case
     ##
 
-    for element in root.iter("scenarioref"):
-        scenario_id = element.attrib["name"]
+    for reference in references:
+        if reference.tag != "scenarioref":
+            continue
 
-        if scenario_id not in ontology.scenario_map:
+        assert reference.scenario_id is not None
+        if reference.scenario_id not in ontology.scenario_map:
             errors.append(
-                f"The scenarioref is invalid: {rasaeco.et.to_str(element)}; "
-                f"the scenario with the identifier {scenario_id} does not exist."
+                f"The scenarioref is invalid: {reference.element_text}; "
+                f"the scenario with the identifier {reference.scenario_id} "
+                f"does not exist."
             )
 
     return errors
 
 
+def scenario_from_meta(
+    identifier: str,
+    meta: rasaeco.meta.Meta,
+    definitions: rasaeco.model.Definitions,
+    relative_path: pathlib.Path,
+) -> rasaeco.model.Scenario:
+    """Construct the model of the scenario from its verified meta information."""
+    volumetric = []  # type: List[rasaeco.model.Cubelet]
+    for cubelet in meta["volumetric"]:
+        volumetric.append(
+            rasaeco.model.Cubelet(
+                aspect_range=rasaeco.model.AspectRange(
+                    first=cubelet["aspect_from"], last=cubelet["aspect_to"]
+                ),
+                phase_range=rasaeco.model.PhaseRange(
+                    first=cubelet["phase_from"], last=cubelet["phase_to"]
+                ),
+                level_range=rasaeco.model.LevelRange(
+                    first=cubelet["level_from"], last=cubelet["level_to"]
+                ),
+            )
+        )
+
+    return rasaeco.model.Scenario(
+        identifier=identifier,
+        title=meta["title"],
+        contact=meta["contact"],
+        volumetric=volumetric,
+        definitions=definitions,
+        relative_path=relative_path,
+    )
+
+
 @icontract.require(lambda scenarios_dir: scenarios_dir.is_dir())
 def load_ontology(
     scenarios_dir: pathlib.Path,
+    intermediate_map: Optional[Mapping[pathlib.Path, Intermediate]] = None,
+    graph: Optional[rasaeco.dependency.Graph] = None,
+    report: Optional[rasaeco.manifest.Report] = None,
+    changed: Optional[Set[pathlib.Path]] = None,
+    unchanged: Optional[Set[pathlib.Path]] = None,
 ) -> Tuple[Optional[rasaeco.model.Ontology], List[str]]:
     """
-    Read the ontology from the scenarios already rendered as intermediate XML.
+    Read the ontology from the scenarios.
+
+    The definitions and references of the changed scenarios are taken from
+    the ``intermediate_map``. The scenarios missing in the ``intermediate_map`` are
+    rendered to the intermediate representation on the fly.
+
+    If the dependency ``graph`` is given, the definitions of the unchanged scenarios
+    are taken from it instead of the intermediate representation. The references
+    are only re-validated in the changed scenarios and in the scenarios referencing
+    them. The ``graph`` is updated accordingly.
+
+    If the ``changed`` scenario files are given as well, only these are read while
+    the meta information of all the other scenarios is taken from the graph.
+    Likewise, the meta information of the ``unchanged`` scenario files, which are
+    known to match their summaries in the graph, is taken from the graph.
+
+    The meta information of the scenarios in the ``intermediate_map`` is taken from
+    there so that the scenario files are not read again.
 
     Return (ontology, errors if any).
     """
     errors = []  # type: List[str]
 
+    report = report if report is not None else rasaeco.manifest.Report()
+
     path_map = dict()  # type: MutableMapping[str, pathlib.Path]
     meta_map = dict()  # type: MutableMapping[str, rasaeco.meta.Meta]
+    digest_map = dict()  # type: MutableMapping[str, str]
 
-    scenario_pths = sorted(scenarios_dir.glob("**/scenario.md"))
-
-    for pth in scenario_pths:
-        xml_pth = as_xml_path(scenario_path=pth)
-        if not xml_pth.exists():
-            errors.append(
-                f"The intermediate XML representation for the scenario {pth} "
-                f"does not exist: {xml_pth}; "
-                f"did you render the scenarios to intermediate XML representation "
-                f"already?"
-            )
+    # Copy so that the scenarios rendered on the fly do not leak to the caller
+    intermediate_map = (
+        dict(intermediate_map) if intermediate_map is not None else dict()
+    )
 
-    if errors:
-        return None, errors
+    scenario_pths = scenario_paths(
+        scenarios_dir=scenarios_dir, graph=graph, changed=changed
+    )
 
     for pth in scenario_pths:
-        meta, meta_errors = rasaeco.meta.extract_meta(
-            text=pth.read_text(encoding="utf-8")
-        )
+        identifier = _identifier(scenarios_dir=scenarios_dir, scenario_path=pth)
+
+        if graph is not None and (
+            (changed is not None and pth not in changed)
+            or (unchanged is not None and pth in unchanged)
+        ):
+            summary = graph.summaries.get(identifier, None)
+            if summary is not None:
+                meta_map[identifier] = summary.meta
+                path_map[identifier] = pth
+                digest_map[identifier] = summary.digest
+                continue
+
+        intermediate = intermediate_map.get(pth, None)
+        if intermediate is not None:
+            meta, meta_errors = intermediate.meta, intermediate.meta_errors
+            digest = intermediate.digest
+        else:
+            text = pth.read_text(encoding="utf-8")
+            meta, meta_errors = rasaeco.meta.extract_meta(text=text)
+            digest = rasaeco.manifest.digest(text)
 
         for error in meta_errors:
             errors.append(f"In file {pth}: {error}")
@@ -398,47 +762,12 @@ def load_ontology(
         if meta_errors:
             continue
 
+        # The ranges of the cubelets have been verified when parsing the meta.
         assert meta is not None
 
-        for i, cubelet in enumerate(meta["volumetric"]):
-            ##
-            # Verify aspect range
-            ##
-
-            range_error = rasaeco.model.verify_aspect_range(
-                first=cubelet["aspect_from"], last=cubelet["aspect_to"]
-            )
-
-            if range_error:
-                errors.append(
-                    f"In file {pth} and cubelet {i + 1}: "
-                    f"Invalid aspect range: {range_error}"
-                )
-
-            range_error = rasaeco.model.verify_phase_range(
-                first=cubelet["phase_from"], last=cubelet["phase_to"]
-            )
-
-            if range_error:
-                errors.append(
-                    f"In file {pth} and cubelet {i + 1}: "
-                    f"Invalid phase range: {range_error}"
-                )
-
-            range_error = rasaeco.model.verify_level_range(
-                first=cubelet["level_from"], last=cubelet["level_to"]
-            )
-
-            if range_error:
-                errors.append(
-                    f"In file {pth} and cubelet {i + 1}: "
-                    f"Invalid level range: {range_error}"
-                )
-
-        identifier = pth.parent.relative_to(scenarios_dir).as_posix()
-
         meta_map[identifier] = meta
         path_map[identifier] = pth
+        digest_map[identifier] = digest
 
     scenario_id_set = set(meta_map.keys())
 
@@ -455,41 +784,75 @@ def load_ontology(
     if errors:
         return None, errors
 
-    scenarios = []  # type: List[rasaeco.model.Scenario]
-    for identifier, meta in meta_map.items():
-        volumetric = []  # type: List[rasaeco.model.Cubelet]
-        for cubelet in meta["volumetric"]:
-            volumetric.append(
-                rasaeco.model.Cubelet(
-                    aspect_range=rasaeco.model.AspectRange(
-                        first=cubelet["aspect_from"], last=cubelet["aspect_to"]
-                    ),
-                    phase_range=rasaeco.model.PhaseRange(
-                        first=cubelet["phase_from"], last=cubelet["phase_to"]
-                    ),
-                    level_range=rasaeco.model.LevelRange(
-                        first=cubelet["level_from"], last=cubelet["level_to"]
-                    ),
-                )
+    # Work on a fresh graph if none was given so that everything is extracted
+    # and validated.
+    graph = graph if graph is not None else rasaeco.dependency.Graph()
+
+    stale_set = set(
+        rasaeco.dependency.stale_identifiers(graph=graph, digests=digest_map)
+    )
+
+    # The scenarios referencing the stale ones, including the removed ones,
+    # need to be re-validated. We have to look them up before the graph is updated.
+    to_validate = stale_set | graph.referrers(stale_set)
+
+    for identifier in sorted(stale_set & set(path_map)):
+        pth = path_map[identifier]
+
+        intermediate = intermediate_map.get(pth, None)
+        if intermediate is not None and intermediate.digest == digest_map[identifier]:
+            continue
+
+        # The scenario has not been rendered to the intermediate representation
+        # or it changed in the meanwhile.
+        intermediate, to_intermediate_errors = render_scenario_to_intermediate(
+            scenario_path=pth,
+            markdown_cache_dir=rasaeco.markdown_cache.cache_dir(
+                scenarios_dir=scenarios_dir
+            ),
+        )
+
+        for error in to_intermediate_errors:
+            errors.append(
+                f"When rendering {pth} to intermediate XML representation: {error}"
             )
 
+        if intermediate is not None:
+            intermediate_map[pth] = intermediate
+
+    if errors:
+        return None, errors
+
+    for identifier in list(graph.summaries):
+        if identifier not in meta_map:
+            graph.remove(identifier=identifier)
+
+    scenarios = []  # type: List[rasaeco.model.Scenario]
+    for identifier, meta in meta_map.items():
         pth = path_map[identifier]
-        definitions, extraction_errors = _extract_definitions(xml_path=as_xml_path(pth))
-        if extraction_errors:
-            errors.extend(extraction_errors)
-        else:
-            assert definitions is not None
 
-            scenario = rasaeco.model.Scenario(
+        summary = graph.summaries.get(identifier, None)
+        if identifier in stale_set or summary is None:
+            intermediate = intermediate_map[pth]
+
+            summary = rasaeco.dependency.Summary(
+                digest=intermediate.digest,
+                meta=meta,
+                definitions=intermediate.definitions,
+                references=intermediate.references,
+                relation_targets={relation["target"] for relation in meta["relations"]},
+                validated=False,
+            )
+            graph.put(identifier=identifier, summary=summary)
+
+        scenarios.append(
+            scenario_from_meta(
                 identifier=identifier,
-                title=meta["title"],
-                contact=meta["contact"],
-                volumetric=volumetric,
-                definitions=definitions,
+                meta=meta,
+                definitions=summary.definitions,
                 relative_path=pth.relative_to(scenarios_dir),
             )
-
-            scenarios.append(scenario)
+        )
 
     relations = []  # type: List[rasaeco.model.Relation]
     for identifier, meta in meta_map.items():
@@ -504,14 +867,26 @@ def load_ontology(
 
     ontology = rasaeco.model.Ontology(scenarios=scenarios, relations=relations)
 
-    for scenario in ontology.scenarios:
-        pth = scenarios_dir / scenario.relative_path
-        validation_errors = _validate_references(
-            scenario=scenario, ontology=ontology, xml_path=as_xml_path(pth)
-        )
+    with report.timed("references"):
+        for scenario in ontology.scenarios:
+            pth = scenarios_dir / scenario.relative_path
+
+            summary = graph.summaries[scenario.identifier]
+            if summary.validated and scenario.identifier not in to_validate:
+                report.explanations.append(
+                    f"Skipping the validation of references in {pth} as neither "
+                    f"the scenario nor the scenarios it references changed."
+                )
+                continue
+
+            validation_errors = _validate_references(
+                scenario=scenario, ontology=ontology, references=summary.references
+            )
+
+            for error in validation_errors:
+                errors.append(f"When validating references in {pth}: {error}")
 
-        for error in validation_errors:
-            errors.append(f"When validating references in {pth}: {error}")
+            summary.validated = len(validation_errors) == 0
 
     if errors:
         return None, errors
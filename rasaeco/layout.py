@@ -0,0 +1,162 @@
+"""Lay out the ontology graph ahead of time so that large graphs open instantly."""
+import json
+import pathlib
+from typing import Optional, Sequence, Tuple
+
+import icontract
+import numpy as np
+
+import rasaeco.manifest
+
+#: Version of the layout algorithm; bump it whenever the layout changes
+VERSION = 1
+
+#: Desired distance between two related nodes in pixels
+EDGE_LENGTH = 120.0
+
+# Upper bound on the number of node pairs processed at once when computing
+# the repulsion so that the memory stays bounded on large graphs
+_CHUNK = 1 << 20
+
+
+def cache_path(scenarios_dir: pathlib.Path) -> pathlib.Path:
+    """Generate the path to the cached layout of the scenarios directory."""
+    return scenarios_dir / rasaeco.manifest.CACHE_DIR / "layout.json"
+
+
+def key(node_count: int, edges: Sequence[Tuple[int, int]]) -> str:
+    """Compute the key of the layout given the structure of the graph."""
+    return rasaeco.manifest.digest(
+        str(VERSION), str(node_count), json.dumps(sorted(edges))
+    )
+
+
+@icontract.require(lambda node_count: node_count >= 0)
+@icontract.require(
+    lambda node_count, edges: all(
+        0 <= source < node_count and 0 <= target < node_count
+        for source, target in edges
+    )
+)
+@icontract.require(lambda iterations: iterations >= 0)
+@icontract.ensure(lambda node_count, result: result.shape == (node_count, 2))
+def force_directed(
+    node_count: int, edges: Sequence[Tuple[int, int]], iterations: int = 80
+) -> np.ndarray:
+    """
+    Lay out the graph with the force-directed algorithm by Fruchterman and Reingold.
+
+    The nodes start on a phyllotaxis spiral so that the layout is deterministic.
+    A gravity towards the origin keeps the disconnected parts of the graph together.
+
+    Return the positions of the nodes in pixels, centered around the origin and
+    rounded to a tenth of a pixel so that they survive the caching unchanged.
+    """
+    if node_count == 0:
+        return np.zeros((0, 2))
+
+    index = np.arange(node_count, dtype=np.float64)
+    radius = np.sqrt(0.5 + index)
+    angle = index * np.pi * (3.0 - np.sqrt(5.0))
+    positions = np.stack([radius * np.cos(angle), radius * np.sin(angle)], axis=1)
+
+    edge_array = np.array(
+        [(source, target) for source, target in edges if source != target],
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    sources, targets = edge_array[:, 0], edge_array[:, 1]
+
+    # The ideal distance between the nodes is 1 in the layout units.
+    temperature = 0.1 * np.sqrt(node_count)
+    cooling = temperature / (iterations + 1)
+
+    rows = max(1, _CHUNK // node_count)
+
+    for _ in range(iterations):
+        displacement = np.zeros_like(positions)
+
+        xs, ys = positions[:, 0], positions[:, 1]
+        for start in range(0, node_count, rows):
+            delta_x = xs[start : start + rows, None] - xs[None, :]
+            delta_y = ys[start : start + rows, None] - ys[None, :]
+            inverse_sq = 1.0 / np.maximum(delta_x * delta_x + delta_y * delta_y, 1e-9)
+            displacement[start : start + rows, 0] += (delta_x * inverse_sq).sum(axis=1)
+            displacement[start : start + rows, 1] += (delta_y * inverse_sq).sum(axis=1)
+
+        delta = positions[sources] - positions[targets]
+        attraction = delta * np.linalg.norm(delta, axis=1)[:, None]
+        np.subtract.at(displacement, sources, attraction)
+        np.add.at(displacement, targets, attraction)
+
+        displacement -= positions
+
+        length = np.maximum(np.linalg.norm(displacement, axis=1), 1e-9)
+        positions += displacement * (np.minimum(length, temperature) / length)[:, None]
+
+        temperature -= cooling
+
+    positions -= positions.mean(axis=0)
+    return np.round(positions * EDGE_LENGTH, 1)
+
+
+@icontract.require(lambda positions: positions.ndim == 2 and positions.shape[1] == 2)
+@icontract.ensure(lambda positions, result: len(result) == len(positions))
+def cluster(positions: np.ndarray) -> np.ndarray:
+    """
+    Group the nearby nodes into clusters to be shown when the graph is zoomed out.
+
+    The nodes are binned in a square grid so that there are roughly as many clusters
+    as the square root of the number of nodes.
+
+    Return the index of the cluster for each node, ordered by the grid cells.
+    """
+    if len(positions) == 0:
+        return np.zeros((0,), dtype=np.int64)
+
+    side = int(np.ceil(len(positions) ** 0.25))
+
+    lower = positions.min(axis=0)
+    extent = np.maximum(positions.max(axis=0) - lower, 1e-9)
+
+    cells = np.minimum((side * (positions - lower) / extent).astype(np.int64), side - 1)
+
+    _, result = np.unique(cells[:, 0] * side + cells[:, 1], return_inverse=True)
+    return result.reshape(-1).astype(np.int64)
+
+
+def fetch(path: pathlib.Path, key: str, node_count: int) -> Optional[np.ndarray]:
+    """Retrieve the cached layout, if available and computed for the same graph."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, UnicodeDecodeError, json.JSONDecodeError):
+        return None
+
+    if not isinstance(data, dict) or data.get("key", None) != key:
+        return None
+
+    try:
+        positions = np.array(data["positions"], dtype=np.float64).reshape(-1, 2)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    if positions.shape != (node_count, 2):
+        return None
+
+    return positions
+
+
+def store(path: pathlib.Path, key: str, positions: np.ndarray) -> Optional[str]:
+    """
+    Store the computed layout in the cache.
+
+    Return error if any.
+    """
+    try:
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(
+            json.dumps({"key": key, "positions": positions.tolist()}), encoding="utf-8"
+        )
+    except Exception as exception:
+        return f"Failed to store the layout of the ontology to {path}: {exception}"
+
+    return None
@@ -0,0 +1,386 @@
+"""Render the individual scenarios on request ahead of the full rendering."""
+import collections
+import pathlib
+import posixpath
+import tempfile
+import threading
+import urllib.parse
+from typing import List, Mapping, MutableMapping, Optional, Set, Tuple
+
+import rasaeco.dependency
+import rasaeco.glossary
+import rasaeco.intermediate
+import rasaeco.live_reload
+import rasaeco.manifest
+import rasaeco.meta
+import rasaeco.model
+import rasaeco.render
+import rasaeco.template
+
+#: Names of the artefacts in the directory of a scenario which are rendered on request
+ARTEFACTS = frozenset(
+    [
+        "scenario.html",
+        "volumetric.png",
+        "volumetric.svg",
+        "volumetric_thumb.png",
+        "volumetric_thumb.svg",
+    ]
+)
+
+_PLOTS = sorted(ARTEFACTS - {"scenario.html"})
+
+#: Maximum number of the pages rendered on request kept in memory
+MAX_PAGES = 256
+
+
+def _mtime_ns(path: pathlib.Path) -> Optional[int]:
+    """Retrieve the modification time of the file, or None if it does not exist."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _content_digest(path: pathlib.Path) -> Optional[str]:
+    """Compute the digest of the scenario, or None if it can not be read."""
+    try:
+        return rasaeco.manifest.digest(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+class Renderer:
+    """
+    Render the scenarios on request if their artefacts are missing or stale.
+
+    A page is up-to-date if the scenarios it depends on, according to
+    the dependency graph of the last rendering, did not change their content
+    since, and the manifest records the page as rendered from them. Merely touching
+    a scenario does not make its page stale. The backlinks to the definitions are
+    also taken from the last rendering. Likewise, a plot is up-to-date if
+    the manifest records it as rendered from the current volumetric of its scenario,
+    or if it has been rendered on request from it since.
+    Each scenario is rendered by a single request at a time; the concurrent
+    requests for the same scenario wait for it and share the result.
+
+    The plots are stored next to the scenario as they depend only on it and
+    the full rendering would produce exactly the same files. The pages are only
+    kept in memory so that they never overwrite a page written by the full rendering
+    in the meanwhile. They are served until the full rendering catches up.
+    """
+
+    def __init__(self, scenarios_dir: pathlib.Path) -> None:
+        """Initialize with the given values; nothing is read yet."""
+        self.scenarios_dir = scenarios_dir
+
+        self._lock = threading.Lock()
+
+        # Scenario identifier → lock held while the scenario is rendered
+        self._scenario_locks = dict()  # type: MutableMapping[str, threading.Lock]
+
+        # Scenario identifier → (digest of the dependencies, page rendered from them)
+        self._pages = (
+            collections.OrderedDict()
+        )  # type: collections.OrderedDict[str, Tuple[str, bytes]]
+
+        # Dependency graph of the last rendering together with the modification
+        # time of its file when it was loaded
+        self._graph = rasaeco.dependency.Graph()
+        self._graph_mtime_ns = None  # type: Optional[int]
+
+        # Backlinks of the definitions indexed from the graph
+        self._backlinks_map = dict()  # type: Mapping[str, rasaeco.glossary.Backlinks]
+
+        # Manifest of the last rendering together with the modification time
+        # of its file when it was loaded
+        self._manifest = rasaeco.manifest.Manifest(scenarios_dir=scenarios_dir)
+        self._manifest_mtime_ns = None  # type: Optional[int]
+
+        # Plot path → (digest it has been rendered from on request, digest recorded
+        # for it in the manifest at that time)
+        self._plots = dict()  # type: MutableMapping[pathlib.Path, Tuple[str, str]]
+
+    def _scenario_lock(self, identifier: str) -> threading.Lock:
+        """Get the lock of the scenario, creating it if necessary."""
+        with self._lock:
+            lock = self._scenario_locks.get(identifier, None)
+            if lock is None:
+                lock = threading.Lock()
+                self._scenario_locks[identifier] = lock
+
+            return lock
+
+    def _load_graph(self) -> None:
+        """Reload the dependency graph if it changed; the lock must be held."""
+        mtime_ns = _mtime_ns(
+            rasaeco.dependency.graph_path(scenarios_dir=self.scenarios_dir)
+        )
+
+        if mtime_ns != self._graph_mtime_ns:
+            # The graph is empty if it could not be loaded so that we render
+            # from the scenario alone.
+            self._graph, _ = rasaeco.dependency.load(scenarios_dir=self.scenarios_dir)
+            self._backlinks_map = rasaeco.glossary.index(
+                summaries=self._graph.summaries
+            )
+            self._graph_mtime_ns = mtime_ns
+
+    def _load_manifest(self) -> None:
+        """Reload the manifest if it changed; the lock must be held."""
+        mtime_ns = _mtime_ns(
+            rasaeco.manifest.manifest_path(scenarios_dir=self.scenarios_dir)
+        )
+
+        if mtime_ns != self._manifest_mtime_ns:
+            # The manifest is empty if it could not be loaded so that all the pages
+            # are considered stale.
+            self._manifest, _ = rasaeco.manifest.load(scenarios_dir=self.scenarios_dir)
+            self._manifest_mtime_ns = mtime_ns
+
+    def _relation_sources(self, identifier: str) -> Set[str]:
+        """Look up the scenarios relating to the given one in the last rendering."""
+        with self._lock:
+            self._load_graph()
+            return self._graph.relation_sources(identifier)
+
+    def _backlinks(self, identifier: str) -> rasaeco.glossary.Backlinks:
+        """Look up the backlinks of the definitions of the scenario."""
+        with self._lock:
+            self._load_graph()
+            return self._backlinks_map.get(identifier, dict())
+
+    def _dependency_digests(
+        self, identifier: str, relation_sources: Set[str]
+    ) -> Mapping[str, Optional[str]]:
+        """
+        Compute the digests of the scenarios the page depends on.
+
+        Return scenario identifier → digest of its content, None if missing.
+        """
+        with self._lock:
+            summary = self._graph.summaries.get(identifier, None)
+            referrers = self._graph.referrers([identifier])
+
+        dependencies = {identifier} | relation_sources | referrers
+        if summary is not None:
+            dependencies.update(summary.referenced_scenarios)
+            dependencies.update(summary.relation_targets)
+
+        return {
+            dependency: _content_digest(self.scenarios_dir / dependency / "scenario.md")
+            for dependency in dependencies
+        }
+
+    def _rendered(self, identifier: str, digests: Mapping[str, Optional[str]]) -> bool:
+        """Check that the page on the disk has been rendered from the scenarios."""
+        html_pth = self.scenarios_dir / identifier / "scenario.html"
+
+        with self._lock:
+            self._load_graph()
+            self._load_manifest()
+
+            for dependency, digest in digests.items():
+                summary = self._graph.summaries.get(dependency, None)
+                if (None if summary is None else summary.digest) != digest:
+                    return False
+
+            # The summaries are up-to-date so that the graph gives the digest
+            # the full rendering would record for the page.
+            html_digest = rasaeco.render.html_digest_from_graph(
+                graph=self._graph,
+                identifier=identifier,
+                backlinks=self._backlinks_map.get(identifier, dict()),
+            )
+
+            return (
+                html_digest is not None
+                and self._manifest.reason_to_render(path=html_pth, digest=html_digest)
+                is None
+            )
+
+    def _plot_digests(self, identifier: str) -> Optional[Mapping[pathlib.Path, str]]:
+        """
+        Compute the digests of the plots of the scenario from its volumetric.
+
+        Return plot path → digest, or None if the scenario can not be read.
+        """
+        directory = self.scenarios_dir / identifier
+
+        try:
+            text = (directory / "scenario.md").read_text(encoding="utf-8")
+        except Exception:
+            return None
+
+        meta, meta_errors = rasaeco.meta.extract_meta(text=text)
+        if meta_errors:
+            return None
+
+        assert meta is not None
+
+        # Only the occupancy of the scenario matters for the plots.
+        scenario = rasaeco.intermediate.scenario_from_meta(
+            identifier=identifier,
+            meta=meta,
+            definitions=rasaeco.model.Definitions(
+                model_set=set(), def_set=set(), test_set=set(), acceptance_set=set()
+            ),
+            relative_path=pathlib.Path(identifier) / "scenario.md",
+        )
+
+        return {
+            directory
+            / plot: rasaeco.render.volumetric_digest(
+                scenario=scenario,
+                path=directory / plot,
+                thumbnail=plot.startswith("volumetric_thumb"),
+            )
+            for plot in _PLOTS
+        }
+
+    def _plots_rendered(self, plot_digests: Mapping[pathlib.Path, str]) -> bool:
+        """Check that the plots on the disk have been rendered from the volumetric."""
+        with self._lock:
+            self._load_manifest()
+
+            for pth, digest in plot_digests.items():
+                if not pth.exists():
+                    return False
+
+                recorded = self._manifest.recorded_digest(path=pth) or ""
+                if recorded == digest:
+                    continue
+
+                # The plots rendered on request are not recorded in the manifest.
+                # They are only valid until the full rendering re-records the plot.
+                if self._plots.get(pth, None) != (digest, recorded):
+                    return False
+
+            return True
+
+    def pending_ontology(self) -> bytes:
+        """Render the page listing the scenarios while the ontology is missing."""
+        identifiers = sorted(
+            pth.parent.relative_to(self.scenarios_dir).as_posix()
+            for pth in self.scenarios_dir.glob("**/scenario.md")
+        )
+
+        return rasaeco.template.PENDING_ONTOLOGY_HTML_TPL.render(
+            scenarios=[
+                {
+                    "identifier": identifier,
+                    "url": urllib.parse.quote(f"{identifier}/scenario.html"),
+                }
+                for identifier in identifiers
+            ],
+            live_reload_script=rasaeco.live_reload.SCRIPT,
+        ).encode("utf-8")
+
+    def resolve(self, url_path: str) -> Optional[Tuple[str, str]]:
+        """
+        Map the URL path to the scenario and the name of its artefact.
+
+        Return None if the URL path does not point to an artefact of a scenario.
+        """
+        path = urllib.parse.unquote(urllib.parse.urlsplit(url_path).path)
+        path = posixpath.normpath(path).lstrip("/")
+
+        identifier, _, name = path.rpartition("/")
+        if (
+            name not in ARTEFACTS
+            or identifier in ("", ".")
+            or identifier.startswith("..")
+        ):
+            return None
+
+        if not (self.scenarios_dir / identifier / "scenario.md").is_file():
+            return None
+
+        return identifier, name
+
+    def fetch(self, url_path: str) -> Tuple[Optional[bytes], List[str]]:
+        """
+        Render the artefact at the URL path if it is missing or stale.
+
+        Return (the page if it has been rendered in memory, errors if any).
+        If no page is returned, the artefact on the disk is up-to-date.
+        """
+        resolved = self.resolve(url_path=url_path)
+        if resolved is None:
+            return None, []
+
+        identifier, name = resolved
+
+        with self._scenario_lock(identifier):
+            relation_sources = self._relation_sources(identifier)
+            digests = self._dependency_digests(
+                identifier=identifier, relation_sources=relation_sources
+            )
+
+            # Digest of all the dependencies identifying the page rendered in memory
+            key = rasaeco.manifest.digest(
+                *(
+                    part
+                    for dependency in sorted(digests)
+                    for part in [dependency, digests[dependency] or ""]
+                )
+            )
+
+            # Digests of the plots written by the rendering below, if known
+            plot_digests = None  # type: Optional[Mapping[pathlib.Path, str]]
+
+            if name == "scenario.html":
+                if self._rendered(identifier=identifier, digests=digests):
+                    with self._lock:
+                        self._pages.pop(identifier, None)
+                    return None, []
+
+                with self._lock:
+                    cached = self._pages.get(identifier, None)
+
+                if cached is not None and cached[0] == key:
+                    return cached[1], []
+            else:
+                plot_digests = self._plot_digests(identifier=identifier)
+                if plot_digests is not None and self._plots_rendered(
+                    plot_digests=plot_digests
+                ):
+                    return None, []
+
+            # The plots are re-rendered with the page in any case.
+            if plot_digests is None:
+                plot_digests = self._plot_digests(identifier=identifier)
+
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                html_pth = pathlib.Path(tmp_dir) / "scenario.html"
+
+                errors = rasaeco.render.render_on_request(
+                    scenarios_dir=self.scenarios_dir,
+                    identifier=identifier,
+                    relation_sources=relation_sources,
+                    backlinks=self._backlinks(identifier),
+                    html_path=html_pth,
+                )
+                if errors:
+                    return None, errors
+
+                page = html_pth.read_bytes()
+
+            with self._lock:
+                self._load_manifest()
+                if plot_digests is not None:
+                    for pth, digest in plot_digests.items():
+                        self._plots[pth] = (
+                            digest,
+                            self._manifest.recorded_digest(path=pth) or "",
+                        )
+
+                self._pages[identifier] = (key, page)
+                self._pages.move_to_end(identifier)
+                while len(self._pages) > MAX_PAGES:
+                    self._pages.popitem(last=False)
+
+            if name == "scenario.html":
+                return page, []
+
+            return None, []
@@ -0,0 +1,130 @@
+"""Notify the open pages about their re-rendering through server-sent events."""
+import pathlib
+import queue
+import threading
+from typing import List, Optional, Set, Iterable, TYPE_CHECKING
+
+#: URL path of the stream of server-sent events
+EVENTS_PATH = "/_rasaeco/events"
+
+#: Seconds between the keep-alive comments in the stream of server-sent events
+KEEP_ALIVE = 15.0
+
+#: Script included in every page to reload it once it has been re-rendered.
+#:
+#: The script does nothing if the page has not been served over HTTP
+#: (*e.g.*, if it has been opened directly from the disk).
+#:
+#: The script avoids ``<``, ``>`` and ``&`` as it is serialized as XML text
+#: into the scenario pages.
+SCRIPT = """\
+(function () {
+    if (!window.EventSource || window.location.protocol.indexOf("http") !== 0) {
+        return;
+    }
+
+    var path = decodeURIComponent(window.location.pathname);
+    if (path === "/") {
+        path = "/ontology.html";
+    }
+
+    var source = new EventSource("%s");
+    source.onmessage = function (event) {
+        if (JSON.parse(event.data).indexOf(path) !== -1) {
+            source.close();
+            window.location.reload();
+        }
+    };
+})();
+""" % (
+    EVENTS_PATH
+)
+
+# See https://mypy.readthedocs.io/en/stable/common_issues.html#using-classes-that-are-generic-in-stubs-but-not-at-runtime
+if TYPE_CHECKING:
+    Subscription = queue.Queue[Optional[List[str]]]  # This is only processed by mypy.
+else:
+    Subscription = queue.Queue
+
+
+def pages(scenarios_dir: pathlib.Path, rendered: Iterable[pathlib.Path]) -> List[str]:
+    """
+    Determine the URL paths of the pages affected by the ``rendered`` artefacts.
+
+    A page is affected if it has been re-rendered itself, or if it shows
+    a re-rendered plot.
+    """
+    result = set()  # type: Set[str]
+
+    for pth in rendered:
+        try:
+            relative = pth.relative_to(scenarios_dir)
+        except ValueError:
+            continue
+
+        if relative.suffix == ".html":
+            result.add("/" + relative.as_posix())
+        elif relative.name.startswith("volumetric."):
+            result.add("/" + (relative.parent / "scenario.html").as_posix())
+        elif relative.name.startswith("volumetric_thumb."):
+            result.add("/ontology.html")
+        elif relative.as_posix() == "coverage.svg":
+            result.add("/coverage.html")
+        else:
+            pass
+
+    return sorted(result)
+
+
+class Hub:
+    """
+    Dispatch the lists of re-rendered pages to all the subscribed connections.
+
+    The lists are published by the rendering thread, while each connection
+    consumes its own subscription in the thread of its request handler.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without any subscriptions."""
+        self._lock = threading.Lock()
+        self._subscriptions = set()  # type: Set[Subscription]
+        self._closed = False
+
+    def subscribe(self) -> Subscription:
+        """
+        Subscribe to the lists of re-rendered pages.
+
+        None is put in the subscription once the hub has been closed.
+        """
+        subscription = queue.Queue()  # type: Subscription
+
+        with self._lock:
+            if self._closed:
+                subscription.put(None)
+            else:
+                self._subscriptions.add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop dispatching to the ``subscription``."""
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, pages: List[str]) -> None:
+        """Dispatch the URL paths of the re-rendered ``pages`` to all subscriptions."""
+        if not pages:
+            return
+
+        with self._lock:
+            for subscription in self._subscriptions:
+                subscription.put(list(pages))
+
+    def close(self) -> None:
+        """Release all the subscriptions so that the connections can be closed."""
+        with self._lock:
+            self._closed = True
+            for subscription in self._subscriptions:
+                subscription.put(None)
+
+            self._subscriptions.clear()
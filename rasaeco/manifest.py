@@ -0,0 +1,223 @@
+"""Track the inputs of the rendered artefacts so that unchanged ones can be skipped."""
+import contextlib
+import hashlib
+import json
+import pathlib
+from typing import MutableMapping, List, Optional, Tuple, Any, Iterator
+
+import rasaeco
+import rasaeco.output
+import rasaeco.profiling
+
+#: Directory, relative to the scenarios directory, where we keep the build state
+CACHE_DIR = ".rasaeco-cache"
+
+#: Version of the manifest format; manifests in any other format are ignored.
+#: Bump it whenever the rendered output changes between the releases as well.
+FORMAT = 2
+
+
+def digest(*parts: str) -> str:
+    """
+    Compute the content hash of the given parts.
+
+    The boundaries between the parts are taken into account so that, *e.g.*,
+    ``("ab", "c")`` and ``("a", "bc")`` give different digests.
+    """
+    hsh = hashlib.sha256()
+    for part in parts:
+        encoded = part.encode("utf-8")
+        hsh.update(len(encoded).to_bytes(8, "little"))
+        hsh.update(encoded)
+
+    return hsh.hexdigest()
+
+
+class Manifest:
+    """Map the rendered artefacts to the digests of the inputs they were rendered from."""
+
+    def __init__(self, scenarios_dir: pathlib.Path) -> None:
+        """Initialize as an empty manifest of the scenarios directory."""
+        self.scenarios_dir = scenarios_dir
+
+        # Artefact path relative to the scenarios directory → digest of the inputs
+        self.digests = dict()  # type: MutableMapping[str, str]
+
+    def _key(self, path: pathlib.Path) -> str:
+        """Compute the key of the artefact in the manifest."""
+        return path.relative_to(self.scenarios_dir).as_posix()
+
+    def reason_to_render(self, path: pathlib.Path, digest: str) -> Optional[str]:
+        """
+        Determine why the artefact needs to be (re-)rendered.
+
+        Return None if the artefact is up-to-date.
+        """
+        recorded = self.digests.get(self._key(path), None)
+        if recorded is None:
+            return "it has not been rendered before"
+
+        if not path.exists():
+            return "it does not exist anymore"
+
+        if recorded != digest:
+            return "its inputs changed since the last rendering"
+
+        return None
+
+    def recorded_digest(self, path: pathlib.Path) -> Optional[str]:
+        """Retrieve the digest of the inputs the artefact was last rendered from."""
+        return self.digests.get(self._key(path), None)
+
+    def record(self, path: pathlib.Path, digest: str) -> None:
+        """Record that the artefact has been rendered from the inputs with the digest."""
+        self.digests[self._key(path)] = digest
+
+    def forget(self, path: pathlib.Path) -> None:
+        """Remove the artefact from the manifest so that it is rendered anew."""
+        self.digests.pop(self._key(path), None)
+
+
+def manifest_path(scenarios_dir: pathlib.Path) -> pathlib.Path:
+    """Generate the path to the manifest of the scenarios directory."""
+    return scenarios_dir / CACHE_DIR / "manifest.json"
+
+
+def load(scenarios_dir: pathlib.Path) -> Tuple[Manifest, Optional[str]]:
+    """
+    Load the manifest of the scenarios directory.
+
+    If the manifest is missing or can not be used, an empty manifest is returned
+    so that everything is rendered anew.
+
+    Return (manifest, the reason why the stored manifest was discarded if any).
+    """
+    manifest = Manifest(scenarios_dir=scenarios_dir)
+
+    pth = manifest_path(scenarios_dir=scenarios_dir)
+    if not pth.exists():
+        return manifest, None
+
+    data = None  # type: Optional[Any]
+    try:
+        data = json.loads(pth.read_text(encoding="utf-8"))
+    except Exception as exception:
+        return manifest, f"Failed to read the manifest {pth}: {exception}"
+
+    if (
+        not isinstance(data, dict)
+        or data.get("format", None) != FORMAT
+        or not isinstance(data.get("digests", None), dict)
+    ):
+        return manifest, f"The manifest {pth} is in an unexpected format."
+
+    # The artefacts rendered by another version of rasaeco might look different
+    # even though their inputs did not change.
+    if data.get("version", None) != rasaeco.__version__:
+        return (
+            manifest,
+            f"The manifest {pth} has been recorded by rasaeco "
+            f"{data.get('version', None)}, not by {rasaeco.__version__}.",
+        )
+
+    for key, value in data["digests"].items():
+        if isinstance(key, str) and isinstance(value, str):
+            manifest.digests[key] = value
+
+    return manifest, None
+
+
+def save(manifest: Manifest) -> Optional[str]:
+    """
+    Store the manifest in the cache directory of the scenarios.
+
+    Return error if any.
+    """
+    pth = manifest_path(scenarios_dir=manifest.scenarios_dir)
+    tmp_pth = pth.parent / (pth.name + ".tmp")
+
+    # No indentation so that the fast C encoder is used on large trees
+    data = json.dumps(
+        {
+            "format": FORMAT,
+            "version": rasaeco.__version__,
+            "digests": dict(sorted(manifest.digests.items())),
+        }
+    ).encode("utf-8")
+
+    try:
+        if rasaeco.output.unchanged(path=pth, data=data):
+            return None
+
+        pth.parent.mkdir(exist_ok=True)
+
+        # Write to a temporary file first so that a crash in the middle does not
+        # leave a corrupt manifest behind.
+        tmp_pth.write_bytes(data)
+        tmp_pth.replace(pth)
+    except Exception as exception:
+        return f"Failed to store the manifest to {pth}: {exception}"
+
+    return None
+
+
+class Report:
+    """Collect which artefacts have been rendered and which skipped, and why."""
+
+    def __init__(self) -> None:
+        """Initialize as an empty report."""
+        self.rendered = []  # type: List[pathlib.Path]
+        self.skipped = []  # type: List[pathlib.Path]
+        self.explanations = []  # type: List[str]
+
+        # Set if the rendering stopped early as it has been superseded
+        self.cancelled = False
+
+        # Rendering stage → wall-clock time spent in it, in seconds
+        self.timings = dict()  # type: MutableMapping[str, float]
+
+        # Measurements of the stages and of the tasks of the individual scenarios
+        self.spans = []  # type: List[rasaeco.profiling.Span]
+
+    @contextlib.contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        """Measure the block and add its wall-clock time to the timing of the stage."""
+        try:
+            with rasaeco.profiling.measure(name=stage) as span:
+                yield
+        finally:
+            # The span is filled in on exit, even if the block raised.
+            self.spans.append(span)
+            self.timings[stage] = self.timings.get(stage, 0.0) + span.wall
+
+    def render(self, path: pathlib.Path, reason: str) -> None:
+        """Note that the artefact is rendered for the given reason."""
+        self.rendered.append(path)
+        self.explanations.append(f"Rendering {path} as {reason}.")
+
+    def skip(self, path: pathlib.Path, reason: str) -> None:
+        """Note that the artefact is skipped for the given reason."""
+        self.skipped.append(path)
+        self.explanations.append(f"Skipping {path} as {reason}.")
+
+
+def needs_rendering(
+    path: pathlib.Path,
+    digest: str,
+    inputs: str,
+    manifest: Manifest,
+    report: Report,
+) -> bool:
+    """
+    Decide whether the artefact needs to be (re-)rendered and report the decision.
+
+    The ``inputs`` describe what the artefact is rendered from and are used
+    to explain why the artefact has been skipped.
+    """
+    reason = manifest.reason_to_render(path=path, digest=digest)
+    if reason is None:
+        report.skip(path=path, reason=f"{inputs} did not change")
+        return False
+
+    report.render(path=path, reason=reason)
+    return True
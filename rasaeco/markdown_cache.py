@@ -0,0 +1,57 @@
+"""Cache the HTML converted from the markdown bodies of the scenarios."""
+import os
+import pathlib
+import uuid
+from typing import Optional
+
+import marko
+
+import rasaeco
+import rasaeco.manifest
+
+
+def cache_dir(scenarios_dir: pathlib.Path) -> pathlib.Path:
+    """Generate the path to the markdown cache of the scenarios directory."""
+    return scenarios_dir / rasaeco.manifest.CACHE_DIR / "markdown"
+
+
+def key(body: str) -> str:
+    """
+    Compute the file name of the converted markdown ``body`` in the cache.
+
+    The versions of marko and rasaeco are taken into account so that the cache is
+    invalidated on upgrades.
+    """
+    return (
+        rasaeco.manifest.digest(marko.__version__, rasaeco.__version__, body) + ".html"
+    )
+
+
+def fetch(directory: pathlib.Path, key: str) -> Optional[str]:
+    """Retrieve the cached HTML, if available."""
+    try:
+        return (directory / key).read_text(encoding="utf-8")
+    except (FileNotFoundError, UnicodeDecodeError):
+        return None
+
+
+def store(directory: pathlib.Path, key: str, html_text: str) -> Optional[str]:
+    """
+    Store the HTML which has been converted and validated in the cache.
+
+    Return error if any.
+    """
+    pth = directory / key
+
+    # Write to a unique temporary file first since another process might
+    # convert the same markdown at the same time.
+    tmp_pth = directory / f".{key}.{uuid.uuid4().hex}.tmp"
+
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp_pth.write_text(html_text, encoding="utf-8")
+        os.replace(str(tmp_pth), str(pth))
+    except Exception as exception:
+        return f"Failed to store the converted markdown to {pth}: {exception}"
+
+    return None
@@ -2,10 +2,23 @@
 import dataclasses
 import json
 import re
-from typing import List, Tuple, Optional, Any, TypedDict
+from typing import (
+    List,
+    Tuple,
+    Optional,
+    Any,
+    TypedDict,
+    Sequence,
+    Union,
+    MutableMapping,
+    Mapping,
+    Callable,
+)
 
 import icontract
-import typeguard
+
+import rasaeco.contracts
+import rasaeco.model
 
 
 class RelatesTo(TypedDict):
@@ -35,8 +48,261 @@ class Meta(TypedDict):
     volumetric: List[Cubelet]
 
 
-_META_OPEN_RE = re.compile("<\s*rasaeco-meta( [^>]*)?>")
-_META_CLOSE_RE = re.compile("<\s*/\s*rasaeco-meta\s*>")
+# The opening and the closing tag are searched for in a single pass.
+_META_TAG_RE = re.compile(
+    r"(?P<open><\s*rasaeco-meta( [^>]*)?>)|(?P<close><\s*/\s*rasaeco-meta\s*>)"
+)
+
+
+# A path to a value in the meta information given as keys and list indices
+_Path = Tuple[Union[str, int], ...]
+
+_META_KEYS = ("title", "contact", "relations", "volumetric")
+_META_STRING_KEYS = ("title", "contact")
+_RELATION_KEYS = ("target", "nature")
+_CUBELET_KEYS = (
+    "aspect_from",
+    "aspect_to",
+    "phase_from",
+    "phase_to",
+    "level_from",
+    "level_to",
+)
+
+_RangeVerification = Callable[[str, str], Optional[str]]
+
+# Dimension of a cubelet → (key of the start, key of the end, index map, verification)
+_DIMENSIONS = {
+    "aspect": (
+        "aspect_from",
+        "aspect_to",
+        rasaeco.model.ASPECT_INDEX,
+        rasaeco.model.verify_aspect_range,
+    ),
+    "phase": (
+        "phase_from",
+        "phase_to",
+        rasaeco.model.PHASE_INDEX,
+        rasaeco.model.verify_phase_range,
+    ),
+    "level": (
+        "level_from",
+        "level_to",
+        rasaeco.model.LEVEL_INDEX,
+        rasaeco.model.verify_level_range,
+    ),
+}  # type: Mapping[str, Tuple[str, str, Mapping[str, int], _RangeVerification]]
+
+_JSON_TYPE_NAMES = {
+    dict: "an object",
+    list: "an array",
+    str: "a string",
+    int: "a number",
+    float: "a number",
+    bool: "a boolean",
+    type(None): "null",
+}  # type: Mapping[type, str]
+
+
+def _format_path(path: _Path) -> str:
+    """Format the path to a value in the meta information as Python subscripts."""
+    return "meta" + "".join(f"[{part!r}]" for part in path)
+
+
+def _verify_object(
+    value: Any, path: _Path, keys: Sequence[str], errors: List[Tuple[_Path, str, str]]
+) -> bool:
+    """
+    Verify that the ``value`` is an object with exactly the given ``keys``.
+
+    Return True if the values of the keys can be verified further.
+    """
+    if not isinstance(value, dict):
+        errors.append(
+            (
+                path,
+                f"Invalid {_format_path(path)}",
+                f"expected an object, but got {_JSON_TYPE_NAMES[type(value)]}",
+            )
+        )
+        return False
+
+    ok = True
+
+    for key in value:
+        if key not in keys:
+            errors.append(
+                (
+                    path + (key,),
+                    f"Unexpected key {key!r} in {_format_path(path)}",
+                    f"expected keys are: {list(keys)}",
+                )
+            )
+            ok = False
+
+    for key in keys:
+        if key not in value:
+            errors.append(
+                (
+                    path,
+                    f"Missing key {key!r} in {_format_path(path)}",
+                    f"expected keys are: {list(keys)}",
+                )
+            )
+            ok = False
+
+    return ok
+
+
+def _verify_string(
+    value: Any, path: _Path, errors: List[Tuple[_Path, str, str]]
+) -> bool:
+    """Verify that the ``value`` is a string and return True if it is."""
+    if not isinstance(value, str):
+        errors.append(
+            (
+                path,
+                f"Invalid {_format_path(path)}",
+                f"expected a string, but got {_JSON_TYPE_NAMES[type(value)]}",
+            )
+        )
+        return False
+
+    return True
+
+
+def _verify_list(value: Any, path: _Path, errors: List[Tuple[_Path, str, str]]) -> bool:
+    """Verify that the ``value`` is a list and return True if it is."""
+    if not isinstance(value, list):
+        errors.append(
+            (
+                path,
+                f"Invalid {_format_path(path)}",
+                f"expected an array, but got {_JSON_TYPE_NAMES[type(value)]}",
+            )
+        )
+        return False
+
+    return True
+
+
+def verify(data: Any) -> List[Tuple[_Path, str, str]]:
+    """
+    Verify the shape of the parsed meta information and the ranges of the cubelets.
+
+    All the errors are collected in a single pass. The ranges are checked with
+    the index maps of the model so that no list needs to be searched.
+
+    Return errors, if any, as (path to the erroneous value, subject, detail).
+    """
+    errors = []  # type: List[Tuple[_Path, str, str]]
+
+    # The values of the present keys are verified even if some keys are missing
+    # or unexpected so that all the errors are reported at once.
+    _verify_object(value=data, path=(), keys=_META_KEYS, errors=errors)
+    if not isinstance(data, dict):
+        return errors
+
+    for key in _META_STRING_KEYS:
+        if key in data:
+            _verify_string(value=data[key], path=(key,), errors=errors)
+
+    relations = data.get("relations", [])
+    if _verify_list(value=relations, path=("relations",), errors=errors):
+        for i, relation in enumerate(relations):
+            path = ("relations", i)  # type: _Path
+            if _verify_object(
+                value=relation, path=path, keys=_RELATION_KEYS, errors=errors
+            ):
+                for key in _RELATION_KEYS:
+                    _verify_string(
+                        value=relation[key], path=path + (key,), errors=errors
+                    )
+
+    volumetric = data.get("volumetric", [])
+    if _verify_list(value=volumetric, path=("volumetric",), errors=errors):
+        for i, cubelet in enumerate(volumetric):
+            path = ("volumetric", i)
+            if not _verify_object(
+                value=cubelet, path=path, keys=_CUBELET_KEYS, errors=errors
+            ):
+                continue
+
+            # Verify all the keys before giving up so that all the errors are reported.
+            strings = [
+                _verify_string(value=cubelet[key], path=path + (key,), errors=errors)
+                for key in _CUBELET_KEYS
+            ]
+            if not all(strings):
+                continue
+
+            for dimension, (
+                from_key,
+                to_key,
+                index_map,
+                verify_range,
+            ) in _DIMENSIONS.items():
+                first = index_map.get(cubelet[from_key], None)
+                last = index_map.get(cubelet[to_key], None)
+
+                if first is not None and last is not None and first <= last:
+                    continue
+
+                # Only the invalid ranges need to be explained.
+                range_error = verify_range(cubelet[from_key], cubelet[to_key])
+                assert range_error is not None
+
+                # Point to the end of the range only if the start is fine.
+                key = to_key if first is not None and last is None else from_key
+
+                errors.append(
+                    (
+                        path + (key,),
+                        f"Invalid {dimension} range in cubelet {i + 1}",
+                        range_error,
+                    )
+                )
+
+    return errors
+
+
+# A JSON string, optionally followed by a colon if it is a key of an object
+_JSON_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"(?P<colon>\s*:)?')
+
+
+def _key_paths(value: Any, prefix: _Path, paths: List[_Path]) -> None:
+    """Collect the paths to all the keys in ``value`` in the order of the JSON text."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            path = prefix + (key,)
+            paths.append(path)
+            _key_paths(value=item, prefix=path, paths=paths)
+
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            _key_paths(value=item, prefix=prefix + (i,), paths=paths)
+
+
+def _locate_keys(json_text: str, data: Any) -> Mapping[_Path, int]:
+    """
+    Map the paths to the keys in the parsed ``data`` to their offsets in ``json_text``.
+
+    Return an empty mapping if the keys can not be matched, *e.g.*, due to
+    duplicate keys in an object.
+    """
+    offsets = [
+        mtch.start()
+        for mtch in _JSON_STRING_RE.finditer(json_text)
+        if mtch.group("colon") is not None
+    ]
+
+    paths = []  # type: List[_Path]
+    _key_paths(value=data, prefix=(), paths=paths)
+
+    if len(paths) != len(offsets):
+        return dict()
+
+    return dict(zip(paths, offsets))
 
 
 class Range:
@@ -46,7 +312,8 @@ class Range:
         lambda block_start, text_start, text_end, block_end: block_start
         < text_start
         < text_end
-        < block_end
+        < block_end,
+        enabled=rasaeco.contracts.ENABLED,
     )
     def __init__(
         self, block_start: int, text_start: int, text_end: int, block_end: int
@@ -62,56 +329,56 @@ def find_meta(text: str) -> Tuple[Optional[Range], List[str]]:
     """
     Find the meta block in the file.
 
+    The text is scanned only up to the first opening and the first closing tag.
+
     Return (range, errors if any).
     """
-    mtch = re.search(_META_OPEN_RE, text)
-    if mtch is None:
-        return None, ["No opening <rasaeco-meta> could be found."]
+    opening = None  # type: Optional[re.Match[str]]
+    closing = None  # type: Optional[re.Match[str]]
 
-    block_start = mtch.start()
-    text_start = mtch.end()
+    for mtch in _META_TAG_RE.finditer(text):
+        if mtch.group("open") is not None:
+            if opening is None:
+                opening = mtch
+        elif closing is None:
+            closing = mtch
 
-    mtch = re.search(_META_CLOSE_RE, text)
-    if mtch is None:
-        return None, ["No closing </rasaeco-meta> could be found."]
+        if opening is not None and closing is not None:
+            break
 
-    text_end = mtch.start()
-    block_end = mtch.end()
+    if opening is None:
+        return None, ["No opening <rasaeco-meta> could be found."]
+
+    if closing is None:
+        return None, ["No closing </rasaeco-meta> could be found."]
 
-    if block_start > block_end:
+    if opening.start() > closing.end():
         return None, ["Opening <rasaeco-meta> comes after closing </rasaeco-meta>."]
 
     return (
         Range(
-            block_start=block_start,
-            text_start=text_start,
-            text_end=text_end,
-            block_end=block_end,
+            block_start=opening.start(),
+            text_start=opening.end(),
+            text_end=closing.start(),
+            block_end=closing.end(),
         ),
         [],
     )
 
 
-def extract_meta(text: str) -> Tuple[Optional[Meta], List[str]]:
-    """Extract meta information from the given markdown."""
-    meta_range, errors = find_meta(text=text)
-    if errors:
-        return None, errors
-
-    assert meta_range is not None
-
-    meta_lineno = 0
-    for i in range(0, meta_range.block_start):
-        if text[i] == "\n":
-            meta_lineno += 1
+def parse_meta(text: str, meta_range: Range) -> Tuple[Optional[Meta], List[str]]:
+    """
+    Parse the meta information found in the ``meta_range`` of the markdown.
 
+    Return (meta, errors if any).
+    """
     meta_text = text[meta_range.text_start : meta_range.text_end]
 
     data = None  # type: Optional[Any]
     try:
         data = json.loads(meta_text)
     except json.decoder.JSONDecodeError as error:
-        lineno = error.lineno + meta_lineno
+        lineno = error.lineno + text.count("\n", 0, meta_range.block_start)
 
         lines = [
             f"Failed to parse the JSON in <rasaeco-meta> at line {lineno}: {error.msg}"
@@ -125,9 +392,37 @@ def extract_meta(text: str) -> Tuple[Optional[Meta], List[str]]:
 
         return None, ["\n".join(lines)]
 
-    try:
-        typeguard.check_type(argname="meta", value=data, expected_type=Meta)
-    except TypeError as error:
-        return None, [f"Failed to parse JSON rasaeco-meta data: {error}"]
+    verification_errors = verify(data=data)
+    if verification_errors:
+        # The keys are only located in case of errors as the happy path needs
+        # no line numbers.
+        offsets = _locate_keys(json_text=meta_text, data=data)
+
+        errors = []  # type: List[str]
+        for path, subject, detail in verification_errors:
+            # The errors are reported at the closest enclosing key, or at the opening
+            # tag if there is none.
+            offset = meta_range.block_start
+            for end in range(len(path), 0, -1):
+                key_offset = offsets.get(path[:end], None)
+                if key_offset is not None:
+                    offset = meta_range.text_start + key_offset
+                    break
+
+            lineno = text.count("\n", 0, offset) + 1
+            errors.append(f"{subject} at line {lineno}: {detail}")
+
+        return None, errors
 
     return data, []
+
+
+def extract_meta(text: str) -> Tuple[Optional[Meta], List[str]]:
+    """Extract meta information from the given markdown."""
+    meta_range, errors = find_meta(text=text)
+    if errors:
+        return None, errors
+
+    assert meta_range is not None
+
+    return parse_meta(text=text, meta_range=meta_range)
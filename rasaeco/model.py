@@ -5,6 +5,8 @@ from typing import Optional, List, MutableMapping, Mapping, cast, Dict, Set
 
 import icontract
 
+import rasaeco.contracts
+
 ASPECTS = [
     "as-planned",
     "as-observed",
@@ -16,6 +18,9 @@ ASPECTS = [
 ]
 ASPECT_SET = set(ASPECTS)
 
+#: Aspect → its position in :py:data:`ASPECTS`
+ASPECT_INDEX = {aspect: i for i, aspect in enumerate(ASPECTS)}
+
 
 def verify_aspect_range(first: str, last: str) -> Optional[str]:
     """
@@ -23,14 +28,15 @@ def verify_aspect_range(first: str, last: str) -> Optional[str]:
 
     Return error if any.
     """
-    if first not in ASPECT_SET:
+    i = ASPECT_INDEX.get(first, None)
+    j = ASPECT_INDEX.get(last, None)
+
+    if i is None:
         return f"Unexpected start of an aspect range: {first!r}; possible aspects are: {ASPECTS}"
 
-    if last not in ASPECT_SET:
+    if j is None:
         return f"Unexpected end of an aspect range: {last!r}; possible aspects are: {ASPECTS}"
 
-    i = ASPECTS.index(first)
-    j = ASPECTS.index(last)
     if i > j:
         return f"Invalid aspect range: {first!r} comes after {last!r}."
 
@@ -40,7 +46,10 @@ def verify_aspect_range(first: str, last: str) -> Optional[str]:
 class AspectRange:
     """Represent a range over aspect in the scenario space."""
 
-    @icontract.require(lambda first, last: verify_aspect_range(first, last) is None)
+    @icontract.require(
+        lambda first, last: verify_aspect_range(first, last) is None,
+        enabled=rasaeco.contracts.ENABLED,
+    )
     def __init__(self, first: str, last: str) -> None:
         """Initialize with the given values."""
         self.first = first
@@ -50,6 +59,9 @@ class AspectRange:
 PHASES = ["planning", "construction", "operation", "renovation", "demolition"]
 PHASE_SET = set(PHASES)
 
+#: Phase → its position in :py:data:`PHASES`
+PHASE_INDEX = {phase: i for i, phase in enumerate(PHASES)}
+
 
 def verify_phase_range(first: str, last: str) -> Optional[str]:
     """
@@ -57,16 +69,17 @@ def verify_phase_range(first: str, last: str) -> Optional[str]:
 
     Return error if any.
     """
-    if first not in PHASE_SET:
+    i = PHASE_INDEX.get(first, None)
+    j = PHASE_INDEX.get(last, None)
+
+    if i is None:
         return f"Unexpected start of a phase range: {first!r}; possible phases are: {PHASES}"
 
-    if last not in PHASE_SET:
+    if j is None:
         return (
             f"Unexpected end of a phase range: {last!r}; possible phases are: {PHASES}"
         )
 
-    i = PHASES.index(first)
-    j = PHASES.index(last)
     if i > j:
         return f"Invalid phase range: {first!r} comes after {last!r}."
 
@@ -76,7 +89,10 @@ def verify_phase_range(first: str, last: str) -> Optional[str]:
 class PhaseRange:
     """Represent a range over phase in the scenario space."""
 
-    @icontract.require(lambda first, last: verify_phase_range(first, last) is None)
+    @icontract.require(
+        lambda first, last: verify_phase_range(first, last) is None,
+        enabled=rasaeco.contracts.ENABLED,
+    )
     def __init__(self, first: str, last: str) -> None:
         """Initialize with the given values."""
         self.first = first
@@ -94,6 +110,9 @@ LEVELS = [
 ]
 LEVEL_SET = set(LEVELS)
 
+#: Level → its position in :py:data:`LEVELS`
+LEVEL_INDEX = {level: i for i, level in enumerate(LEVELS)}
+
 
 def verify_level_range(first: str, last: str) -> Optional[str]:
     """
@@ -101,16 +120,17 @@ def verify_level_range(first: str, last: str) -> Optional[str]:
 
     Return error if any.
     """
-    if first not in LEVEL_SET:
+    i = LEVEL_INDEX.get(first, None)
+    j = LEVEL_INDEX.get(last, None)
+
+    if i is None:
         return f"Unexpected start of a level range: {first!r}; possible levels are: {LEVELS}"
 
-    if last not in LEVEL_SET:
+    if j is None:
         return (
             f"Unexpected end of a level range: {last!r}; possible levels are: {LEVELS}"
         )
 
-    i = LEVELS.index(first)
-    j = LEVELS.index(last)
     if i > j:
         return f"Invalid level range: {first!r} comes after {last!r}."
 
@@ -120,13 +140,29 @@ def verify_level_range(first: str, last: str) -> Optional[str]:
 class LevelRange:
     """Represent a range over level in the scenario space."""
 
-    @icontract.require(lambda first, last: verify_level_range(first, last) is None)
+    @icontract.require(
+        lambda first, last: verify_level_range(first, last) is None,
+        enabled=rasaeco.contracts.ENABLED,
+    )
     def __init__(self, first: str, last: str) -> None:
         """Initialize with the given values."""
         self.first = first
         self.last = last
 
 
+#: Number of voxels in the scenario space (phases × levels × aspects)
+VOXEL_COUNT = len(PHASES) * len(LEVELS) * len(ASPECTS)
+
+
+def voxel_bit(phase: int, level: int, aspect: int) -> int:
+    """
+    Compute the position of the voxel in an occupancy mask.
+
+    The voxels are ordered by phase, then by level and finally by aspect.
+    """
+    return (phase * len(LEVELS) + level) * len(ASPECTS) + aspect
+
+
 class Cubelet:
     """Represent a cubelet in the scenario space."""
 
@@ -136,11 +172,29 @@ class Cubelet:
         phase_range: PhaseRange,
         level_range: LevelRange,
     ) -> None:
-        """Initialize with the given values."""
+        """Initialize with the given values and compute the occupancy mask."""
         self.aspect_range = aspect_range
         self.phase_range = phase_range
         self.level_range = level_range
 
+        aspect_first = ASPECT_INDEX[aspect_range.first]
+        aspect_last = ASPECT_INDEX[aspect_range.last]
+
+        # The aspects of a phase and a level are contiguous in the mask.
+        aspect_run = (1 << (aspect_last - aspect_first + 1)) - 1
+
+        occupancy = 0
+        for phase in range(
+            PHASE_INDEX[phase_range.first], PHASE_INDEX[phase_range.last] + 1
+        ):
+            for level in range(
+                LEVEL_INDEX[level_range.first], LEVEL_INDEX[level_range.last] + 1
+            ):
+                occupancy |= aspect_run << voxel_bit(phase, level, aspect_first)
+
+        # Bit mask of the occupied voxels, see :py:func:`voxel_bit`
+        self.occupancy = occupancy
+
 
 class Relation:
     """Represent a directed relation between two scenarios."""
@@ -165,7 +219,10 @@ class Definitions:
 class Scenario:
     """Represent a working model of a scenario."""
 
-    @icontract.require(lambda relative_path: not relative_path.is_absolute())
+    @icontract.require(
+        lambda relative_path: not relative_path.is_absolute(),
+        enabled=rasaeco.contracts.ENABLED,
+    )
     def __init__(
         self,
         identifier: str,
@@ -183,16 +240,23 @@ class Scenario:
         self.definitions = definitions
         self.relative_path = relative_path
 
+        occupancy = 0
+        for cubelet in volumetric:
+            occupancy |= cubelet.occupancy
+
+        # Bit mask of the voxels occupied by any of the cubelets,
+        # see :py:func:`voxel_bit`
+        self.occupancy = occupancy
+
 
 class Ontology:
     """Represent the whole ontology of the scenarios."""
 
     @icontract.require(
-        lambda scenarios, relations: (
-            scenario_id_set := {s.identifier for s in scenarios},
-            all(r.source in scenario_id_set for r in relations)
-            and all(r.target in scenario_id_set for r in relations),
-        )
+        lambda scenarios, relations: {r.source for r in relations}
+        | {r.target for r in relations}
+        <= {s.identifier for s in scenarios},
+        enabled=rasaeco.contracts.ENABLED,
     )
     def __init__(self, scenarios: List[Scenario], relations: List[Relation]) -> None:
         """Initialize with the given values."""
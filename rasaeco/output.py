@@ -0,0 +1,71 @@
+"""Write the rendered artefacts only if their content changed."""
+import gzip
+import pathlib
+
+#: Suffixes of the text artefacts which are also stored compressed next to them
+#: so that the demo server need not compress them on every request
+COMPRESSED_SUFFIXES = frozenset([".html", ".json", ".svg"])
+
+
+def unchanged(path: pathlib.Path, data: bytes) -> bool:
+    """Check whether the file at ``path`` already contains exactly the ``data``."""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+
+        return path.read_bytes() == data
+    except FileNotFoundError:
+        return False
+
+
+def compressed_path(path: pathlib.Path) -> pathlib.Path:
+    """Generate the path to the compressed variant of the artefact."""
+    return path.parent / (path.name + ".gz")
+
+
+def compress(data: bytes) -> bytes:
+    """
+    Compress the ``data`` with gzip.
+
+    No time stamp is included so that the same data always gives the same archive.
+    """
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def write_compressed(path: pathlib.Path, data: bytes) -> bool:
+    """
+    Write the compressed ``data`` next to the ``path`` unless it is already there.
+
+    Return True if the compressed variant has been written.
+    """
+    pth = compressed_path(path)
+    compressed = compress(data)
+
+    if unchanged(path=pth, data=compressed):
+        return False
+
+    pth.write_bytes(compressed)
+    return True
+
+
+def write_if_changed(path: pathlib.Path, data: bytes) -> bool:
+    """
+    Write the ``data`` to the ``path`` unless the file already contains it.
+
+    The untouched files keep their modification times so that the HTTP caches and
+    the synchronization tools such as rsync see no change.
+
+    The text artefacts are also compressed next to the ``path``. The compressed
+    variant is written last so that it is never older than the artefact.
+
+    Return True if the file has been written.
+    """
+    written = False
+    if not unchanged(path=path, data=data):
+        path.write_bytes(data)
+        written = True
+
+    if path.suffix.lower() in COMPRESSED_SUFFIXES:
+        write_compressed(path=path, data=data)
+
+    return written
@@ -0,0 +1,45 @@
+"""Distribute independent rendering tasks over a pool of processes."""
+import concurrent.futures
+from typing import Any, Callable, List, Mapping, Sequence, TypeVar
+
+import icontract
+
+T = TypeVar("T")
+
+
+def _call(function: Callable[..., T], kwargs: Mapping[str, Any]) -> T:
+    """Call the function with the keyword arguments in a worker process."""
+    return function(**kwargs)
+
+
+@icontract.require(lambda jobs: jobs >= 1)
+@icontract.ensure(lambda kwargs_list, result: len(kwargs_list) == len(result))
+def map_in_order(
+    function: Callable[..., T], kwargs_list: Sequence[Mapping[str, Any]], jobs: int
+) -> List[T]:
+    """
+    Call the function on each of the keyword arguments using ``jobs`` processes.
+
+    The ``function`` needs to be defined at the module level and its arguments need
+    to be picklable if ``jobs`` is larger than 1.
+
+    The results are returned in the order of the ``kwargs_list`` regardless of
+    the order in which the tasks finish so that the errors can be reported
+    deterministically.
+    """
+    if jobs == 1 or len(kwargs_list) <= 1:
+        return [function(**kwargs) for kwargs in kwargs_list]
+
+    # The tasks are pickled in chunks. Objects shared among the tasks of a chunk,
+    # such as the ontology, are thus pickled only once per chunk.
+    chunksize = max(1, len(kwargs_list) // (4 * jobs))
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(
+            executor.map(
+                _call,
+                [function] * len(kwargs_list),
+                kwargs_list,
+                chunksize=chunksize,
+            )
+        )
@@ -0,0 +1,161 @@
+"""Share the volumetric plots among the scenarios with the same occupancy."""
+import os
+import pathlib
+import shutil
+import uuid
+from typing import Callable, List, Optional
+
+import icontract
+
+import rasaeco.manifest
+import rasaeco.output
+
+#: Version of the plot style; bump it whenever the appearance of the plots changes
+STYLE = 1
+
+#: Default upper bound on the total size of the cached plots in bytes
+DEFAULT_LIMIT = 32 * 1024 * 1024
+
+# The plots are hard-linked to the scenarios so that the times of their use are
+# recorded on separate files. Otherwise the plots of the other scenarios would
+# appear modified on every use.
+_USED_DIR = "used"
+
+
+def cache_dir(scenarios_dir: pathlib.Path) -> pathlib.Path:
+    """Generate the path to the plot cache of the scenarios directory."""
+    return scenarios_dir / rasaeco.manifest.CACHE_DIR / "plots"
+
+
+def _used_path(directory: pathlib.Path, key: str) -> pathlib.Path:
+    """Generate the path to the file whose modification time marks the last use."""
+    return directory / _USED_DIR / key
+
+
+@icontract.require(lambda occupancy: occupancy >= 0)
+@icontract.require(lambda suffix: suffix.startswith("."))
+def key(occupancy: int, variant: str, suffix: str) -> str:
+    """
+    Compute the file name of the plot in the cache.
+
+    The ``occupancy`` is the mask of the voxels occupied by the scenario.
+    The ``variant`` distinguishes between the plots of the same occupancy,
+    *e.g.*, the full plot and the thumbnail of a certain size.
+    """
+    return f"{occupancy:x}-{variant}-v{STYLE}{suffix}"
+
+
+def _replace_with_link_or_copy(source: pathlib.Path, target: pathlib.Path) -> None:
+    """
+    Hard-link the source to the target, or copy it if the link is not possible.
+
+    The target is left untouched if it already has the content of the source.
+    """
+    if target.exists() and (
+        os.path.samefile(str(source), str(target))
+        or rasaeco.output.unchanged(path=target, data=source.read_bytes())
+    ):
+        return
+
+    tmp = target.parent / f".{target.name}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.link(str(source), str(tmp))
+    except OSError:
+        shutil.copyfile(str(source), str(tmp))
+
+    # We never write into the target in-place so that the linked cache entry
+    # can not be corrupted.
+    os.replace(str(tmp), str(target))
+
+
+def fetch_or_produce(
+    directory: pathlib.Path,
+    key: str,
+    path: pathlib.Path,
+    produce: Callable[[], bytes],
+) -> Optional[str]:
+    """
+    Put the plot from the cache to the ``path``.
+
+    If the plot is missing in the cache, ``produce`` it and cache it first.
+
+    Return error if any.
+    """
+    cached = directory / key
+
+    try:
+        if not cached.exists():
+            data = produce()
+
+            directory.mkdir(parents=True, exist_ok=True)
+
+            # Write to a unique temporary file first since another process might
+            # produce the same plot at the same time.
+            tmp = directory / f".{key}.{uuid.uuid4().hex}.tmp"
+            tmp.write_bytes(data)
+            os.replace(str(tmp), str(cached))
+
+        # Mark the plot as recently used for the eviction
+        used = _used_path(directory=directory, key=key)
+        used.parent.mkdir(exist_ok=True)
+        used.touch()
+
+        _replace_with_link_or_copy(source=cached, target=path)
+    except Exception as exception:
+        return f"Failed to save the volumetric plot to {path}: {exception}"
+
+    return None
+
+
+@icontract.require(lambda limit: limit >= 0)
+def evict(directory: pathlib.Path, limit: int) -> List[pathlib.Path]:
+    """
+    Remove the least recently used plots until the cache fits in ``limit`` bytes.
+
+    The plots which have not been marked as used are considered used when they
+    were last modified.
+
+    Return the removed plots.
+    """
+    if not directory.exists():
+        return []
+
+    sizes = []  # type: List[int]
+    used_times = []  # type: List[float]
+    pths = []  # type: List[pathlib.Path]
+    for pth in directory.iterdir():
+        if pth.name.startswith(".") or pth.name == _USED_DIR:
+            continue
+
+        try:
+            stat = pth.stat()
+        except FileNotFoundError:
+            # The plot has been removed in the meanwhile.
+            continue
+
+        try:
+            used_time = _used_path(directory=directory, key=pth.name).stat().st_mtime
+        except FileNotFoundError:
+            used_time = stat.st_mtime
+
+        sizes.append(stat.st_size)
+        used_times.append(used_time)
+        pths.append(pth)
+
+    total = sum(sizes)
+
+    removed = []  # type: List[pathlib.Path]
+    for i in sorted(range(len(pths)), key=lambda i: used_times[i]):
+        if total <= limit:
+            break
+
+        for pth in [pths[i], _used_path(directory=directory, key=pths[i].name)]:
+            try:
+                pth.unlink()
+            except FileNotFoundError:
+                pass
+
+        total -= sizes[i]
+        removed.append(pths[i])
+
+    return removed
@@ -0,0 +1,251 @@
+"""Measure where the time and the memory go during the rendering."""
+import contextlib
+import dataclasses
+import json
+import os
+import sys
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+import icontract
+
+import rasaeco.parallel
+
+try:
+    import resource
+except ImportError:
+    # The peak memory is not available on Windows.
+    resource = None  # type: ignore
+
+T = TypeVar("T")
+
+
+@dataclasses.dataclass
+class Span:
+    """Represent a measured piece of work, either a stage or a task of a scenario."""
+
+    #: Name of the stage
+    name: str
+
+    #: Path to the scenario if the span is a task of a single scenario
+    scenario: Optional[str]
+
+    #: Start as seconds since the epoch so that the spans of all the processes
+    #: can be put on the same time line
+    start: float
+
+    #: Elapsed wall-clock time in seconds
+    wall: float
+
+    #: CPU time in seconds, including the finished worker processes for the stages
+    cpu: float
+
+    #: Peak resident memory of the process in bytes by the end of the span,
+    #: if available
+    peak_memory: Optional[int]
+
+    #: Process in which the span has been measured
+    pid: int
+
+
+def peak_memory() -> Optional[int]:
+    """Retrieve the peak resident memory of this process and its finished workers."""
+    if resource is None:
+        return None
+
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+    # The peak is given in bytes on Mac OS and in kilobytes everywhere else.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _cpu_time() -> float:
+    """Retrieve the CPU time of this process and its finished workers in seconds."""
+    # The process time is more precise than the process times of the operating system.
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+
+@contextlib.contextmanager
+def measure(name: str, scenario: Optional[str] = None) -> Iterator[Span]:
+    """
+    Measure the block.
+
+    The yielded span is filled in once the block is exited.
+    """
+    span = Span(
+        name=name,
+        scenario=scenario,
+        start=time.time(),
+        wall=0.0,
+        cpu=0.0,
+        peak_memory=None,
+        pid=os.getpid(),
+    )
+
+    start = time.perf_counter()
+    start_cpu = _cpu_time()
+    try:
+        yield span
+    finally:
+        span.wall = time.perf_counter() - start
+        span.cpu = _cpu_time() - start_cpu
+        span.peak_memory = peak_memory()
+
+
+def _call_measured(
+    function: Callable[..., T], name: str, scenario: str, kwargs: Mapping[str, Any]
+) -> Tuple[T, Span]:
+    """Call the function with the keyword arguments and measure the call."""
+    with measure(name=name, scenario=scenario) as span:
+        result = function(**kwargs)
+
+    return result, span
+
+
+@icontract.require(lambda kwargs_list, scenarios: len(kwargs_list) == len(scenarios))
+@icontract.ensure(lambda kwargs_list, result: len(kwargs_list) == len(result))
+def map_in_order(
+    function: Callable[..., T],
+    kwargs_list: Sequence[Mapping[str, Any]],
+    jobs: int,
+    name: str,
+    scenarios: Sequence[str],
+    spans: List[Span],
+) -> List[T]:
+    """
+    Call the function as :py:func:`rasaeco.parallel.map_in_order` and measure it.
+
+    Each call is measured in the process it runs in as a task of the corresponding
+    scenario of the ``scenarios``. The measured spans are appended to ``spans``.
+    """
+    results = rasaeco.parallel.map_in_order(
+        function=_call_measured,
+        kwargs_list=[
+            {
+                "function": function,
+                "name": name,
+                "scenario": scenario,
+                "kwargs": kwargs,
+            }
+            for scenario, kwargs in zip(scenarios, kwargs_list)
+        ],
+        jobs=jobs,
+    )
+
+    spans.extend(span for _, span in results)
+    return [result for result, _ in results]
+
+
+def _format_memory(peak: Optional[int]) -> str:
+    """Format the peak memory in megabytes."""
+    return "n/a" if peak is None else f"{peak / (1024 * 1024):.1f} MB"
+
+
+def _in_order(spans: Sequence[Span]) -> List[Span]:
+    """
+    Sort the spans by their start.
+
+    The spans are recorded when they end so that the nested stages come before
+    the enclosing ones. The enclosing span comes first if both start together.
+    """
+    return sorted(spans, key=lambda span: (span.start, -span.wall))
+
+
+@icontract.require(lambda limit: limit >= 0)
+def format_report(spans: Sequence[Span], limit: int = 10) -> str:
+    """
+    Format a report of the stages and of the ``limit`` slowest scenarios.
+
+    The stages are listed in the order they started. The time of a scenario is
+    summed over all its tasks.
+    """
+    spans = _in_order(spans)
+
+    lines = ["Stages (wall time, CPU time, peak memory):"]
+
+    for span in spans:
+        if span.scenario is None:
+            lines.append(
+                f"  {span.name:<14} {span.wall:9.3f} s {span.cpu:9.3f} s "
+                f"{_format_memory(span.peak_memory):>12}"
+            )
+
+    # Scenario → task → (wall, CPU)
+    tasks_by_scenario = dict()  # type: Dict[str, Dict[str, Tuple[float, float]]]
+
+    for span in spans:
+        if span.scenario is not None:
+            tasks = tasks_by_scenario.setdefault(span.scenario, dict())
+            wall, cpu = tasks.get(span.name, (0.0, 0.0))
+            tasks[span.name] = (wall + span.wall, cpu + span.cpu)
+
+    slowest = sorted(
+        tasks_by_scenario.items(),
+        key=lambda item: (-sum(wall for wall, _ in item[1].values()), item[0]),
+    )[:limit]
+
+    if slowest:
+        lines.append(f"The {len(slowest)} slowest scenarios (wall time, CPU time):")
+
+        for scenario, tasks in slowest:
+            wall = sum(wall for wall, _ in tasks.values())
+            cpu = sum(cpu for _, cpu in tasks.values())
+            breakdown = ", ".join(
+                f"{name} {task_wall:.3f} s" for name, (task_wall, _) in tasks.items()
+            )
+            lines.append(f"  {wall:9.3f} s {cpu:9.3f} s  {scenario} ({breakdown})")
+
+    return "\n".join(lines)
+
+
+def to_chrome_trace(spans: Sequence[Span]) -> str:
+    """
+    Convert the spans to a trace in Chrome trace event format.
+
+    The trace can be inspected with ``chrome://tracing`` or https://ui.perfetto.dev.
+    The stages and the tasks of each process are shown in separate rows.
+    """
+    events = []  # type: List[Mapping[str, Any]]
+
+    for span in _in_order(spans):
+        args = {"cpu": span.cpu}  # type: MutableMapping[str, Any]
+        if span.peak_memory is not None:
+            args["peak_memory"] = span.peak_memory
+
+        if span.scenario is not None:
+            args["scenario"] = span.scenario
+
+        events.append(
+            {
+                "name": span.name
+                if span.scenario is None
+                else f"{span.name}: {span.scenario}",
+                "cat": "stage" if span.scenario is None else "scenario",
+                "ph": "X",
+                "ts": round(span.start * 1e6),
+                "dur": round(span.wall * 1e6),
+                "pid": span.pid,
+                # The stages enclose the tasks of the main process so that they need
+                # to be shown in a separate row.
+                "tid": 0 if span.scenario is None else 1,
+                "args": args,
+            }
+        )
+
+    return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
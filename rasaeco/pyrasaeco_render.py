@@ -3,19 +3,40 @@
 """Render the scenarios and the scenario ontology."""
 import argparse
 import contextlib
+import cProfile
 import dataclasses
 import io
+import json
+import multiprocessing
 import os
 import pathlib
 import queue
+import socket
 import sys
 import threading
 import time
-from typing import Tuple, Optional, Union, List, TextIO, Generator, TYPE_CHECKING
+from typing import (
+    Tuple,
+    Optional,
+    Union,
+    List,
+    TextIO,
+    Generator,
+    TYPE_CHECKING,
+    Set,
+)
 import http.server
 import socketserver
 
+import rasaeco.contracts
+import rasaeco.lazy
+import rasaeco.live_reload
+import rasaeco.manifest
+import rasaeco.output
+import rasaeco.profiling
 import rasaeco.render
+import rasaeco.scheduler
+import rasaeco.serving
 
 
 @dataclasses.dataclass
@@ -23,6 +44,12 @@ class Once:
     """Represent the command to render everything once."""
 
     scenarios_dir: pathlib.Path
+    verbose: bool
+    jobs: int
+    write_xml: bool
+    timings: bool
+    profile: Optional[pathlib.Path]
+    trace: Optional[pathlib.Path]
 
 
 @dataclasses.dataclass
@@ -31,11 +58,28 @@ class Continuously:
 
     scenarios_dir: pathlib.Path
     port: Optional[int]
+    verbose: bool
+    jobs: int
+    write_xml: bool
+    debounce: float
+    timings: bool
+    workers: int
+    max_pending: int
+    keep_alive_timeout: float
+    lazy: bool
+    profile: Optional[pathlib.Path]
+    trace: Optional[pathlib.Path]
 
 
 def _make_argument_parser() -> argparse.ArgumentParser:
     """Create an instance of the argument parser to parse command-line arguments."""
-    parser = argparse.ArgumentParser(prog="pyrasaeco-render", description=__doc__)
+    parser = argparse.ArgumentParser(
+        prog="pyrasaeco-render",
+        description=__doc__,
+        epilog=f"Set the environment variable "
+        f"{rasaeco.contracts.FAST_ENVIRONMENT_VARIABLE}=1 to skip the runtime checks "
+        f"of the contracts on the hot paths.",
+    )
     subparsers = parser.add_subparsers(help="Commands", dest="command")
     subparsers.required = True
 
@@ -56,6 +100,42 @@ def _make_argument_parser() -> argparse.ArgumentParser:
         type=int,
     )
 
+    continuously.add_argument(
+        "--workers",
+        help="Number of threads of the demo server handling the requests",
+        type=int,
+        default=rasaeco.serving.DEFAULT_WORKERS,
+    )
+
+    continuously.add_argument(
+        "--max_pending",
+        help="Number of connections to the demo server which can wait "
+        "for a free thread before the server answers that it is busy",
+        type=int,
+        default=rasaeco.serving.DEFAULT_MAX_PENDING,
+    )
+
+    continuously.add_argument(
+        "--keep_alive_timeout",
+        help="Seconds after which the demo server closes an idle connection",
+        type=float,
+        default=rasaeco.serving.DEFAULT_KEEP_ALIVE_TIMEOUT,
+    )
+
+    continuously.add_argument(
+        "--lazy",
+        help="Render the scenarios on request in the demo server "
+        "while the whole corpus is still being rendered; requires --port",
+        action="store_true",
+    )
+
+    continuously.add_argument(
+        "--debounce",
+        help="Seconds to wait for further changes before re-rendering",
+        type=float,
+        default=0.3,
+    )
+
     for command in [once, continuously]:
         command.add_argument(
             "-s",
@@ -65,6 +145,52 @@ def _make_argument_parser() -> argparse.ArgumentParser:
             required=True,
         )
 
+        command.add_argument(
+            "-v",
+            "--verbose",
+            help="Report which artefacts have been re-rendered and which skipped, and why",
+            action="store_true",
+        )
+
+        command.add_argument(
+            "-j",
+            "--jobs",
+            help="Number of processes used to render the scenarios in parallel",
+            type=int,
+            default=1,
+        )
+
+        command.add_argument(
+            "--timings",
+            help="Report the time and the peak memory of the rendering stages "
+            "and the slowest scenarios",
+            action="store_true",
+        )
+
+        command.add_argument(
+            "--profile",
+            help="Profile the rendering with cProfile and store the statistics "
+            "to the given file\n\n"
+            "Only the main process is profiled; use --jobs 1 to profile everything. "
+            "When rendering continuously, the file is overwritten "
+            "after each rendering.",
+        )
+
+        command.add_argument(
+            "--trace",
+            help="Store the measured stages and scenario tasks to the given file "
+            "in Chrome trace event format (see chrome://tracing)\n\n"
+            "When rendering continuously, the file is overwritten "
+            "after each rendering.",
+        )
+
+        command.add_argument(
+            "--write_intermediate_xml",
+            help="Store the intermediate XML representation of the scenarios "
+            "next to them for debugging",
+            action="store_true",
+        )
+
     return parser
 
 
@@ -78,13 +204,64 @@ def _parse_args_to_params(
     """
     errors = []  # type: List[str]
 
+    if args.jobs < 1:
+        errors.append(f"The --jobs must be at least 1, but got: {args.jobs}")
+
+    if args.command == "continuously":
+        if args.debounce < 0.0:
+            errors.append(
+                f"The --debounce must be non-negative, but got: {args.debounce}"
+            )
+
+        if args.workers < 1:
+            errors.append(f"The --workers must be at least 1, but got: {args.workers}")
+
+        if args.max_pending < 0:
+            errors.append(
+                f"The --max_pending must be non-negative, but got: {args.max_pending}"
+            )
+
+        if args.lazy and args.port is None:
+            errors.append("The --lazy rendering requires the demo server (--port).")
+
+        if args.keep_alive_timeout <= 0.0:
+            errors.append(
+                f"The --keep_alive_timeout must be positive, "
+                f"but got: {args.keep_alive_timeout}"
+            )
+
+    if errors:
+        return None, errors
+
     if args.command == "once":
-        return Once(scenarios_dir=pathlib.Path(args.scenarios_dir)), []
+        return (
+            Once(
+                scenarios_dir=pathlib.Path(args.scenarios_dir),
+                verbose=bool(args.verbose),
+                jobs=int(args.jobs),
+                write_xml=bool(args.write_intermediate_xml),
+                timings=bool(args.timings),
+                profile=None if args.profile is None else pathlib.Path(args.profile),
+                trace=None if args.trace is None else pathlib.Path(args.trace),
+            ),
+            [],
+        )
     elif args.command == "continuously":
         return (
             Continuously(
                 scenarios_dir=pathlib.Path(args.scenarios_dir),
                 port=None if args.port is None else int(args.port),
+                verbose=bool(args.verbose),
+                jobs=int(args.jobs),
+                write_xml=bool(args.write_intermediate_xml),
+                debounce=float(args.debounce),
+                timings=bool(args.timings),
+                workers=int(args.workers),
+                max_pending=int(args.max_pending),
+                keep_alive_timeout=float(args.keep_alive_timeout),
+                lazy=bool(args.lazy),
+                profile=None if args.profile is None else pathlib.Path(args.profile),
+                trace=None if args.trace is None else pathlib.Path(args.trace),
             ),
             [],
         )
@@ -134,23 +311,63 @@ else:
     StopQueue = queue.Queue
 
 
+#: Default number of the pages which can be notified about the re-rendering at a time
+DEFAULT_MAX_EVENT_STREAMS = 256
+
+
 class ThreadedServer:
     """Encapsulate a HTTP server running in a separate thread."""
 
     def __init__(
-        self, port: int, scenarios_dir: pathlib.Path, stdout: TextIO, stderr: TextIO
+        self,
+        port: int,
+        scenarios_dir: pathlib.Path,
+        stdout: TextIO,
+        stderr: TextIO,
+        hub: Optional[rasaeco.live_reload.Hub] = None,
+        workers: int = rasaeco.serving.DEFAULT_WORKERS,
+        max_pending: int = rasaeco.serving.DEFAULT_MAX_PENDING,
+        keep_alive_timeout: float = rasaeco.serving.DEFAULT_KEEP_ALIVE_TIMEOUT,
+        max_event_streams: int = DEFAULT_MAX_EVENT_STREAMS,
+        lazy: Optional[rasaeco.lazy.Renderer] = None,
     ) -> None:
         """
         Initialize with the given values and specify the handler.
 
+        If the ``hub`` is given, the re-rendered pages are streamed to the open pages
+        as server-sent events. The event streams are served on their own threads,
+        at most ``max_event_streams`` at a time, so that they do not occupy
+        the ``workers``.
+
+        The persistent connections are closed after ``keep_alive_timeout`` seconds
+        of inactivity so that the idle clients release their workers.
+
+        If the ``lazy`` renderer is given, the missing or stale pages and plots of
+        the scenarios are rendered on request. The scenarios are listed in place of
+        the ontology until it has been rendered.
+
+        The port 0 picks a free port which is then available as :py:attr:`port`.
+
         No thread is started.
         """
-        self.port = port
         self.scenarios_dir = scenarios_dir
         self.stdout = stdout
         self.stderr = stderr
+        self.hub = hub
+
+        event_streams = threading.BoundedSemaphore(max_event_streams)
+        etags = rasaeco.serving.ETags()
 
         class Handler(http.server.SimpleHTTPRequestHandler):
+            # Keep the connections alive between the requests
+            protocol_version = "HTTP/1.1"
+
+            timeout = keep_alive_timeout
+
+            # The headers and the body are written separately. Otherwise the second
+            # write waits for the delayed acknowledgement of the first one.
+            disable_nagle_algorithm = True
+
             def __init__(self, *args, **kwargs):  # type: ignore
                 super().__init__(
                     *args, directory=str(scenarios_dir), **kwargs
@@ -160,14 +377,191 @@ class ThreadedServer:
                 pass
 
             def do_GET(self):  # type: ignore
+                if self.path == rasaeco.live_reload.EVENTS_PATH and hub is not None:
+                    self._stream_events(hub=hub)
+                    return
+
                 if self.path == "/":
                     self.path = "ontology.html"
 
                 return http.server.SimpleHTTPRequestHandler.do_GET(self)
 
+            def send_head(self):  # type: ignore
+                """
+                Send the headers of the file with its entity tag.
+
+                The pages need to be re-validated with the entity tag on every load,
+                and are answered with 304 Not Modified if they did not change.
+                The compressed variants of the text artefacts are sent to
+                the clients which accept them. The pages rendered on request are
+                sent as they are.
+
+                Return the file to be sent as body, if any.
+                """
+                if lazy is not None:
+                    page, errors = lazy.fetch(url_path=self.path)
+                    if errors:
+                        self.send_error(
+                            500,
+                            "The scenario could not be rendered",
+                            "\n".join(errors),
+                        )
+                        return None
+
+                    if page is None and self.path in (
+                        "ontology.html",
+                        "/ontology.html",
+                    ):
+                        if not (scenarios_dir / "ontology.html").exists():
+                            page = lazy.pending_ontology()
+
+                    if page is not None:
+                        # The page is only served until the full rendering writes it.
+                        self.send_response(200)
+                        self.send_header("Content-Type", "text/html; charset=utf-8")
+                        self.send_header("Content-Length", str(len(page)))
+                        self.send_header("Cache-Control", "no-store")
+                        self.end_headers()
+                        return io.BytesIO(page)
+
+                pth = pathlib.Path(self.translate_path(self.path))
+                if self.path.endswith("/") or not pth.is_file():
+                    # Let the base handler redirect, list or report the missing file.
+                    return http.server.SimpleHTTPRequestHandler.send_head(self)
+
+                try:
+                    stat = pth.stat()
+                    etag = etags.get(path=pth, stat=stat)
+                except OSError:
+                    return http.server.SimpleHTTPRequestHandler.send_head(self)
+
+                compressible = pth.suffix.lower() in rasaeco.output.COMPRESSED_SUFFIXES
+
+                body_pth = pth
+                encoding = None  # type: Optional[str]
+
+                if compressible and rasaeco.serving.accepts_gzip(
+                    self.headers.get("Accept-Encoding")
+                ):
+                    compressed_pth = rasaeco.output.compressed_path(pth)
+                    try:
+                        compressed_stat = compressed_pth.stat()
+                    except OSError:
+                        compressed_stat = None
+
+                    # The compressed variant is written after the artefact so that
+                    # an older one is stale.
+                    if (
+                        compressed_stat is not None
+                        and compressed_stat.st_mtime_ns >= stat.st_mtime_ns
+                    ):
+                        body_pth = compressed_pth
+                        encoding = "gzip"
+                        etag = etag[:-1] + '-gzip"'
+
+                if rasaeco.serving.matches(self.headers.get("If-None-Match"), etag):
+                    self.send_response(304)
+                    self._send_validation_headers(etag, compressible)
+                    self.end_headers()
+                    return None
+
+                try:
+                    fid = body_pth.open("rb")
+                except OSError:
+                    return http.server.SimpleHTTPRequestHandler.send_head(self)
+
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", self.guess_type(str(pth)))
+                    self.send_header(
+                        "Content-Length", str(os.fstat(fid.fileno()).st_size)
+                    )
+                    if encoding is not None:
+                        self.send_header("Content-Encoding", encoding)
+                    self.send_header(
+                        "Last-Modified", self.date_time_string(int(stat.st_mtime))
+                    )
+                    self._send_validation_headers(etag, compressible)
+                    self.end_headers()
+                except Exception:
+                    fid.close()
+                    raise
+
+                return fid
+
+            def _send_validation_headers(self, etag: str, compressible: bool) -> None:
+                """Send the headers so that the clients re-validate their copies."""
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+                if compressible:
+                    self.send_header("Vary", "Accept-Encoding")
+
+            def _stream_events(self, hub: rasaeco.live_reload.Hub) -> None:
+                """Start streaming the re-rendered pages on a separate thread."""
+                # The event stream ends with the connection.
+                self.close_connection = True
+
+                if not event_streams.acquire(blocking=False):
+                    # The browsers re-connect to the event stream on their own.
+                    self.send_response(503)
+                    self.send_header("Retry-After", "5")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+
+                # The connection is handed over to a thread of its own so that
+                # the open pages do not occupy the workers.
+                self.server.detach(self.request)  # type: ignore
+
+                threading.Thread(
+                    target=self._send_events,
+                    args=(self.request, hub, hub.subscribe()),
+                    daemon=True,
+                ).start()
+
+            def _send_events(
+                self,
+                connection: socket.socket,
+                hub: rasaeco.live_reload.Hub,
+                subscription: rasaeco.live_reload.Subscription,
+            ) -> None:
+                """Send the re-rendered pages until the hub or the client closes."""
+                try:
+                    while True:
+                        try:
+                            pages = subscription.get(
+                                timeout=rasaeco.live_reload.KEEP_ALIVE
+                            )
+                        except queue.Empty:
+                            # Comments keep the connection alive and reveal
+                            # the clients which went away.
+                            connection.sendall(b": keep-alive\n\n")
+                            continue
+
+                        if pages is None:
+                            return
+
+                        connection.sendall(
+                            f"data: {json.dumps(pages)}\n\n".encode("utf-8")
+                        )
+                except OSError:
+                    pass
+                finally:
+                    hub.unsubscribe(subscription)
+                    self.server.close_detached(connection)  # type: ignore
+                    event_streams.release()
+
         self.handler = Handler
 
-        self._httpd = http.server.HTTPServer(("", port), Handler)
+        self._httpd = rasaeco.serving.PooledHTTPServer(
+            ("", port), Handler, workers=workers, max_pending=max_pending
+        )
+        self.port = self._httpd.server_address[1]
         self._work_thread = None  # type: Optional[threading.Thread]
 
         self._server_exception_lock = threading.Lock()
@@ -213,8 +607,13 @@ class ThreadedServer:
             if self._server_exception is not None:
                 raise self._server_exception
 
+        if self.hub is not None:
+            print(f"{prefix}: Closing the event streams...", file=self.stdout)
+            self.hub.close()
+
         print(f"{prefix}: Waiting for server to shut down...", file=self.stdout)
         self._httpd.shutdown()
+        self._httpd.server_close()
 
     def __enter__(self) -> "ThreadedServer":
         """Start the server."""
@@ -226,13 +625,58 @@ class ThreadedServer:
         self.shutdown()
 
 
+def _store_measurements(
+    profiler: Optional[cProfile.Profile],
+    profile: Optional[pathlib.Path],
+    trace: Optional[pathlib.Path],
+    spans: List[rasaeco.profiling.Span],
+) -> List[str]:
+    """
+    Store the profiling statistics and the trace of a rendering, if requested.
+
+    Return errors if any.
+    """
+    try:
+        if profiler is not None:
+            assert profile is not None
+            profiler.dump_stats(str(profile))
+
+        if trace is not None:
+            trace.write_text(
+                rasaeco.profiling.to_chrome_trace(spans=spans), encoding="utf-8"
+            )
+    except OSError as exception:
+        return [f"Failed to store the measurements: {exception}"]
+
+    return []
+
+
 def _render_continuously(
     stdout: TextIO,
     stderr: TextIO,
     scenarios_dir: pathlib.Path,
     stop: StopQueue,
+    verbose: bool = False,
+    jobs: int = 1,
+    write_xml: bool = False,
+    debounce: float = 0.3,
+    hub: Optional[rasaeco.live_reload.Hub] = None,
+    timings: bool = False,
+    profile: Optional[pathlib.Path] = None,
+    trace: Optional[pathlib.Path] = None,
 ) -> None:
-    """Render continuously the scenarios in an endless loop."""
+    """
+    Render continuously the scenarios in an endless loop.
+
+    The changes are collected until there have been none for ``debounce`` seconds.
+    A rendering in progress is cancelled when further changes arrive.
+
+    The pages re-rendered by each rendering are published to the ``hub``, if given.
+
+    If ``timings`` is set, the measurements of each rendering are reported.
+    The ``profile`` and the ``trace``, if given, are overwritten after each
+    rendering.
+    """
     # Watchdog modules are imported here (instead of importing them at the top) since
     # we had problems with permissions on Windows and anti-virus software complaining.
     #
@@ -248,44 +692,100 @@ def _render_continuously(
         file=stdout,
     )
 
-    signal_queue = queue.Queue()  # type: queue.Queue[int]
-
-    SHOULD_STOP = 0
-    SHOULD_RERENDER = 1
+    scheduler = rasaeco.scheduler.Scheduler(window=debounce)
 
     class EventHandler(watchdog.events.FileSystemEventHandler):  # type: ignore
-        """Push to the signal queue on any event."""
+        """Notify the scheduler about the changed scenarios."""
 
         def on_any_event(self, event):  # type: ignore
             """Handle any event."""
-            _, extension = os.path.splitext(event.src_path)
-            if extension == ".md":
-                signal_queue.put(SHOULD_RERENDER)
+            # Moved files have both the source and the destination path.
+            for path in [event.src_path, getattr(event, "dest_path", None)]:
+                if path is None:
+                    continue
+
+                _, extension = os.path.splitext(path)
+                if extension == ".md":
+                    scheduler.notify(pathlib.Path(path))
 
     def render() -> None:
-        """Re-render on signals and quit on stop."""
+        """Re-render on batches of changes and quit on stop."""
+        # Changes since the last complete rendering; None if all the scenarios need
+        # to be inspected, as is the case at the start
+        changed = None  # type: Optional[Set[pathlib.Path]]
+
         first = True
         while True:
-            action = None  # type: Optional[int]
             if not first:
-                action = signal_queue.get()
+                batch = scheduler.next_batch()
+                if batch is None:
+                    return
 
-            if first or action == SHOULD_RERENDER:
-                errors = rasaeco.render.once(scenarios_dir=scenarios_dir)
-                for error in errors:
-                    print(error, file=stderr)
-
-                if not errors:
+                if verbose:
                     print(
-                        f"{prefix}: The scenarios have been re-rendered.", file=stdout
+                        f"{prefix}: Re-rendering after the changes to: "
+                        f"{', '.join(sorted(str(pth) for pth in batch))}",
+                        file=stdout,
                     )
-                    first = False
 
-            elif action == SHOULD_STOP:
-                return
+                if changed is not None:
+                    changed.update(batch)
+
+            first = False
 
-            else:
-                raise AssertionError(f"Unexpected action: {action}")
+            # The profiler is enabled on the render thread so that it profiles
+            # this thread.
+            profiler = None  # type: Optional[cProfile.Profile]
+            if profile is not None:
+                profiler = cProfile.Profile()
+                profiler.enable()
+
+            report = rasaeco.manifest.Report()
+            try:
+                errors = rasaeco.render.once(
+                    scenarios_dir=scenarios_dir,
+                    report=report,
+                    jobs=jobs,
+                    write_xml=write_xml,
+                    should_cancel=scheduler.has_pending,
+                    changed=changed,
+                )
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+
+            if verbose:
+                for explanation in report.explanations:
+                    print(explanation, file=stdout)
+
+            if timings:
+                print(rasaeco.profiling.format_report(spans=report.spans), file=stdout)
+
+            for error in _store_measurements(
+                profiler=profiler, profile=profile, trace=trace, spans=report.spans
+            ):
+                print(error, file=stderr)
+
+            # The artefacts are written even if the rendering has been cancelled
+            # or failed in part.
+            if hub is not None:
+                hub.publish(
+                    rasaeco.live_reload.pages(
+                        scenarios_dir=scenarios_dir, rendered=report.rendered
+                    )
+                )
+
+            # The changes are carried over until a rendering completes so that
+            # nothing is missed if a rendering is cancelled or fails.
+            if report.cancelled:
+                continue
+
+            for error in errors:
+                print(error, file=stderr)
+
+            if not errors:
+                print(f"{prefix}: The scenarios have been re-rendered.", file=stdout)
+                changed = set()
 
     render_thread = threading.Thread(target=render)
     render_thread.start()
@@ -308,8 +808,8 @@ def _render_continuously(
         print(f"{prefix}: Joining the observer...", file=stdout)
         observer.join()
 
-        print(f"{prefix}: Putting SHOULD_STOP on signal queue...", file=stdout)
-        signal_queue.put(SHOULD_STOP)
+        print(f"{prefix}: Stopping the scheduler...", file=stdout)
+        scheduler.stop()
         print(f"{prefix}: Joining the render thread...", file=stdout)
         render_thread.join()
 
@@ -352,17 +852,57 @@ def run(argv: List[str], stdout: TextIO, stderr: TextIO) -> int:
         return 1
 
     if isinstance(command, Once):
-        errors = rasaeco.render.once(scenarios_dir=command.scenarios_dir)
+        profiler = None  # type: Optional[cProfile.Profile]
+        if command.profile is not None:
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        report = rasaeco.manifest.Report()
+        try:
+            errors = rasaeco.render.once(
+                scenarios_dir=command.scenarios_dir,
+                report=report,
+                jobs=command.jobs,
+                write_xml=command.write_xml,
+            )
+        finally:
+            if profiler is not None:
+                profiler.disable()
+
+        if command.verbose:
+            for explanation in report.explanations:
+                print(explanation, file=stdout)
+
+        if command.timings:
+            print(rasaeco.profiling.format_report(spans=report.spans), file=stdout)
+
+        errors.extend(
+            _store_measurements(
+                profiler=profiler,
+                profile=command.profile,
+                trace=command.trace,
+                spans=report.spans,
+            )
+        )
     elif isinstance(command, Continuously):
         server = None  # type: Optional[ThreadedServer]
+        hub = None  # type: Optional[rasaeco.live_reload.Hub]
 
         with contextlib.ExitStack() as exit_stack:
             if command.port is not None:
+                hub = rasaeco.live_reload.Hub()
                 server = ThreadedServer(
                     port=command.port,
                     scenarios_dir=command.scenarios_dir,
                     stdout=stdout,
                     stderr=stderr,
+                    hub=hub,
+                    workers=command.workers,
+                    max_pending=command.max_pending,
+                    keep_alive_timeout=command.keep_alive_timeout,
+                    lazy=rasaeco.lazy.Renderer(scenarios_dir=command.scenarios_dir)
+                    if command.lazy
+                    else None,
                 )
                 server.start()
                 exit_stack.push(server)
@@ -371,7 +911,20 @@ def run(argv: List[str], stdout: TextIO, stderr: TextIO) -> int:
 
             work_thread = threading.Thread(
                 target=_render_continuously,
-                args=(stdout, stderr, command.scenarios_dir, stop),
+                args=(
+                    stdout,
+                    stderr,
+                    command.scenarios_dir,
+                    stop,
+                    command.verbose,
+                    command.jobs,
+                    command.write_xml,
+                    command.debounce,
+                    hub,
+                    command.timings,
+                    command.profile,
+                    command.trace,
+                ),
             )
 
             prefix = "In the main"
@@ -403,6 +956,9 @@ def run(argv: List[str], stdout: TextIO, stderr: TextIO) -> int:
 
 def entry_point() -> int:
     """Wrap the entry_point routine wit default arguments."""
+    # Needed for the process pool in the single-file release on Windows
+    multiprocessing.freeze_support()
+
     return run(argv=sys.argv[1:], stdout=sys.stdout, stderr=sys.stderr)
 
 
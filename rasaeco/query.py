@@ -0,0 +1,290 @@
+"""Query the ontology through indexes precomputed over all the scenarios."""
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence
+
+import icontract
+import numpy as np
+
+import rasaeco.model
+import rasaeco.volumetric
+
+#: Kinds of the definitions which can be looked up
+DEFINITION_KINDS = ["model", "def", "test", "acceptance"]
+
+
+class Selection:
+    """
+    Represent a set of scenarios of an indexed ontology.
+
+    The scenarios are stored as bits of an integer, indexed by the position of
+    the scenario in the ontology, so that the set operations are cheap even for
+    thousands of scenarios.
+    """
+
+    def __init__(self, index: "Index", bits: int) -> None:
+        """Initialize with the given values."""
+        self.index = index
+        self.bits = bits
+
+    def _check(self, other: "Selection") -> None:
+        """Make sure that both selections refer to the same index."""
+        if other.index is not self.index:
+            raise ValueError(
+                "Unexpected set operation between the selections of different indexes"
+            )
+
+    def __and__(self, other: "Selection") -> "Selection":
+        """Select the scenarios in both selections."""
+        self._check(other)
+        return Selection(index=self.index, bits=self.bits & other.bits)
+
+    def __or__(self, other: "Selection") -> "Selection":
+        """Select the scenarios in either of the selections."""
+        self._check(other)
+        return Selection(index=self.index, bits=self.bits | other.bits)
+
+    def __sub__(self, other: "Selection") -> "Selection":
+        """Select the scenarios which are not in the ``other`` selection."""
+        self._check(other)
+        return Selection(index=self.index, bits=self.bits & ~other.bits)
+
+    def __xor__(self, other: "Selection") -> "Selection":
+        """Select the scenarios in exactly one of the selections."""
+        self._check(other)
+        return Selection(index=self.index, bits=self.bits ^ other.bits)
+
+    def __invert__(self) -> "Selection":
+        """Select all the other scenarios of the ontology."""
+        return Selection(index=self.index, bits=self.index.all().bits & ~self.bits)
+
+    def __eq__(self, other: object) -> bool:
+        """Check whether the selections contain the same scenarios of the same index."""
+        if not isinstance(other, Selection):
+            return NotImplemented
+
+        return self.index is other.index and self.bits == other.bits
+
+    def __hash__(self) -> int:
+        """Hash the selected scenarios."""
+        return hash(self.bits)
+
+    def __len__(self) -> int:
+        """Count the selected scenarios."""
+        return bin(self.bits).count("1")
+
+    def __bool__(self) -> bool:
+        """Check whether any scenario is selected."""
+        return self.bits != 0
+
+    def __contains__(self, identifier: object) -> bool:
+        """Check whether the scenario with the given identifier is selected."""
+        if not isinstance(identifier, str):
+            return False
+
+        position = self.index.positions.get(identifier, None)
+        return position is not None and bool((self.bits >> position) & 1)
+
+    def __iter__(self) -> Iterator[rasaeco.model.Scenario]:
+        """Iterate over the selected scenarios in the order of the ontology."""
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            yield self.index.ontology.scenarios[lowest.bit_length() - 1]
+            bits ^= lowest
+
+    def identifiers(self) -> List[str]:
+        """List the identifiers of the selected scenarios in the ontology order."""
+        return [scenario.identifier for scenario in self]
+
+    def __repr__(self) -> str:
+        """Represent the selection with the identifiers of the selected scenarios."""
+        return f"{Selection.__name__}({self.identifiers()!r})"
+
+
+def _bits_of(mask: np.ndarray) -> int:
+    """Convert the boolean mask over the scenarios to the bits of a selection."""
+    return int.from_bytes(
+        np.packbits(mask, bitorder="little").tobytes(), byteorder="little"
+    )
+
+
+class Index:
+    """
+    Index the scenarios of an ontology for fast lookups.
+
+    The indexes are computed once on initialization. The ontology must not be
+    modified afterwards.
+    """
+
+    def __init__(self, ontology: rasaeco.model.Ontology) -> None:
+        """Compute the indexes of the ``ontology``."""
+        self.ontology = ontology
+
+        # Scenario identifier → position of the scenario in the ontology
+        self.positions = {
+            scenario.identifier: i for i, scenario in enumerate(ontology.scenarios)
+        }  # type: Mapping[str, int]
+
+        self._all = (1 << len(ontology.scenarios)) - 1
+
+        # Nature → relations, bits of the source and bits of the target scenarios
+        relations_by_nature = dict()  # type: Dict[str, List[rasaeco.model.Relation]]
+        sources_by_nature = dict()  # type: Dict[str, int]
+        targets_by_nature = dict()  # type: Dict[str, int]
+
+        for relation in ontology.relations:
+            nature = relation.nature
+            relations_by_nature.setdefault(nature, []).append(relation)
+
+            sources_by_nature[nature] = sources_by_nature.get(nature, 0) | (
+                1 << self.positions[relation.source]
+            )
+            targets_by_nature[nature] = targets_by_nature.get(nature, 0) | (
+                1 << self.positions[relation.target]
+            )
+
+        self._relations_by_nature = relations_by_nature
+        self._sources_by_nature = sources_by_nature
+        self._targets_by_nature = targets_by_nature
+
+        # Kind of the definition → name → bits of the defining scenarios
+        definitions = {
+            kind: dict() for kind in DEFINITION_KINDS
+        }  # type: Dict[str, Dict[str, int]]
+
+        contacts = dict()  # type: Dict[str, int]
+
+        for i, scenario in enumerate(ontology.scenarios):
+            bit = 1 << i
+
+            for kind, name_set in [
+                ("model", scenario.definitions.model_set),
+                ("def", scenario.definitions.def_set),
+                ("test", scenario.definitions.test_set),
+                ("acceptance", scenario.definitions.acceptance_set),
+            ]:
+                for name in name_set:
+                    definitions[kind][name] = definitions[kind].get(name, 0) | bit
+
+            # A scenario can list several contacts separated by commas, as they
+            # are rendered on the page of the scenario.
+            for part in scenario.contact.split(","):
+                contact = part.strip()
+                if contact:
+                    contacts[contact] = contacts.get(contact, 0) | bit
+
+        self._definitions = definitions
+        self._contacts = contacts
+
+        # Bits of the scenarios occupying each voxel of the scenario space,
+        # indexed by (phase, level, aspect)
+        voxels = rasaeco.volumetric.unpack(
+            masks=[scenario.occupancy for scenario in ontology.scenarios]
+        )
+
+        self._cells = [
+            [
+                [
+                    _bits_of(voxels[:, phase, level, aspect])
+                    for aspect in range(rasaeco.volumetric.SHAPE[2])
+                ]
+                for level in range(rasaeco.volumetric.SHAPE[1])
+            ]
+            for phase in range(rasaeco.volumetric.SHAPE[0])
+        ]  # type: List[List[List[int]]]
+
+    def all(self) -> Selection:
+        """Select all the scenarios of the ontology."""
+        return Selection(index=self, bits=self._all)
+
+    def none(self) -> Selection:
+        """Select no scenario."""
+        return Selection(index=self, bits=0)
+
+    @icontract.require(
+        lambda self, identifiers: all(
+            identifier in self.positions for identifier in identifiers
+        )
+    )
+    def select(self, identifiers: Sequence[str]) -> Selection:
+        """Select the scenarios with the given identifiers."""
+        bits = 0
+        for identifier in identifiers:
+            bits |= 1 << self.positions[identifier]
+
+        return Selection(index=self, bits=bits)
+
+    def natures(self) -> List[str]:
+        """List the natures of the relations in the ontology, sorted."""
+        return sorted(self._relations_by_nature)
+
+    def relations(self, nature: str) -> Sequence[rasaeco.model.Relation]:
+        """Retrieve the relations of the given ``nature`` in the ontology order."""
+        return self._relations_by_nature.get(nature, [])
+
+    def sources(self, nature: str) -> Selection:
+        """Select the scenarios which are the source of a relation of the ``nature``."""
+        return Selection(index=self, bits=self._sources_by_nature.get(nature, 0))
+
+    def targets(self, nature: str) -> Selection:
+        """Select the scenarios which are the target of a relation of the ``nature``."""
+        return Selection(index=self, bits=self._targets_by_nature.get(nature, 0))
+
+    @icontract.require(lambda kind: kind in DEFINITION_KINDS)
+    def defining(self, kind: str, name: str) -> Selection:
+        """Select the scenarios defining the ``name`` of the given ``kind``."""
+        return Selection(index=self, bits=self._definitions[kind].get(name, 0))
+
+    @icontract.require(lambda kind: kind in DEFINITION_KINDS)
+    def defined_names(self, kind: str) -> List[str]:
+        """List the names of the given ``kind`` defined in the ontology, sorted."""
+        return sorted(self._definitions[kind])
+
+    def contacts(self) -> List[str]:
+        """List the individual contacts of the scenarios, sorted."""
+        return sorted(self._contacts)
+
+    def by_contact(self, contact: str) -> Selection:
+        """Select the scenarios listing the given ``contact`` among their contacts."""
+        return Selection(index=self, bits=self._contacts.get(contact, 0))
+
+    @icontract.require(lambda phase: phase is None or phase in rasaeco.model.PHASE_SET)
+    @icontract.require(lambda level: level is None or level in rasaeco.model.LEVEL_SET)
+    @icontract.require(
+        lambda aspect: aspect is None or aspect in rasaeco.model.ASPECT_SET
+    )
+    def touching(
+        self,
+        phase: Optional[str] = None,
+        level: Optional[str] = None,
+        aspect: Optional[str] = None,
+    ) -> Selection:
+        """
+        Select the scenarios whose volumetric touches the given part of the space.
+
+        The dimensions which are not specified are not restricted. For example,
+        ``touching(phase="construction", level="site")`` selects the scenarios
+        occupying any aspect of the construction phase on the site level.
+        """
+        phases = (
+            range(len(rasaeco.model.PHASES))
+            if phase is None
+            else [rasaeco.model.PHASE_INDEX[phase]]
+        )
+        levels = (
+            range(len(rasaeco.model.LEVELS))
+            if level is None
+            else [rasaeco.model.LEVEL_INDEX[level]]
+        )
+        aspects = (
+            range(len(rasaeco.model.ASPECTS))
+            if aspect is None
+            else [rasaeco.model.ASPECT_INDEX[aspect]]
+        )
+
+        bits = 0
+        for i in phases:
+            for j in levels:
+                for k in aspects:
+                    bits |= self._cells[i][j][k]
+
+        return Selection(index=self, bits=bits)
@@ -4,7 +4,7 @@ import json
 import pathlib
 import re
 import textwrap
-import uuid
+import urllib.parse
 import xml.etree.ElementTree as ET
 from typing import (
     List,
@@ -13,51 +13,61 @@ from typing import (
     Optional,
     TypeVar,
     Dict,
+    Tuple,
+    Callable,
+    Iterable,
+    Any,
+    Mapping,
 )
 
-import PIL
 import icontract
 import inflect
-import matplotlib
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import numpy as np
 
+import rasaeco.contracts
+import rasaeco.coverage
+import rasaeco.dependency
+import rasaeco.glossary
+import rasaeco.layout
+import rasaeco.live_reload
+import rasaeco.manifest
+import rasaeco.markdown_cache
 import rasaeco.meta
 import rasaeco.model
+import rasaeco.output
+import rasaeco.plot_cache
+import rasaeco.profiling
+import rasaeco.search
 import rasaeco.template
+import rasaeco.volumetric
 import rasaeco.intermediate
 import rasaeco.et
 
 
-def _render_ontology_html(
-    ontology: rasaeco.model.Ontology, scenarios_dir: pathlib.Path
-) -> List[str]:
-    """
-    Render the ontology as a HTML file.
+class _Node(TypedDict):
+    name: str
+    url: str
+    thumbnail_url: str
 
-    Return errors if any.
-    """
-    scenario_index_map = {
-        scenario: i for i, scenario in enumerate(ontology.scenario_map)
-    }
 
-    class Node(TypedDict):
-        name: str
-        url: str
-        thumbnail_url: str
+class _Edge(TypedDict):
+    source: int
+    target: int
+    label: str
 
-    class Edge(TypedDict):
-        source: int
-        target: int
-        label: str
 
-    class Dataset(TypedDict):
-        nodes: List[Node]
-        edges: List[Edge]
+class _Dataset(TypedDict):
+    nodes: List[_Node]
+    edges: List[_Edge]
 
-    nodes = []  # type: List[Node]
+
+def _ontology_dataset(ontology: rasaeco.model.Ontology) -> _Dataset:
+    """Collect the nodes and edges of the ontology graph."""
+    scenario_index_map = {
+        scenario: i for i, scenario in enumerate(ontology.scenario_map)
+    }
+
+    nodes = []  # type: List[_Node]
     for scenario in ontology.scenarios:
         rel_html_pth = scenario.relative_path.parent / (
             scenario.relative_path.stem + ".html"
@@ -66,24 +76,90 @@ def _render_ontology_html(
         rel_thumbnail_pth = scenario.relative_path.parent / "volumetric_thumb.svg"
 
         nodes.append(
-            Node(
+            _Node(
                 name=scenario.title,
                 url=rel_html_pth.as_posix(),
                 thumbnail_url=rel_thumbnail_pth.as_posix(),
             )
         )
 
-    edges = []  # type: List[Edge]
+    edges = []  # type: List[_Edge]
     for relation in ontology.relations:
         edges.append(
-            Edge(
+            _Edge(
                 source=scenario_index_map[relation.source],
                 target=scenario_index_map[relation.target],
                 label=relation.nature,
             )
         )
 
-    dataset = Dataset(nodes=nodes, edges=edges)
+    return _Dataset(nodes=nodes, edges=edges)
+
+
+def _ontology_view(dataset: _Dataset, positions: np.ndarray) -> Dict[str, Any]:
+    """Place the nodes of the ontology graph and group them into clusters."""
+    clusters = rasaeco.layout.cluster(positions=positions)
+    cluster_count = int(clusters.max()) + 1 if len(clusters) > 0 else 0
+
+    sizes = np.bincount(clusters, minlength=cluster_count)
+    centers = np.zeros((cluster_count, 2))
+    np.add.at(centers, clusters, positions)
+    centers /= np.maximum(sizes, 1)[:, None]
+
+    # Pair of clusters → number of relations between their scenarios
+    cluster_edge_counts = dict()  # type: Dict[Tuple[int, int], int]
+    for edge in dataset["edges"]:
+        source = int(clusters[edge["source"]])
+        target = int(clusters[edge["target"]])
+        if source != target:
+            pair = (source, target)
+            cluster_edge_counts[pair] = cluster_edge_counts.get(pair, 0) + 1
+
+    return {
+        "nodes": [
+            {"name": node["name"], "url": node["url"], "x": x, "y": y}
+            for node, (x, y) in zip(dataset["nodes"], positions.tolist())
+        ],
+        "edges": dataset["edges"],
+        "clusters": [
+            {"x": round(x, 1), "y": round(y, 1), "size": size}
+            for (x, y), size in zip(centers.tolist(), sizes.tolist())
+        ],
+        "cluster_edges": [
+            {"source": source, "target": target, "count": count}
+            for (source, target), count in sorted(cluster_edge_counts.items())
+        ],
+    }
+
+
+def _render_ontology_html(dataset: _Dataset, scenarios_dir: pathlib.Path) -> List[str]:
+    """
+    Render the ontology as a HTML file.
+
+    The layout of the graph is taken from the cache if the scenarios and
+    their relations did not change.
+
+    Return errors if any.
+    """
+    nodes = dataset["nodes"]
+
+    ##
+    # Lay out the graph
+    ##
+
+    edges = [(edge["source"], edge["target"]) for edge in dataset["edges"]]
+
+    layout_path = rasaeco.layout.cache_path(scenarios_dir=scenarios_dir)
+    layout_key = rasaeco.layout.key(node_count=len(nodes), edges=edges)
+
+    positions = rasaeco.layout.fetch(
+        path=layout_path, key=layout_key, node_count=len(nodes)
+    )
+    if positions is None:
+        positions = rasaeco.layout.force_directed(node_count=len(nodes), edges=edges)
+
+        # The cache is merely an optimization so that we ignore the failures.
+        rasaeco.layout.store(path=layout_path, key=layout_key, positions=positions)
 
     ##
     # Render to HTML
@@ -91,12 +167,19 @@ def _render_ontology_html(
 
     pth = scenarios_dir / "ontology.html"
 
+    # No indentation so that the page stays small on large corpora. The "</" is
+    # escaped so that a title can not close the script.
+    view = json.dumps(_ontology_view(dataset=dataset, positions=positions))
+    view = view.replace("</", "<\\/")
+
     ontology_html = rasaeco.template.ONTOLOGY_HTML_TPL.render(
-        dataset=json.dumps(dataset, indent=2)
+        view=view,
+        edge_length=rasaeco.layout.EDGE_LENGTH,
+        live_reload_script=rasaeco.live_reload.SCRIPT,
     )
 
     try:
-        pth.write_text(ontology_html, encoding="utf-8")
+        rasaeco.output.write_if_changed(pth, ontology_html.encode("utf-8"))
     except Exception as exception:
         return [f"Failed to write the ontology to {pth}: {exception}"]
 
@@ -116,203 +199,256 @@ def _render_ontology_html(
     )
 
     try:
-        pth.write_text(ontology_dot, encoding="utf-8")
+        rasaeco.output.write_if_changed(pth, ontology_dot.encode("utf-8"))
     except Exception as exception:
         return [f"Failed to write the ontology to {pth}: {exception}"]
 
     return []
 
 
-def _render_volumetric_plot(
-    plot_path: pathlib.Path,
-    plot_thumbnail_path: pathlib.Path,
-    scenario: rasaeco.model.Scenario,
+def _coverage_digest(ontology: rasaeco.model.Ontology) -> str:
+    """Compute the digest of all the inputs of the coverage report."""
+    return rasaeco.manifest.digest(
+        str(rasaeco.coverage.VERSION),
+        rasaeco.live_reload.SCRIPT,
+        json.dumps(
+            [
+                [
+                    _html_path(scenario.relative_path).as_posix(),
+                    scenario.title,
+                    format(scenario.occupancy, "x"),
+                ]
+                for scenario in ontology.scenarios
+            ]
+        ),
+    )
+
+
+def _render_coverage(
+    ontology: rasaeco.model.Ontology, scenarios_dir: pathlib.Path
 ) -> List[str]:
     """
-    Render the 3D volumetric plot and store it as an image.
+    Render how the scenarios cover the scenario space and how they overlap.
 
     Return errors if any.
     """
-    x, y, z = np.indices(
-        (
-            len(rasaeco.model.PHASES),
-            len(rasaeco.model.LEVELS),
-            len(rasaeco.model.ASPECTS),
+    masks = [scenario.occupancy for scenario in ontology.scenarios]
+
+    coverage = rasaeco.coverage.count(masks=masks)
+
+    pth = scenarios_dir / "coverage.svg"
+    try:
+        rasaeco.output.write_if_changed(
+            pth, rasaeco.coverage.to_svg(coverage=coverage).encode("utf-8")
+        )
+    except Exception as exception:
+        return [f"Failed to write the coverage heatmap to {pth}: {exception}"]
+
+    def link(index: int) -> Dict[str, str]:
+        """Describe the link to the page of the scenario."""
+        scenario = ontology.scenarios[index]
+        return {
+            "url": _html_path(scenario.relative_path).as_posix(),
+            "title": scenario.title,
+        }
+
+    pairs = [
+        {
+            "first": link(pair.first),
+            "second": link(pair.second),
+            "shared": pair.shared,
+            "jaccard": f"{pair.jaccard:.2f}",
+        }
+        for pair in rasaeco.coverage.most_overlapping(
+            masks=masks, limit=rasaeco.coverage.DEFAULT_PAIR_LIMIT
         )
+    ]
+
+    coverage_html = rasaeco.template.COVERAGE_HTML_TPL.render(
+        scenario_count=len(ontology.scenarios),
+        covered_count=int(np.count_nonzero(coverage)),
+        voxel_count=rasaeco.model.VOXEL_COUNT,
+        pairs=pairs,
+        live_reload_script=rasaeco.live_reload.SCRIPT,
     )
 
-    cubes = []  # type: List[np.ndarray]
-    for cubelet in scenario.volumetric:
-        phase_first_idx = rasaeco.model.PHASES.index(cubelet.phase_range.first)
-        phase_last_idx = rasaeco.model.PHASES.index(cubelet.phase_range.last)
+    pth = scenarios_dir / "coverage.html"
+    try:
+        rasaeco.output.write_if_changed(pth, coverage_html.encode("utf-8"))
+    except Exception as exception:
+        return [f"Failed to write the coverage report to {pth}: {exception}"]
 
-        level_first_idx = rasaeco.model.LEVELS.index(cubelet.level_range.first)
-        level_last_idx = rasaeco.model.LEVELS.index(cubelet.level_range.last)
+    return []
 
-        aspect_first_idx = rasaeco.model.ASPECTS.index(cubelet.aspect_range.first)
-        aspect_last_idx = rasaeco.model.ASPECTS.index(cubelet.aspect_range.last)
 
-        cube = (
-            (phase_first_idx <= x)
-            & (x <= phase_last_idx)
-            & (level_first_idx <= y)
-            & (y <= level_last_idx)
-            & (aspect_first_idx <= z)
-            & (z <= aspect_last_idx)
-        )
+#: Readable kinds of the definitions by their tags
+_DEFINITION_KINDS = {
+    "model": "model",
+    "def": "definition",
+    "test": "test",
+    "acceptance": "acceptance criterion",
+}
 
-        cubes.append(cube)
 
-    voxels = None  # type: Optional[np.ndarray]
+class _GlossaryEntry(TypedDict):
+    initial: str
+    name: str
+    kind: str
+    url: str
+    title: str
+    referrers: List[Dict[str, str]]
 
-    if cubes:
-        voxels = cubes[0]
-        for cube in cubes[1:]:
-            voxels = voxels | cube
 
-    # Large volumetric
-    fig = plt.figure()
-    try:
-        ax = fig.gca(projection="3d")
+def _glossary_entries(
+    ontology: rasaeco.model.Ontology,
+    backlinks_map: Mapping[str, rasaeco.glossary.Backlinks],
+) -> List[_GlossaryEntry]:
+    """List the definitions of all the scenarios together with their backlinks."""
+    entries = []  # type: List[_GlossaryEntry]
 
-        if voxels is not None:
-            ax.voxels(voxels, edgecolor="k")
+    for scenario in ontology.scenarios:
+        backlinks = backlinks_map.get(scenario.identifier, dict())
+        url = urllib.parse.quote(_html_path(scenario.relative_path).as_posix())
+
+        for tag, names in [
+            ("model", scenario.definitions.model_set),
+            ("def", scenario.definitions.def_set),
+            ("test", scenario.definitions.test_set),
+            ("acceptance", scenario.definitions.acceptance_set),
+        ]:
+            for name in names:
+                # Only the names of the models are shown verbatim in the pages
+                # of the scenarios.
+                readable = name if tag == "model" else name.replace("_", " ")
+
+                entries.append(
+                    {
+                        "initial": readable[:1].upper(),
+                        "name": readable,
+                        "kind": _DEFINITION_KINDS[tag],
+                        "url": f"{url}#{tag}-{name}",
+                        "title": scenario.title,
+                        "referrers": [
+                            {
+                                "url": _referrer_url(
+                                    referrer=referrer,
+                                    rel_pth_to_scenario_dir=pathlib.PurePosixPath(),
+                                ),
+                                "title": referrer.title,
+                            }
+                            for referrer in backlinks.get((tag, name), [])
+                        ],
+                    }
+                )
 
-        ax.set_xticks(list(range(len(rasaeco.model.PHASES) + 1)))
-        ax.set_xticklabels([""] * (len(rasaeco.model.PHASES) + 1))
+    entries.sort(key=lambda entry: (entry["name"].lower(), entry["kind"], entry["url"]))
 
-        for i, phase in enumerate(rasaeco.model.PHASES):
-            ax.text(i + 0.5, -4.2, 0, phase, color="green", fontsize=8, zdir="y")
+    return entries
 
-        ax.set_yticks(list(range(len(rasaeco.model.LEVELS) + 1)))
-        ax.set_yticklabels([""] * (len(rasaeco.model.LEVELS) + 1))
 
-        for i, level in enumerate(rasaeco.model.LEVELS):
-            ax.text(
-                len(rasaeco.model.PHASES) + 0.7, i, 0, level, color="red", fontsize=8
-            )
+def _glossary_digest(entries: List[_GlossaryEntry]) -> str:
+    """Compute the digest of all the inputs of the glossary."""
+    return rasaeco.manifest.digest(rasaeco.live_reload.SCRIPT, json.dumps(entries))
 
-        ax.set_zticks(range(len(rasaeco.model.ASPECTS) + 1))
-        ax.set_zticklabels([""] * (len(rasaeco.model.ASPECTS) + 1))
-
-        for i, aspect in enumerate(rasaeco.model.ASPECTS):
-            ax.text(
-                len(rasaeco.model.PHASES) + 0.4,
-                len(rasaeco.model.LEVELS) + 1,
-                i,
-                aspect,
-                color="blue",
-                fontsize=8,
-            )
 
-        try:
-            plt.savefig(str(plot_path), pad_inches=0)
-        except Exception as exception:
-            return [f"Failed to save the volumetric plot to {plot_path}: {exception}"]
-    finally:
-        plt.close(fig)
+def _render_glossary(
+    entries: List[_GlossaryEntry], scenarios_dir: pathlib.Path
+) -> List[str]:
+    """
+    Render the glossary of the definitions of all the scenarios.
 
-    # Thumbnail
-    fig = plt.figure()
+    Return errors if any.
+    """
+    glossary_html = rasaeco.template.GLOSSARY_HTML_TPL.render(
+        entries=entries, live_reload_script=rasaeco.live_reload.SCRIPT
+    )
+
+    pth = scenarios_dir / "glossary.html"
     try:
-        ax = fig.gca(projection="3d")
+        rasaeco.output.write_if_changed(pth, glossary_html.encode("utf-8"))
+    except Exception as exception:
+        return [f"Failed to write the glossary to {pth}: {exception}"]
 
-        if voxels is not None:
-            ax.voxels(voxels, edgecolor="k")
+    return []
 
-        # No tick labels
-        ax.set_xticks(list(range(len(rasaeco.model.PHASES) + 1)))
-        ax.set_xticklabels([""] * (len(rasaeco.model.PHASES) + 1))
 
-        ax.set_yticks(list(range(len(rasaeco.model.LEVELS) + 1)))
-        ax.set_yticklabels([""] * (len(rasaeco.model.LEVELS) + 1))
+def _plot_variant(path: pathlib.Path, thumbnail: bool) -> Tuple[str, int, int]:
+    """
+    Determine the variant of the plot stored at the ``path``.
 
-        ax.set_zticks(range(len(rasaeco.model.ASPECTS) + 1))
-        ax.set_zticklabels([""] * (len(rasaeco.model.ASPECTS) + 1))
+    Return (name of the variant, width, height).
+    """
+    if path.suffix.lower() == ".png":
+        width, height = (72, 60) if thumbnail else (428, 364)
+    else:
+        width, height = (100, 75) if thumbnail else (300, 255)
 
-        ax.set_xlabel("Phases", color="green", fontsize=40)
-        ax.set_ylabel("Levels", color="red", fontsize=40)
-        ax.set_zlabel("Aspects", color="blue", fontsize=40)
+    return f"{'thumb' if thumbnail else 'full'}-{width}x{height}", width, height
 
-        try:
-            plt.savefig(str(plot_thumbnail_path))
-        except Exception as exception:
-            return [f"Failed to save the volumetric plot to {plot_path}: {exception}"]
-    finally:
-        plt.close(fig)
-
-    # Crop and resize manually
-    if plot_path.suffix.lower() == ".png":
-        with PIL.Image.open(plot_path) as image:
-            # left, upper, right, lower
-            image_crop = image.crop((139, 86, 567, 450))
-            image_crop.save(plot_path)
-    elif plot_path.suffix.lower() == ".svg":
-        svg_text = plot_path.read_text(encoding="utf-8")
-
-        # This is hacky, but gets the job done.
-        # If matplotlib ever changes the SVG export, this will break.
-        original_marker = (
-            '<svg height="345.6pt" version="1.1" viewBox="0 0 460.8 345.6" '
-            'width="460.8pt" xmlns="http://www.w3.org/2000/svg" '
-            'xmlns:xlink="http://www.w3.org/1999/xlink">'
-        )
 
-        if original_marker not in svg_text:
-            return [
-                f"The SVG exported by matplotlib had unexpected structure. "
-                f"Please create a GitHub issue and send the content "
-                f"of the file: {plot_path}"
-            ]
+def _render_volumetric_plot(
+    plot_path: pathlib.Path,
+    plot_thumbnail_path: pathlib.Path,
+    scenario: rasaeco.model.Scenario,
+    cache_dir: Optional[pathlib.Path] = None,
+) -> List[str]:
+    """
+    Render the 3D volumetric plot and store it as an image.
 
-        replacement = (
-            '<svg height="255" version="1.1" viewBox="103 61.554 300.49 263.392" '
-            'width="300" xmlns="http://www.w3.org/2000/svg" '
-            'xmlns:xlink="http://www.w3.org/1999/xlink">'
-        )
-        svg_text = svg_text.replace(original_marker, replacement)
+    If ``cache_dir`` is given, the plots are taken from the cache if a scenario with
+    the same occupancy has been plotted before.
 
-        plot_path.write_text(svg_text, encoding="utf-8")
-    else:
-        raise NotImplementedError(f"Cropping and resizing of plot path: {plot_path}")
-
-    # Crop and resize manually
-    if plot_thumbnail_path.suffix.lower() == ".png":
-        with PIL.Image.open(plot_thumbnail_path) as image:
-            # left, upper, right, lower
-            with image.crop((139, 86, 567, 450)) as image_crop:
-                new_size = (round(143 * 0.5), round(121 * 0.5))
-                with image_crop.resize(new_size) as image_resized:
-                    image_resized.save(plot_thumbnail_path)
-    elif plot_thumbnail_path.suffix.lower() == ".svg":
-        svg_text = plot_thumbnail_path.read_text(encoding="utf-8")
-
-        # This is hacky, but gets the job done.
-        # If matplotlib ever changes the SVG export, this will break.
-        original_marker = (
-            '<svg height="345.6pt" version="1.1" viewBox="0 0 460.8 345.6" '
-            'width="460.8pt" xmlns="http://www.w3.org/2000/svg" '
-            'xmlns:xlink="http://www.w3.org/1999/xlink">'
-        )
+    Return errors if any.
+    """
+    voxels = rasaeco.volumetric.occupancy(scenario=scenario)
 
-        if original_marker not in svg_text:
-            return [
-                f"The SVG exported by matplotlib had unexpected structure. "
-                f"Please create a GitHub issue and send the content "
-                f"of the file: {plot_thumbnail_path}"
-            ]
+    errors = []  # type: List[str]
 
-        replacement = (
-            '<svg height="75" version="1.1" viewBox="114.314 57.873 294.953 266.05" '
-            'width="100" '
-            'xmlns="http://www.w3.org/2000/svg" '
-            'xmlns:xlink="http://www.w3.org/1999/xlink">'
-        )
-        svg_text = svg_text.replace(original_marker, replacement)
+    for path, thumbnail in [(plot_path, False), (plot_thumbnail_path, True)]:
+        variant, width, height = _plot_variant(path=path, thumbnail=thumbnail)
+
+        def produce() -> bytes:
+            """Plot the voxels and encode them in the image format of the path."""
+            return rasaeco.volumetric.encode(
+                plot=rasaeco.volumetric.project(
+                    voxels=voxels, width=width, height=height, thumbnail=thumbnail
+                ),
+                suffix=path.suffix,
+            )
 
-        plot_thumbnail_path.write_text(svg_text, encoding="utf-8")
+        error = None  # type: Optional[str]
+        if cache_dir is not None:
+            error = rasaeco.plot_cache.fetch_or_produce(
+                directory=cache_dir,
+                key=rasaeco.plot_cache.key(
+                    occupancy=scenario.occupancy,
+                    variant=variant,
+                    suffix=path.suffix.lower(),
+                ),
+                path=path,
+                produce=produce,
+            )
 
-    return []
+            if error is None and path.suffix.lower() in (
+                rasaeco.output.COMPRESSED_SUFFIXES
+            ):
+                try:
+                    rasaeco.output.write_compressed(path=path, data=path.read_bytes())
+                except Exception as exception:
+                    error = (
+                        f"Failed to save the compressed volumetric plot "
+                        f"next to {path}: {exception}"
+                    )
+        else:
+            try:
+                rasaeco.output.write_if_changed(path, produce())
+            except Exception as exception:
+                error = f"Failed to save the volumetric plot to {path}: {exception}"
+
+        if error is not None:
+            errors.append(error)
+
+    return errors
 
 
 def _new_element(
@@ -342,27 +478,39 @@ def _new_element(
 _INFLECT_ENGINE = inflect.engine()
 
 
-@icontract.require(lambda xml_path: xml_path.suffix == ".xml")
 def _render_scenario(
     scenario: rasaeco.model.Scenario,
     ontology: rasaeco.model.Ontology,
-    xml_path: pathlib.Path,
+    backlinks: rasaeco.glossary.Backlinks,
+    scenario_path: pathlib.Path,
+    intermediate: Optional[rasaeco.intermediate.Intermediate],
     html_path: pathlib.Path,
+    markdown_cache_dir: Optional[pathlib.Path] = None,
 ) -> List[str]:
-    """Render a single scenario as HTML."""
-    try:
-        text = xml_path.read_text(encoding="utf-8")
-    except Exception as exception:
-        return [
-            f"Failed to read the intermediate representation "
-            f"of the scenario {xml_path}: {exception}"
-        ]
+    """
+    Render a single scenario as HTML.
+
+    The ``backlinks`` list the other scenarios referencing each definition of
+    the scenario.
+
+    If the ``intermediate`` representation is not given, the scenario is rendered
+    to it first using the ``markdown_cache_dir``, if given. The element tree of
+    the ``intermediate`` is modified in place.
+    """
+    if intermediate is None:
+        intermediate, errors = rasaeco.intermediate.render_scenario_to_intermediate(
+            scenario_path=scenario_path, markdown_cache_dir=markdown_cache_dir
+        )
+        if errors:
+            return errors
+
+        assert intermediate is not None
 
     rel_pth_to_scenario_dir = pathlib.PurePosixPath(
         *([".."] * len(scenario.relative_path.parent.parts))
     )
 
-    root = ET.fromstring(text)
+    root = intermediate.root()
 
     main_div = None  # type: Optional[ET.Element]
     for element in root.iter("div"):
@@ -402,6 +550,32 @@ def _render_scenario(
                 ),
             )
 
+            referrers = backlinks.get((tag, name), [])
+            if len(referrers) > 0:
+                referenced_from = _new_element(
+                    tag="p",
+                    text="Referenced from: ",
+                    attrib={"class": "referenced-from"},
+                    tail="\n",
+                )
+
+                for i, referrer in enumerate(referrers):
+                    href = _referrer_url(
+                        referrer=referrer,
+                        rel_pth_to_scenario_dir=rel_pth_to_scenario_dir,
+                    )
+
+                    referenced_from.append(
+                        _new_element(
+                            tag="a",
+                            text=referrer.title,
+                            attrib={"href": href},
+                            tail=", " if i < len(referrers) - 1 else None,
+                        )
+                    )
+
+                element.append(referenced_from)
+
     convert_tags_to_html(tag="model", readable_title=False)
     convert_tags_to_html(tag="def", readable_title=True)
     convert_tags_to_html(tag="test", readable_title=True)
@@ -439,7 +613,8 @@ def _render_scenario(
             element.text = link_text
 
     @icontract.require(
-        lambda reference_tag: reference_tag in ["modelref", "testref", "acceptanceref"]
+        lambda reference_tag: reference_tag in ["modelref", "testref", "acceptanceref"],
+        enabled=rasaeco.contracts.ENABLED,
     )
     def convert_references_to_html(reference_tag: str) -> None:
         """Convert the reference tags to proper HTML."""
@@ -509,7 +684,9 @@ def _render_scenario(
 
     phase_anchors = []  # type: List[PhaseAnchor]
 
-    for element in root.iter("phase"):
+    # The anchors are numbered in the document order so that the same scenario
+    # is always rendered to the same bytes.
+    for i, element in enumerate(root.iter("phase")):
         name = element.attrib["name"]
         readable = name.replace("_", " ")
 
@@ -521,7 +698,7 @@ def _render_scenario(
 
         element.append(_new_element(tag="sup", text=readable))
 
-        anchor = f"phase-anchor-{uuid.uuid4()}"
+        anchor = f"phase-anchor-{i}"
 
         element.insert(0, _new_element(tag="a", attrib={"id": anchor}))
 
@@ -538,7 +715,7 @@ def _render_scenario(
 
     level_anchors = []  # type: List[LevelAnchor]
 
-    for element in root.iter("level"):
+    for i, element in enumerate(root.iter("level")):
         name = element.attrib["name"]
 
         # Assume that paragraphs are rendered as <p> from markdown to html.
@@ -549,7 +726,7 @@ def _render_scenario(
 
         element.append(_new_element(tag="sup", text=name.replace("_", " ")))
 
-        anchor = f"level-anchor-{uuid.uuid4()}"
+        anchor = f"level-anchor-{i}"
 
         element.insert(0, _new_element(tag="a", attrib={"id": anchor}))
 
@@ -689,9 +866,7 @@ def _render_scenario(
     head_el = ET.Element("head")
 
     head_el.append(_new_element("meta", attrib={"charset": "utf-8"}))
-    head_el.append(
-        _new_element("script", text=" ", attrib={"src": "https://livejs.com/live.js"})
-    )
+    head_el.append(_new_element("script", text=rasaeco.live_reload.SCRIPT))
     head_el.append(_new_element("title", text=scenario.title))
 
     head_el.append(
@@ -762,6 +937,11 @@ def _render_scenario(
                     background-color: #eeeefb;
                     padding: 1em;
                 }
+        
+                p.referenced-from {
+                    font-size: small;
+                    color: #555555;
+                }
                 """
             ),
         )
@@ -882,7 +1062,7 @@ def _render_scenario(
     ##
 
     try:
-        html_path.write_bytes(ET.tostring(root, encoding="utf-8"))
+        rasaeco.output.write_if_changed(html_path, ET.tostring(root, encoding="utf-8"))
     except Exception as exception:
         return [f"Failed to write generated HTML code to {html_path}: {exception}"]
 
@@ -897,54 +1077,793 @@ def _html_path(scenario_path: PathT) -> PathT:
     return scenario_path.parent / (scenario_path.stem + ".html")
 
 
-def once(scenarios_dir: pathlib.Path) -> List[str]:
+def _referrer_url(
+    referrer: rasaeco.glossary.Referrer, rel_pth_to_scenario_dir: pathlib.PurePosixPath
+) -> str:
+    """Generate the URL of the page of the scenario referencing a definition."""
+    return urllib.parse.quote(
+        _html_path(
+            scenario_path=rel_pth_to_scenario_dir / referrer.identifier / "scenario.md"
+        ).as_posix()
+    )
+
+
+def volumetric_digest(
+    scenario: rasaeco.model.Scenario, path: pathlib.Path, thumbnail: bool
+) -> str:
+    """
+    Compute the digest of all the inputs of the volumetric plot at the ``path``.
+
+    The plots depend only on the occupied voxels, not on the cubelets covering them,
+    as well as on the style and the variant of the plot.
+    """
+    variant, _, _ = _plot_variant(path=path, thumbnail=thumbnail)
+
+    return rasaeco.manifest.digest(
+        format(scenario.occupancy, "x"),
+        str(rasaeco.plot_cache.STYLE),
+        variant,
+        path.suffix.lower(),
+    )
+
+
+def _scenario_html_digest(
+    scenario: rasaeco.model.Scenario,
+    ontology: rasaeco.model.Ontology,
+    summary: rasaeco.dependency.Summary,
+    backlinks: rasaeco.glossary.Backlinks,
+) -> str:
+    """
+    Compute the digest of all the inputs of the scenario HTML.
+
+    The ``summary`` gives the digest of the scenario as well as the scenarios
+    referenced from it, while the ``backlinks`` give the scenarios referencing it.
+    """
+    facts = [
+        summary.digest,
+        scenario.title,
+        scenario.contact,
+        rasaeco.live_reload.SCRIPT,
+    ]  # type: List[str]
+
+    for identifier in sorted(summary.referenced_scenarios):
+        facts.extend(["reference", identifier, ontology.scenario_map[identifier].title])
+
+    for relation in ontology.relations_from.get(scenario, []):
+        facts.extend(
+            [
+                "from",
+                relation.nature,
+                relation.target,
+                ontology.scenario_map[relation.target].title,
+            ]
+        )
+
+    for relation in ontology.relations_to.get(scenario, []):
+        facts.extend(
+            [
+                "to",
+                relation.nature,
+                relation.source,
+                ontology.scenario_map[relation.source].title,
+            ]
+        )
+
+    for (tag, name), referrers in sorted(backlinks.items()):
+        facts.extend(["backlink", tag, name])
+        for referrer in referrers:
+            facts.extend([referrer.identifier, referrer.title])
+
+    return rasaeco.manifest.digest(*facts)
+
+
+#: Names of the artefacts rendered in the directory of a scenario
+_SCENARIO_ARTEFACTS = {
+    "scenario.html",
+    "scenario.xml",
+    "volumetric.png",
+    "volumetric.svg",
+    "volumetric_thumb.png",
+    "volumetric_thumb.svg",
+}
+
+
+def _remove_orphaned_artefacts(
+    scenarios_dir: pathlib.Path,
+    ontology: rasaeco.model.Ontology,
+    manifest: rasaeco.manifest.Manifest,
+) -> Tuple[List[pathlib.Path], List[str]]:
+    """
+    Remove the rendered artefacts of the scenarios which do not exist anymore.
+
+    Only the artefacts recorded in the ``manifest`` are considered so that we never
+    remove a file which we did not produce.
+
+    Return (removed artefacts, errors if any).
+    """
+    orphaned_pths = []  # type: List[pathlib.Path]
+    for key in sorted(manifest.digests):
+        # The keys are POSIX paths. We split them as strings since there are
+        # several artefacts for each scenario and the trees can be large.
+        directory, _, name = key.rpartition("/")
+        if name in _SCENARIO_ARTEFACTS and directory not in ontology.scenario_map:
+            orphaned_pths.append(scenarios_dir / key)
+
+    # The intermediate XML and the compressed variants are not recorded
+    # in the manifest.
+    compressed_pths = [
+        rasaeco.output.compressed_path(pth)
+        for pth in orphaned_pths
+        if pth.suffix.lower() in rasaeco.output.COMPRESSED_SUFFIXES
+    ]
+    orphaned_pths.extend(compressed_pths)
+
+    for directory in sorted({pth.parent for pth in orphaned_pths}):
+        orphaned_pths.append(directory / "scenario.xml")
+
+    removed = []  # type: List[pathlib.Path]
+    errors = []  # type: List[str]
+    for pth in orphaned_pths:
+        manifest.forget(path=pth)
+
+        try:
+            if pth.exists():
+                pth.unlink()
+                removed.append(pth)
+        except Exception as exception:
+            errors.append(
+                f"Failed to remove the artefact {pth} "
+                f"of a scenario which does not exist anymore: {exception}"
+            )
+
+    return removed, errors
+
+
+def _page_ontology(
+    identifier: str,
+    meta_map: Mapping[str, rasaeco.meta.Meta],
+    definitions: rasaeco.model.Definitions,
+) -> rasaeco.model.Ontology:
+    """
+    Construct the part of the ontology shown in the page of a single scenario.
+
+    The ``meta_map`` needs to contain the scenario and the scenarios mentioned
+    in its page. Only the ``definitions`` of the scenario itself are given as
+    the references are not validated.
+    """
+    no_definitions = rasaeco.model.Definitions(
+        model_set=set(), def_set=set(), test_set=set(), acceptance_set=set()
+    )
+
+    scenarios = [
+        rasaeco.intermediate.scenario_from_meta(
+            identifier=other,
+            meta=meta,
+            definitions=definitions if other == identifier else no_definitions,
+            relative_path=pathlib.Path(other) / "scenario.md",
+        )
+        for other, meta in sorted(meta_map.items())
+    ]
+
+    # Only the relations shown in the page of the scenario are considered.
+    relations = [
+        rasaeco.model.Relation(
+            source=source, target=relation["target"], nature=relation["nature"]
+        )
+        for source, meta in sorted(meta_map.items())
+        for relation in meta["relations"]
+        if source == identifier or relation["target"] == identifier
+    ]
+
+    return rasaeco.model.Ontology(scenarios=scenarios, relations=relations)
+
+
+def html_digest_from_graph(
+    graph: rasaeco.dependency.Graph,
+    identifier: str,
+    backlinks: rasaeco.glossary.Backlinks,
+) -> Optional[str]:
+    """
+    Compute the digest of the page of the scenario as recorded in the manifest.
+
+    The scenario and the scenarios mentioned in its page are taken from
+    the summaries in the ``graph`` so that nothing needs to be read. The digest
+    only matches the current scenarios if their summaries are up-to-date.
+
+    Return None if the graph lacks any of the scenarios.
+    """
+    summary = graph.summaries.get(identifier, None)
+    if summary is None:
+        return None
+
+    mentioned = (
+        set(summary.referenced_scenarios)
+        | set(summary.relation_targets)
+        | graph.relation_sources(identifier)
+    )
+
+    meta_map = {identifier: summary.meta}  # type: Dict[str, rasaeco.meta.Meta]
+    for other in mentioned:
+        other_summary = graph.summaries.get(other, None)
+        if other_summary is None:
+            return None
+
+        meta_map[other] = other_summary.meta
+
+    ontology = _page_ontology(
+        identifier=identifier, meta_map=meta_map, definitions=summary.definitions
+    )
+
+    return _scenario_html_digest(
+        scenario=ontology.scenario_map[identifier],
+        ontology=ontology,
+        summary=summary,
+        backlinks=backlinks,
+    )
+
+
+def render_on_request(
+    scenarios_dir: pathlib.Path,
+    identifier: str,
+    relation_sources: Iterable[str],
+    backlinks: rasaeco.glossary.Backlinks,
+    html_path: pathlib.Path,
+) -> List[str]:
+    """
+    Render the page and the plots of a single scenario ahead of the full rendering.
+
+    Only the scenario and the scenarios mentioned in its page are read.
+    The ``relation_sources`` are the scenarios which might relate to this one,
+    *e.g.*, as known from the last rendering; their relations are checked again.
+    The ``backlinks`` are given as known, too, and the references are not validated.
+
+    The plots are stored next to the scenario, while the page is stored
+    to the ``html_path``.
+
+    Return errors if any.
+    """
+    scenario_pth = scenarios_dir / identifier / "scenario.md"
+    markdown_cache_dir = rasaeco.markdown_cache.cache_dir(scenarios_dir=scenarios_dir)
+
+    intermediate, errors = rasaeco.intermediate.render_scenario_to_intermediate(
+        scenario_path=scenario_pth, markdown_cache_dir=markdown_cache_dir
+    )
+    if errors:
+        return [f"When rendering {scenario_pth}: {error}" for error in errors]
+
+    assert intermediate is not None
+
+    if intermediate.meta_errors:
+        return [
+            f"In file {scenario_pth}: {error}" for error in intermediate.meta_errors
+        ]
+
+    assert intermediate.meta is not None
+
+    meta_map = {identifier: intermediate.meta}  # type: Dict[str, rasaeco.meta.Meta]
+
+    mentioned = {
+        reference.scenario_id
+        for reference in intermediate.references
+        if reference.scenario_id is not None
+    } | {relation["target"] for relation in intermediate.meta["relations"]}
+
+    for other in sorted((mentioned | set(relation_sources)) - {identifier}):
+        pth = scenarios_dir / other / "scenario.md"
+        try:
+            text = pth.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            if other in mentioned:
+                errors.append(
+                    f"In file {scenario_pth}: The scenario {other!r} "
+                    f"can not be found."
+                )
+            continue
+        except Exception as exception:
+            errors.append(f"Failed to read {pth}: {exception}")
+            continue
+
+        meta, meta_errors = rasaeco.meta.extract_meta(text=text)
+        if meta_errors:
+            errors.extend(f"In file {pth}: {error}" for error in meta_errors)
+            continue
+
+        assert meta is not None
+
+        if other in mentioned or any(
+            relation["target"] == identifier for relation in meta["relations"]
+        ):
+            meta_map[other] = meta
+
+    if errors:
+        return errors
+
+    ontology = _page_ontology(
+        identifier=identifier,
+        meta_map=meta_map,
+        definitions=intermediate.definitions,
+    )
+    scenario = ontology.scenario_map[identifier]
+
+    for suffix in [".png", ".svg"]:
+        errors.extend(
+            _render_volumetric_plot(
+                plot_path=scenario_pth.parent / f"volumetric{suffix}",
+                plot_thumbnail_path=scenario_pth.parent / f"volumetric_thumb{suffix}",
+                scenario=scenario,
+                cache_dir=rasaeco.plot_cache.cache_dir(scenarios_dir=scenarios_dir),
+            )
+        )
+
+    errors.extend(
+        _render_scenario(
+            scenario=scenario,
+            ontology=ontology,
+            backlinks=backlinks,
+            scenario_path=scenario_pth,
+            intermediate=intermediate,
+            html_path=html_path,
+            markdown_cache_dir=markdown_cache_dir,
+        )
+    )
+
+    return errors
+
+
+@icontract.require(lambda jobs: jobs >= 1)
+def once(
+    scenarios_dir: pathlib.Path,
+    report: Optional[rasaeco.manifest.Report] = None,
+    jobs: int = 1,
+    write_xml: bool = False,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    changed: Optional[Iterable[pathlib.Path]] = None,
+) -> List[str]:
     """
     Render the scenarios and the ontology.
 
+    Only the artefacts whose inputs changed since the last rendering are re-rendered.
+    The decisions are recorded in the ``report``, if given.
+
+    The scenarios are rendered in a pool of ``jobs`` processes.
+
+    If ``write_xml`` is set, the intermediate representation of the scenarios is
+    stored next to them for debugging.
+
+    The ``should_cancel`` is polled between the rendering stages. If it returns
+    True, the rendering stops early and the ``report`` is marked as cancelled.
+    The artefacts rendered so far are kept and recorded.
+
+    If the ``changed`` paths are given, only the scenario files among them are
+    assumed to have been created, modified or removed since the last complete
+    rendering. The directory is not scanned, and only these scenarios and
+    the scenarios depending on them are re-rendered.
+
     Return errors if any.
     """
-    errors = rasaeco.intermediate.render_scenarios_to_xml(scenarios_dir=scenarios_dir)
+    report = report if report is not None else rasaeco.manifest.Report()
+
+    manifest, manifest_note = rasaeco.manifest.load(scenarios_dir=scenarios_dir)
+    if manifest_note is not None:
+        report.explanations.append(f"{manifest_note} Rendering everything anew.")
+
+    graph, graph_note = rasaeco.dependency.load(scenarios_dir=scenarios_dir)
+    if graph_note is not None:
+        report.explanations.append(f"{graph_note} Validating everything anew.")
+
+    changed_set = None  # type: Optional[Set[pathlib.Path]]
+    if changed is not None:
+        if graph_note is None and len(graph.summaries) > 0:
+            changed_set = rasaeco.intermediate.changed_scenario_paths(
+                scenarios_dir=scenarios_dir, paths=changed
+            )
+        else:
+            report.explanations.append(
+                "Inspecting all the scenarios as the dependency graph "
+                "of the last rendering is not available."
+            )
+
+    try:
+        return _once(
+            scenarios_dir=scenarios_dir,
+            manifest=manifest,
+            graph=graph,
+            report=report,
+            jobs=jobs,
+            write_xml=write_xml,
+            should_cancel=should_cancel,
+            changed=changed_set,
+        )
+    finally:
+        for error in [
+            rasaeco.manifest.save(manifest=manifest),
+            rasaeco.dependency.save(graph=graph, scenarios_dir=scenarios_dir),
+        ]:
+            if error is not None:
+                report.explanations.append(error)
+
+
+def _once(
+    scenarios_dir: pathlib.Path,
+    manifest: rasaeco.manifest.Manifest,
+    graph: rasaeco.dependency.Graph,
+    report: rasaeco.manifest.Report,
+    jobs: int,
+    write_xml: bool,
+    should_cancel: Optional[Callable[[], bool]],
+    changed: Optional[Set[pathlib.Path]],
+) -> List[str]:
+    """Render the scenarios and the ontology given the state of the last rendering."""
+    pass  # for pydocstyle
+
+    def cancel_if_requested() -> bool:
+        """Mark the report as cancelled if the caller requested so."""
+        if should_cancel is None or not should_cancel():
+            return False
+
+        report.cancelled = True
+        report.explanations.append(
+            "Cancelled the rendering as it has been superseded by newer changes."
+        )
+        return True
+
+    # Scenarios which match their summaries in the graph so that they need not be
+    # read again when loading the ontology
+    unchanged = set()  # type: Set[pathlib.Path]
+
+    with report.timed("intermediate"):
+        (
+            intermediate_map,
+            errors,
+        ) = rasaeco.intermediate.render_scenarios_to_intermediate(
+            scenarios_dir=scenarios_dir,
+            graph=graph,
+            report=report,
+            jobs=jobs,
+            write_xml=write_xml,
+            changed=changed,
+            unchanged=unchanged,
+        )
+
     if errors:
         return errors
 
-    ontology, errors = rasaeco.intermediate.load_ontology(scenarios_dir=scenarios_dir)
+    if cancel_if_requested():
+        return []
+
+    # Identifiers of the changed scenarios and of the scenarios whose pages depend
+    # on them; None if all the scenarios need to be inspected.
+    changed_ids = None  # type: Optional[Set[str]]
+    affected_ids = None  # type: Optional[Set[str]]
+    if changed is not None:
+        changed_ids = {
+            pth.parent.relative_to(scenarios_dir).as_posix() for pth in changed
+        }
+
+        # The dependents of the removed scenarios are only known before
+        # the graph is updated.
+        affected_ids = changed_ids | graph.dependents(changed_ids)
+
+    with report.timed("ontology"):
+        ontology, errors = rasaeco.intermediate.load_ontology(
+            scenarios_dir=scenarios_dir,
+            intermediate_map=intermediate_map,
+            graph=graph,
+            report=report,
+            changed=changed,
+            unchanged=unchanged,
+        )
+
     if errors:
         return errors
 
     assert ontology is not None
 
-    for scenario in ontology.scenarios:
-        for suffix in [".png", ".svg"]:
-            plot_pth = (
-                scenarios_dir / scenario.relative_path.parent / f"volumetric{suffix}"
+    if changed_ids is not None:
+        assert affected_ids is not None
+
+        # The dependents of the new scenarios are only known after
+        # the graph is updated.
+        affected_ids.update(graph.dependents(changed_ids))
+
+    removed_pths, errors = _remove_orphaned_artefacts(
+        scenarios_dir=scenarios_dir, ontology=ontology, manifest=manifest
+    )
+    for pth in removed_pths:
+        report.explanations.append(
+            f"Removed {pth} as its scenario does not exist anymore."
+        )
+
+    if cancel_if_requested():
+        return []
+
+    with report.timed("plots"):
+
+        @dataclasses.dataclass
+        class PlotTask:
+            plot_digest: str
+            plot_thumbnail_digest: str
+            plot_path: pathlib.Path
+            plot_thumbnail_path: pathlib.Path
+            scenario: rasaeco.model.Scenario
+
+        plot_tasks = []  # type: List[PlotTask]
+
+        for scenario in ontology.scenarios:
+            if changed_ids is not None and scenario.identifier not in changed_ids:
+                continue
+
+            for suffix in [".png", ".svg"]:
+                plot_pth = (
+                    scenarios_dir
+                    / scenario.relative_path.parent
+                    / f"volumetric{suffix}"
+                )
+
+                plot_thumbnail_pth = (
+                    scenarios_dir
+                    / scenario.relative_path.parent
+                    / f"volumetric_thumb{suffix}"
+                )
+
+                plot_digest = volumetric_digest(
+                    scenario=scenario, path=plot_pth, thumbnail=False
+                )
+                plot_thumbnail_digest = volumetric_digest(
+                    scenario=scenario, path=plot_thumbnail_pth, thumbnail=True
+                )
+
+                if not any(
+                    [
+                        rasaeco.manifest.needs_rendering(
+                            path=pth,
+                            digest=digest,
+                            inputs="the volumetric of the scenario and the plot style",
+                            manifest=manifest,
+                            report=report,
+                        )
+                        for pth, digest in [
+                            (plot_pth, plot_digest),
+                            (plot_thumbnail_pth, plot_thumbnail_digest),
+                        ]
+                    ]
+                ):
+                    continue
+
+                plot_tasks.append(
+                    PlotTask(
+                        plot_digest=plot_digest,
+                        plot_thumbnail_digest=plot_thumbnail_digest,
+                        plot_path=plot_pth,
+                        plot_thumbnail_path=plot_thumbnail_pth,
+                        scenario=scenario,
+                    )
+                )
+
+        plot_results = rasaeco.profiling.map_in_order(
+            function=_render_volumetric_plot,
+            kwargs_list=[
+                {
+                    "plot_path": task.plot_path,
+                    "plot_thumbnail_path": task.plot_thumbnail_path,
+                    "scenario": task.scenario,
+                    "cache_dir": rasaeco.plot_cache.cache_dir(
+                        scenarios_dir=scenarios_dir
+                    ),
+                }
+                for task in plot_tasks
+            ],
+            jobs=jobs,
+            name="plots",
+            scenarios=[
+                str(scenarios_dir / task.scenario.relative_path) for task in plot_tasks
+            ],
+            spans=report.spans,
+        )
+
+        for task, plot_errors in zip(plot_tasks, plot_results):
+            for pth, digest in [
+                (task.plot_path, task.plot_digest),
+                (task.plot_thumbnail_path, task.plot_thumbnail_digest),
+            ]:
+                if plot_errors:
+                    manifest.forget(path=pth)
+                else:
+                    manifest.record(path=pth, digest=digest)
+
+        for pth in rasaeco.plot_cache.evict(
+            directory=rasaeco.plot_cache.cache_dir(scenarios_dir=scenarios_dir),
+            limit=rasaeco.plot_cache.DEFAULT_LIMIT,
+        ):
+            report.explanations.append(
+                f"Evicted {pth} from the plot cache as the cache grew too large."
             )
 
-            plot_thumbnail_pth = (
-                scenarios_dir
-                / scenario.relative_path.parent
-                / f"volumetric_thumb{suffix}"
+    if cancel_if_requested():
+        return []
+
+    with report.timed("ontology_page"):
+        dataset = _ontology_dataset(ontology=ontology)
+        dataset_digest = rasaeco.manifest.digest(
+            json.dumps(dataset), rasaeco.live_reload.SCRIPT, str(rasaeco.layout.VERSION)
+        )
+
+        if any(
+            [
+                rasaeco.manifest.needs_rendering(
+                    path=pth,
+                    digest=dataset_digest,
+                    inputs="the scenario titles and relations",
+                    manifest=manifest,
+                    report=report,
+                )
+                for pth in [
+                    scenarios_dir / "ontology.html",
+                    scenarios_dir / "ontology.dot",
+                ]
+            ]
+        ):
+            ontology_errors = _render_ontology_html(
+                dataset=dataset, scenarios_dir=scenarios_dir
             )
 
-            _render_volumetric_plot(
-                plot_path=plot_pth,
-                plot_thumbnail_path=plot_thumbnail_pth,
-                scenario=scenario,
+            for pth in [
+                scenarios_dir / "ontology.html",
+                scenarios_dir / "ontology.dot",
+            ]:
+                if ontology_errors:
+                    manifest.forget(path=pth)
+                else:
+                    manifest.record(path=pth, digest=dataset_digest)
+
+    if cancel_if_requested():
+        return []
+
+    with report.timed("coverage"):
+        coverage_digest = _coverage_digest(ontology=ontology)
+        coverage_pths = [
+            scenarios_dir / "coverage.html",
+            scenarios_dir / "coverage.svg",
+        ]
+
+        if any(
+            [
+                rasaeco.manifest.needs_rendering(
+                    path=pth,
+                    digest=coverage_digest,
+                    inputs="the volumetrics and the titles of the scenarios",
+                    manifest=manifest,
+                    report=report,
+                )
+                for pth in coverage_pths
+            ]
+        ):
+            coverage_errors = _render_coverage(
+                ontology=ontology, scenarios_dir=scenarios_dir
             )
+            errors.extend(coverage_errors)
 
-    _render_ontology_html(ontology=ontology, scenarios_dir=scenarios_dir)
+            for pth in coverage_pths:
+                if coverage_errors:
+                    manifest.forget(path=pth)
+                else:
+                    manifest.record(path=pth, digest=coverage_digest)
 
-    for scenario in ontology.scenarios:
-        pth = scenarios_dir / scenario.relative_path
+    if cancel_if_requested():
+        return []
 
-        render_errors = _render_scenario(
-            scenario=scenario,
-            ontology=ontology,
-            xml_path=rasaeco.intermediate.as_xml_path(pth),
-            html_path=_html_path(pth),
+    with report.timed("glossary"):
+        backlinks_map = rasaeco.glossary.index(summaries=graph.summaries)
+
+        glossary_entries = _glossary_entries(
+            ontology=ontology, backlinks_map=backlinks_map
         )
+        glossary_digest = _glossary_digest(entries=glossary_entries)
+        glossary_pth = scenarios_dir / "glossary.html"
+
+        if rasaeco.manifest.needs_rendering(
+            path=glossary_pth,
+            digest=glossary_digest,
+            inputs="the definitions of the scenarios and the references to them",
+            manifest=manifest,
+            report=report,
+        ):
+            glossary_errors = _render_glossary(
+                entries=glossary_entries, scenarios_dir=scenarios_dir
+            )
+            errors.extend(glossary_errors)
 
-        for error in render_errors:
-            errors.append(f"When rendering {pth}: {error}")
+            if glossary_errors:
+                manifest.forget(path=glossary_pth)
+            else:
+                manifest.record(path=glossary_pth, digest=glossary_digest)
+
+    if cancel_if_requested():
+        return []
+
+    with report.timed("search"):
+        errors.extend(
+            rasaeco.search.update(
+                scenarios_dir=scenarios_dir,
+                ontology=ontology,
+                digests={
+                    identifier: summary.digest
+                    for identifier, summary in graph.summaries.items()
+                },
+                intermediate_map=intermediate_map,
+                report=report,
+            )
+        )
+
+    if cancel_if_requested():
+        return []
+
+    with report.timed("html"):
+        html_tasks = []  # type: List[Tuple[str, rasaeco.model.Scenario]]
+
+        for scenario in ontology.scenarios:
+            if affected_ids is not None and scenario.identifier not in affected_ids:
+                continue
+
+            html_pth = _html_path(scenarios_dir / scenario.relative_path)
+
+            html_digest = _scenario_html_digest(
+                scenario=scenario,
+                ontology=ontology,
+                summary=graph.summaries[scenario.identifier],
+                backlinks=backlinks_map.get(scenario.identifier, dict()),
+            )
+
+            if not rasaeco.manifest.needs_rendering(
+                path=html_pth,
+                digest=html_digest,
+                inputs="the scenario and the ontology facts it depends on",
+                manifest=manifest,
+                report=report,
+            ):
+                continue
+
+            html_tasks.append((html_digest, scenario))
+
+        html_results = rasaeco.profiling.map_in_order(
+            function=_render_scenario,
+            kwargs_list=[
+                {
+                    "scenario": scenario,
+                    "ontology": ontology,
+                    "backlinks": backlinks_map.get(scenario.identifier, dict()),
+                    "scenario_path": scenarios_dir / scenario.relative_path,
+                    # The scenarios which did not change are rendered to
+                    # the intermediate representation in the workers.
+                    "intermediate": intermediate_map.get(
+                        scenarios_dir / scenario.relative_path, None
+                    ),
+                    "html_path": _html_path(scenarios_dir / scenario.relative_path),
+                    "markdown_cache_dir": rasaeco.markdown_cache.cache_dir(
+                        scenarios_dir=scenarios_dir
+                    ),
+                }
+                for _, scenario in html_tasks
+            ],
+            jobs=jobs,
+            name="html",
+            scenarios=[
+                str(scenarios_dir / scenario.relative_path)
+                for _, scenario in html_tasks
+            ],
+            spans=report.spans,
+        )
+
+        for (html_digest, scenario), render_errors in zip(html_tasks, html_results):
+            pth = scenarios_dir / scenario.relative_path
+
+            for error in render_errors:
+                errors.append(f"When rendering {pth}: {error}")
+
+            if render_errors:
+                manifest.forget(path=_html_path(pth))
+            else:
+                manifest.record(path=_html_path(pth), digest=html_digest)
 
     if errors:
         return errors
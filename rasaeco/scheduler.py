@@ -0,0 +1,67 @@
+"""Debounce the changes of the scenarios and coalesce them into batches."""
+import pathlib
+import threading
+import time
+from typing import Optional, Set
+
+import icontract
+
+
+class Scheduler:
+    """
+    Collect the changed paths and release them in batches once the changes settle.
+
+    The paths are notified from the thread observing the file system, while
+    the batches are consumed by the rendering thread.
+    """
+
+    @icontract.require(lambda window: window >= 0.0)
+    def __init__(self, window: float) -> None:
+        """Initialize with the ``window`` of quiet, in seconds, before a batch."""
+        self.window = window
+
+        self._condition = threading.Condition()
+        self._pending = set()  # type: Set[pathlib.Path]
+        self._last_change = 0.0
+        self._stopped = False
+
+    def notify(self, path: pathlib.Path) -> None:
+        """Record that the file at the ``path`` changed."""
+        with self._condition:
+            self._pending.add(path)
+            self._last_change = time.monotonic()
+            self._condition.notify_all()
+
+    def has_pending(self) -> bool:
+        """Check whether changes arrived since the last batch, or the scheduler stopped."""
+        with self._condition:
+            return self._stopped or len(self._pending) > 0
+
+    def stop(self) -> None:
+        """Stop the scheduler and release the thread waiting for the next batch."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def next_batch(self) -> Optional[Set[pathlib.Path]]:
+        """
+        Wait until there have been no changes for the duration of the window.
+
+        Return the changed paths, or None if the scheduler has been stopped.
+        """
+        with self._condition:
+            while not self._stopped:
+                if not self._pending:
+                    self._condition.wait()
+                    continue
+
+                remaining = self._last_change + self.window - time.monotonic()
+                if remaining > 0.0:
+                    self._condition.wait(timeout=remaining)
+                    continue
+
+                batch = self._pending
+                self._pending = set()
+                return batch
+
+            return None
@@ -0,0 +1,459 @@
+"""Index the scenarios for the full-text search in the rendered pages."""
+import json
+import pathlib
+import re
+import xml.etree.ElementTree as ET
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+import rasaeco.live_reload
+import rasaeco.manifest
+import rasaeco.markdown_cache
+import rasaeco.model
+import rasaeco.output
+import rasaeco.template
+
+if TYPE_CHECKING:
+    # The intermediate representation imports this module to extract the terms
+    # so that we import it back only in the function to avoid the cycle.
+    import rasaeco.intermediate
+
+#: Directory, relative to the scenarios directory, where the index is stored
+INDEX_DIR = "search_index"
+
+#: Version of the index format, both of the published index and of its cache
+FORMAT = 1
+
+#: Number of leading characters of a term which determine its shard
+PREFIX_LENGTH = 2
+
+#: Terms shorter than this are not indexed
+MIN_TERM_LENGTH = 2
+
+#: Weights of a term occurring in the different parts of a scenario
+TITLE_WEIGHT = 8
+HEADING_WEIGHT = 4
+DEFINITION_WEIGHT = 4
+TEXT_WEIGHT = 1
+
+# Words are split at the underscores so that ``reception_platform`` is found
+# by both ``reception`` and ``platform``.
+_TERM_RE = re.compile(r"[^\W_]+")
+
+_HEADINGS = ["h1", "h2", "h3", "h4", "h5", "h6"]
+
+_DEFINITIONS = ["model", "def", "test", "acceptance"]
+
+
+def tokenize(text: str) -> List[str]:
+    """Split the text into the terms of the index."""
+    return [
+        term for term in _TERM_RE.findall(text.lower()) if len(term) >= MIN_TERM_LENGTH
+    ]
+
+
+def extract_terms(root: ET.Element, title: Optional[str]) -> Dict[str, int]:
+    """
+    Score the terms of the scenario given its intermediate representation.
+
+    The score of a term sums the weights of all its occurrences.
+    """
+    terms = dict()  # type: Dict[str, int]
+
+    def add(text: str, weight: int) -> None:
+        """Add the terms of the text with the given weight."""
+        for term in tokenize(text):
+            terms[term] = terms.get(term, 0) + weight
+
+    if title is not None:
+        add(title, TITLE_WEIGHT)
+
+    for tag in _HEADINGS:
+        for element in root.iter(tag):
+            add("".join(element.itertext()), HEADING_WEIGHT)
+
+    for tag in _DEFINITIONS:
+        for element in root.iter(tag):
+            add(element.attrib.get("name", ""), DEFINITION_WEIGHT)
+
+    add(" ".join(root.itertext()), TEXT_WEIGHT)
+
+    return terms
+
+
+def shard_key(term: str) -> str:
+    """Determine the key of the shard containing the term."""
+    return term[:PREFIX_LENGTH]
+
+
+def shard_path(scenarios_dir: pathlib.Path, key: str) -> pathlib.Path:
+    """Generate the path to the shard; the key is hex-encoded to be safe as a name."""
+    return scenarios_dir / INDEX_DIR / f"shard-{key.encode('utf-8').hex()}.json"
+
+
+def documents_path(scenarios_dir: pathlib.Path) -> pathlib.Path:
+    """Generate the path to the list of the indexed scenarios."""
+    return scenarios_dir / INDEX_DIR / "documents.json"
+
+
+def cache_path(scenarios_dir: pathlib.Path) -> pathlib.Path:
+    """Generate the path to the state of the index between the renderings."""
+    return scenarios_dir / rasaeco.manifest.CACHE_DIR / "search.json"
+
+
+class _Entry:
+    """Represent an indexed scenario in the state of the index."""
+
+    def __init__(self, slot: int, digest: str, shards: Set[str]) -> None:
+        """
+        Initialize with the given values.
+
+        The ``slot`` is the number of the scenario in the index. The ``digest``
+        stands for the indexed content, and the ``shards`` are the keys of
+        the shards containing its terms.
+        """
+        self.slot = slot
+        self.digest = digest
+        self.shards = shards
+
+
+def _load_state(
+    scenarios_dir: pathlib.Path,
+) -> Tuple[MutableMapping[str, _Entry], Optional[str]]:
+    """
+    Load the state of the index from the last rendering.
+
+    Return (scenario identifier → entry, the reason why the state was discarded
+    if any).
+    """
+    pth = cache_path(scenarios_dir=scenarios_dir)
+    if not pth.exists():
+        return dict(), None
+
+    if not documents_path(scenarios_dir=scenarios_dir).exists():
+        return dict(), f"The search index in {scenarios_dir / INDEX_DIR} is missing."
+
+    try:
+        data = json.loads(pth.read_text(encoding="utf-8"))
+    except Exception as exception:
+        return (
+            dict(),
+            f"Failed to read the state of the search index {pth}: {exception}",
+        )
+
+    if (
+        not isinstance(data, dict)
+        or data.get("format", None) != FORMAT
+        or not isinstance(data.get("entries", None), dict)
+    ):
+        return (
+            dict(),
+            f"The state of the search index {pth} is in an unexpected format.",
+        )
+
+    entries = dict()  # type: MutableMapping[str, _Entry]
+    for identifier, value in data["entries"].items():
+        try:
+            entries[identifier] = _Entry(
+                slot=int(value["slot"]),
+                digest=str(value["digest"]),
+                shards=set(str(key) for key in value["shards"]),
+            )
+        except Exception:
+            return (
+                dict(),
+                f"The state of the search index {pth} is in an unexpected format.",
+            )
+
+    return entries, None
+
+
+def _save_state(
+    scenarios_dir: pathlib.Path, entries: Mapping[str, _Entry]
+) -> Optional[str]:
+    """
+    Store the state of the index for the next rendering.
+
+    Return error if any.
+    """
+    pth = cache_path(scenarios_dir=scenarios_dir)
+    tmp_pth = pth.parent / (pth.name + ".tmp")
+
+    data = json.dumps(
+        {
+            "format": FORMAT,
+            "entries": {
+                identifier: {
+                    "slot": entry.slot,
+                    "digest": entry.digest,
+                    "shards": sorted(entry.shards),
+                }
+                for identifier, entry in sorted(entries.items())
+            },
+        }
+    ).encode("utf-8")
+
+    try:
+        if rasaeco.output.unchanged(path=pth, data=data):
+            return None
+
+        pth.parent.mkdir(exist_ok=True)
+        tmp_pth.write_bytes(data)
+        tmp_pth.replace(pth)
+    except Exception as exception:
+        return f"Failed to store the state of the search index to {pth}: {exception}"
+
+    return None
+
+
+def _load_shard(pth: pathlib.Path) -> Dict[str, List[int]]:
+    """Load the shard, or start an empty one if it is missing or corrupt."""
+    try:
+        data = json.loads(pth.read_text(encoding="utf-8"))
+    except Exception:
+        return dict()
+
+    return data if isinstance(data, dict) else dict()
+
+
+def _encode(data: Any) -> bytes:
+    """Encode the data compactly as JSON."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def update(
+    scenarios_dir: pathlib.Path,
+    ontology: rasaeco.model.Ontology,
+    digests: Mapping[str, str],
+    intermediate_map: Mapping[pathlib.Path, "rasaeco.intermediate.Intermediate"],
+    report: rasaeco.manifest.Report,
+) -> List[str]:
+    """
+    Update the search index with the scenarios which changed since the last rendering.
+
+    The ``digests`` map the scenario identifiers to the digests of their content.
+    The terms of the changed scenarios are taken from the ``intermediate_map``.
+    The scenarios missing there are rendered to the intermediate representation
+    on the fly.
+
+    Each scenario is assigned a slot in the list of the documents. The postings of
+    a term list the slots together with the scores, and the terms are sharded by
+    their first characters so that the search page loads only the shards of
+    the query. Only the shards containing the terms of the changed scenarios are
+    rewritten.
+
+    Return errors if any.
+    """
+    # See the note on the import at the top.
+    import rasaeco.intermediate
+
+    entries, note = _load_state(scenarios_dir=scenarios_dir)
+    if note is not None:
+        report.explanations.append(f"{note} Indexing everything anew.")
+
+    # Without the state we do not know which postings in the shards on the disk are
+    # stale so that the shards need to be written from scratch.
+    rebuild = len(entries) == 0
+
+    page_pth = scenarios_dir / "search.html"
+    try:
+        rasaeco.output.write_if_changed(
+            page_pth,
+            rasaeco.template.SEARCH_HTML_TPL.render(
+                index_dir=INDEX_DIR,
+                prefix_length=PREFIX_LENGTH,
+                min_term_length=MIN_TERM_LENGTH,
+                live_reload_script=rasaeco.live_reload.SCRIPT,
+            ).encode("utf-8"),
+        )
+    except Exception as exception:
+        return [f"Failed to write the search page to {page_pth}: {exception}"]
+
+    removed = sorted(set(entries) - set(ontology.scenario_map))
+    changed = [
+        scenario
+        for scenario in ontology.scenarios
+        if scenario.identifier not in entries
+        or entries[scenario.identifier].digest != digests[scenario.identifier]
+    ]
+
+    if not removed and not changed:
+        report.explanations.append(
+            "Skipping the search index as no scenario changed since the last indexing."
+        )
+        return []
+
+    # Slot → terms to be indexed
+    new_terms = dict()  # type: Dict[int, Dict[str, int]]
+
+    # Slots whose postings need to be removed from the touched shards
+    stale_slots = set()  # type: Set[int]
+
+    touched = set()  # type: Set[str]
+
+    errors = []  # type: List[str]
+
+    slot_count = max((entry.slot for entry in entries.values()), default=-1) + 1
+
+    for identifier in removed:
+        entry = entries.pop(identifier)
+        stale_slots.add(entry.slot)
+        touched.update(entry.shards)
+
+    # The slots of the removed scenarios are re-used, the lowest first.
+    free_slots = sorted(
+        set(range(slot_count)) - {entry.slot for entry in entries.values()},
+        reverse=True,
+    )
+
+    for scenario in changed:
+        pth = scenarios_dir / scenario.relative_path
+
+        intermediate = intermediate_map.get(pth, None)
+        if intermediate is None or intermediate.digest != digests[scenario.identifier]:
+            (
+                intermediate,
+                to_intermediate_errors,
+            ) = rasaeco.intermediate.render_scenario_to_intermediate(
+                scenario_path=pth,
+                markdown_cache_dir=rasaeco.markdown_cache.cache_dir(
+                    scenarios_dir=scenarios_dir
+                ),
+            )
+
+            if to_intermediate_errors:
+                errors.extend(
+                    f"When indexing {pth} for the search: {error}"
+                    for error in to_intermediate_errors
+                )
+                continue
+
+            assert intermediate is not None
+
+        entry_or_none = entries.get(scenario.identifier, None)
+        if entry_or_none is not None:
+            slot = entry_or_none.slot
+            stale_slots.add(slot)
+            touched.update(entry_or_none.shards)
+        elif free_slots:
+            slot = free_slots.pop()
+        else:
+            slot = slot_count
+            slot_count += 1
+
+        shards = {shard_key(term) for term in intermediate.terms}
+        touched.update(shards)
+
+        new_terms[slot] = intermediate.terms
+        entries[scenario.identifier] = _Entry(
+            slot=slot, digest=intermediate.digest, shards=shards
+        )
+
+    if errors:
+        return errors
+
+    report.explanations.append(
+        f"Indexing {len(changed)} scenario(s) for the search and removing "
+        f"{len(removed)} scenario(s) from it; {len(touched)} shard(s) are affected."
+    )
+
+    # Shard key → term → postings as a flat list of slots and scores
+    shard_map = {
+        key: dict() for key in touched
+    }  # type: Dict[str, Dict[str, List[int]]]
+
+    # Load the touched shards from the last rendering, without the stale postings
+    if not rebuild:
+        for key in touched:
+            shard = _load_shard(shard_path(scenarios_dir=scenarios_dir, key=key))
+
+            for term, postings in shard.items():
+                kept = [
+                    value
+                    for i in range(0, len(postings) - 1, 2)
+                    if postings[i] not in stale_slots
+                    for value in postings[i : i + 2]
+                ]
+                if kept:
+                    shard_map[key][term] = kept
+
+    for slot, terms in new_terms.items():
+        for term, score in terms.items():
+            shard_map[shard_key(term)].setdefault(term, []).extend([slot, score])
+
+    index_dir = scenarios_dir / INDEX_DIR
+    try:
+        index_dir.mkdir(exist_ok=True)
+
+        for key, shard in shard_map.items():
+            pth = shard_path(scenarios_dir=scenarios_dir, key=key)
+
+            if not shard:
+                pth.unlink(missing_ok=True)
+                rasaeco.output.compressed_path(pth).unlink(missing_ok=True)
+                continue
+
+            # The postings are ordered by the score so that the best matches
+            # come first.
+            for term, postings in shard.items():
+                pairs = sorted(
+                    zip(postings[0::2], postings[1::2]),
+                    key=lambda pair: (-pair[1], pair[0]),
+                )
+                shard[term] = [value for pair in pairs for value in pair]
+
+            rasaeco.output.write_if_changed(pth, _encode(dict(sorted(shard.items()))))
+
+        if rebuild:
+            used = {
+                shard_path(scenarios_dir=scenarios_dir, key=key)
+                for entry in entries.values()
+                for key in entry.shards
+            }
+
+            for pth in index_dir.glob("shard-*.json"):
+                if pth not in used:
+                    pth.unlink()
+                    rasaeco.output.compressed_path(pth).unlink(missing_ok=True)
+
+        documents = [None] * slot_count  # type: List[Optional[Tuple[str, str]]]
+        for identifier, entry in entries.items():
+            documents[entry.slot] = (
+                identifier,
+                ontology.scenario_map[identifier].title,
+            )
+
+        # Trim the free slots at the end
+        while documents and documents[-1] is None:
+            documents.pop()
+
+        rasaeco.output.write_if_changed(
+            documents_path(scenarios_dir=scenarios_dir),
+            _encode(
+                {
+                    "format": FORMAT,
+                    "prefix_length": PREFIX_LENGTH,
+                    "min_term_length": MIN_TERM_LENGTH,
+                    "documents": documents,
+                }
+            ),
+        )
+    except Exception as exception:
+        # The index is rebuilt on the next rendering.
+        cache_path(scenarios_dir=scenarios_dir).unlink(missing_ok=True)
+        return [f"Failed to write the search index to {index_dir}: {exception}"]
+
+    error = _save_state(scenarios_dir=scenarios_dir, entries=entries)
+    if error is not None:
+        report.explanations.append(error)
+
+    return []
@@ -0,0 +1,218 @@
+"""Serve HTTP requests concurrently with a bounded pool of worker threads."""
+import concurrent.futures
+import hashlib
+import http.server
+import os
+import pathlib
+import socket
+import threading
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+import icontract
+
+#: Default number of threads handling the requests
+DEFAULT_WORKERS = 16
+
+#: Default number of accepted connections waiting for a free worker
+DEFAULT_MAX_PENDING = 64
+
+#: Default number of seconds an idle persistent connection is kept open
+DEFAULT_KEEP_ALIVE_TIMEOUT = 5.0
+
+# Response sent to the connections which can not be queued anymore
+_BUSY_RESPONSE = (
+    b"HTTP/1.1 503 Service Unavailable\r\n"
+    b"Retry-After: 1\r\n"
+    b"Content-Length: 0\r\n"
+    b"Connection: close\r\n"
+    b"\r\n"
+)
+
+
+class PooledHTTPServer(http.server.HTTPServer):
+    """
+    Handle the connections in a bounded pool of worker threads.
+
+    A worker handles all the requests of a persistent connection until the
+    connection closes or stays idle for longer than the timeout of the handler.
+    If ``workers`` connections are being handled and ``max_pending`` further
+    connections wait for a worker, the new connections are answered with
+    503 Service Unavailable.
+
+    Long-lived responses, such as event streams, should be :py:meth:`detach`'ed
+    from the pool so that they do not occupy the workers.
+    """
+
+    @icontract.require(lambda workers: workers >= 1)
+    @icontract.require(lambda max_pending: max_pending >= 0)
+    def __init__(
+        self,
+        server_address: Tuple[str, int],
+        handler_class: Callable[..., http.server.BaseHTTPRequestHandler],
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> None:
+        """Bind the server and initialize the pool; no thread is started."""
+        super().__init__(server_address, handler_class)
+
+        self.workers = workers
+        self.max_pending = max_pending
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="rasaeco-http"
+        )
+
+        # Slots for the connections being handled or waiting for a worker
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+
+        self._detached_lock = threading.Lock()
+        self._detached = set()  # type: Set[Any]
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        """Queue the connection to the pool or turn it away if the pool is full."""
+        if not self._slots.acquire(blocking=False):
+            try:
+                request.sendall(_BUSY_RESPONSE)
+            except OSError:
+                pass
+            finally:
+                self.shutdown_request(request)
+            return
+
+        try:
+            self._executor.submit(self._process, request, client_address)
+        except RuntimeError:
+            # The pool has been shut down in the meanwhile.
+            self._slots.release()
+            self.shutdown_request(request)
+
+    def _process(self, request: Any, client_address: Any) -> None:
+        """Handle the connection in a worker thread."""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def detach(self, request: Any) -> None:
+        """
+        Take the connection out of the life cycle of the pool.
+
+        The connection is not closed when its handler returns. Whoever detached it
+        is responsible for closing it with :py:meth:`close_detached`.
+        """
+        with self._detached_lock:
+            self._detached.add(request)
+
+    def close_detached(self, request: Any) -> None:
+        """Close the connection which has been detached from the pool."""
+        with self._detached_lock:
+            self._detached.discard(request)
+
+        self.shutdown_request(request)
+
+    def shutdown_request(self, request: Any) -> None:
+        """Close the connection unless it has been detached."""
+        with self._detached_lock:
+            if request in self._detached:
+                return
+
+        try:
+            request.shutdown(socket.SHUT_WR)
+        except OSError:
+            # The client might have closed the connection already.
+            pass
+
+        self.close_request(request)
+
+    def server_close(self) -> None:
+        """Close the listening socket and stop the pool without waiting for it."""
+        super().server_close()
+        self._executor.shutdown(wait=False)
+
+
+class ETags:
+    """
+    Compute the entity tags of the files from their content.
+
+    The tags are memoized as long as the size and the modification time of
+    the file stay the same so that each file is hashed only once after it changed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with an empty memo."""
+        self._lock = threading.Lock()
+
+        # Path → (modification time in ns, size, entity tag)
+        self._memo = dict()  # type: Dict[pathlib.Path, Tuple[int, int, str]]
+
+    def get(self, path: pathlib.Path, stat: os.stat_result) -> str:
+        """Retrieve the entity tag of the file at ``path`` with the given ``stat``."""
+        with self._lock:
+            memoized = self._memo.get(path, None)
+
+        if (
+            memoized is not None
+            and memoized[0] == stat.st_mtime_ns
+            and memoized[1] == stat.st_size
+        ):
+            return memoized[2]
+
+        hsh = hashlib.sha256()
+        with path.open("rb") as fid:
+            for chunk in iter(lambda: fid.read(1024 * 1024), b""):
+                hsh.update(chunk)
+
+        etag = f'"{hsh.hexdigest()[:32]}"'
+
+        with self._lock:
+            self._memo[path] = (stat.st_mtime_ns, stat.st_size, etag)
+
+        return etag
+
+
+def matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check whether the ``If-None-Match`` header matches the entity tag.
+
+    The tags are compared weakly as required for the conditional GET requests.
+    """
+    if if_none_match is None:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+
+        if candidate == etag:
+            return True
+
+    return False
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Check whether the ``Accept-Encoding`` header allows for gzip."""
+    if accept_encoding is None:
+        return False
+
+    for coding in accept_encoding.split(","):
+        name, _, parameters = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "x-gzip"):
+            continue
+
+        quality = parameters.strip().lower().replace(" ", "")
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0.0
+            except ValueError:
+                return False
+
+        return True
+
+    return False
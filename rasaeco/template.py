@@ -2,7 +2,9 @@
 
 import jinja2
 
-# Copy/pasted from http://bl.ocks.org/jhb/5955887
+# The layout is computed in advance (see ``rasaeco.layout``) so that the page only
+# needs to draw it. When zoomed out, the clusters of nearby scenarios are drawn
+# instead of the individual scenarios.
 ONTOLOGY_HTML_TPL = jinja2.Template(
     """\
 <!DOCTYPE html>
@@ -10,140 +12,330 @@ ONTOLOGY_HTML_TPL = jinja2.Template(
 <head>
 <meta charset="utf-8">
 <title>Ontology</title>
-<script src="https://d3js.org/d3.v3.min.js" charset="utf-8"></script>
+<script>
+{{ live_reload_script }}</script>
 <style type="text/css">
-.nodelabel {
-    color: red;
+html, body {
+    margin: 0;
+    height: 100%;
+    overflow: hidden;
+    font-family: sans-serif;
+}
+canvas {
+    display: block;
+}
+#hint {
+    position: absolute;
+    left: 1em;
+    bottom: 1em;
+    color: #888;
+    font-size: small;
 }
 </style>
 </head>
 <body>
+<canvas id="ontology"></canvas>
+<div id="hint">Scroll to zoom, drag to pan, click a scenario to open it.</div>
 
 <script type="text/javascript">
-    var w = 1600;
-    var h = 1200;
-    var linkDistance=200;
-
-    var dataset = {{ dataset|indent }};
-
-    var svg = d3.select("body").append("svg").attr({"width":w,"height":h});
-
-    var force = d3.layout.force()
-        .nodes(dataset.nodes)
-        .links(dataset.edges)
-        .size([w,h])
-        .linkDistance([linkDistance])
-        .charge([-500])
-        .theta(0.1)
-        .gravity(0.05)
-        .start();
-
-    var edges = svg.selectAll("line")
-      .data(dataset.edges)
-      .enter()
-      .append("line")
-      .attr("id",function(d,i) {return 'edge'+i})
-      .attr('marker-end','url(#arrowhead)')
-      .style("stroke","#ccc")
-      .style("pointer-events", "none");
-    
-    var nodes = svg.selectAll("circle")
-      .data(dataset.nodes)
-      .enter()
-      .append("circle")
-      .attr({"r":15})
-      .style("fill","#CCCCCC")
-      .call(force.drag)
-
-    var nodelabels = svg.selectAll(".nodelabel") 
-       .data(dataset.nodes)
-       .enter()
-       .append("text")
-       .attr({"x":function(d){return d.x;},
-              "y":function(d){return d.y;},
-              "class":"nodelabel",
-              "stroke":"black"})
-       .html(function(d) {
-            return '<a href=' + d.url + '>' + d.name + '</a>';
+(function () {
+    var view = {{ view }};
+
+    var EDGE_LENGTH = {{ edge_length }};
+    var NODE_RADIUS = 8;
+
+    // Below these lengths of an edge on the screen, we draw the clusters instead
+    // of the scenarios, and omit the scenario and relation labels, respectively.
+    var CLUSTER_BELOW = 24;
+    var NODE_LABELS_BELOW = 60;
+    var EDGE_LABELS_BELOW = 160;
+
+    var canvas = document.getElementById("ontology");
+    var context = canvas.getContext("2d");
+
+    var scale = 1;
+    var offsetX = 0;
+    var offsetY = 0;
+    var width = 0;
+    var height = 0;
+
+    var hovered = null;
+    var dragging = null;
+
+    function resize() {
+        var ratio = window.devicePixelRatio || 1;
+        width = window.innerWidth;
+        height = window.innerHeight;
+        canvas.width = width * ratio;
+        canvas.height = height * ratio;
+        canvas.style.width = width + "px";
+        canvas.style.height = height + "px";
+        context.setTransform(ratio, 0, 0, ratio, 0, 0);
+    }
+
+    function fit() {
+        var minX = Infinity, minY = Infinity, maxX = -Infinity, maxY = -Infinity;
+        view.nodes.forEach(function (node) {
+            minX = Math.min(minX, node.x);
+            minY = Math.min(minY, node.y);
+            maxX = Math.max(maxX, node.x);
+            maxY = Math.max(maxY, node.y);
         });
 
-    var edgepaths = svg.selectAll(".edgepath")
-        .data(dataset.edges)
-        .enter()
-        .append('path')
-        .attr({'d': function(d) {return 'M '+d.source.x+' '+d.source.y+' L '+ d.target.x +' '+d.target.y},
-               'class':'edgepath',
-               'fill-opacity':0,
-               'stroke-opacity':0,
-               'fill':'blue',
-               'stroke':'red',
-               'id':function(d,i) {return 'edgepath'+i}})
-        .style("pointer-events", "none");
-
-    var edgelabels = svg.selectAll(".edgelabel")
-        .data(dataset.edges)
-        .enter()
-        .append('text')
-        .style("pointer-events", "none")
-        .attr({'class':'edgelabel',
-               'id':function(d,i){return 'edgelabel'+i},
-               'dx':80,
-               'dy':-3,
-               'font-size':15,
-               'fill':'#000000'});
-
-    edgelabels.append('textPath')
-        .attr('xlink:href',function(d,i) {return '#edgepath'+i})
-        .style("pointer-events", "none")
-        .text(function(d,i){
-            return d.label;
+        if (view.nodes.length === 0) {
+            minX = minY = maxX = maxY = 0;
+        }
+
+        var margin = 4 * NODE_RADIUS + EDGE_LENGTH;
+        scale = Math.min(
+            2, width / (maxX - minX + margin), height / (maxY - minY + margin));
+        offsetX = width / 2 - scale * (minX + maxX) / 2;
+        offsetY = height / 2 - scale * (minY + maxY) / 2;
+    }
+
+    function toScreen(x, y) {
+        return [offsetX + scale * x, offsetY + scale * y];
+    }
+
+    function clustered() {
+        return scale * EDGE_LENGTH < CLUSTER_BELOW;
+    }
+
+    function clusterRadius(cluster) {
+        return NODE_RADIUS + 2 * Math.sqrt(cluster.size);
+    }
+
+    function visible(p, margin) {
+        return p[0] > -margin && p[0] < width + margin &&
+            p[1] > -margin && p[1] < height + margin;
+    }
+
+    function drawArrow(a, b, radius) {
+        var dx = b[0] - a[0];
+        var dy = b[1] - a[1];
+        var length = Math.sqrt(dx * dx + dy * dy);
+        if (length <= radius) {
+            return;
+        }
+
+        var ux = dx / length;
+        var uy = dy / length;
+        var tipX = b[0] - ux * radius;
+        var tipY = b[1] - uy * radius;
+
+        context.beginPath();
+        context.moveTo(tipX, tipY);
+        context.lineTo(tipX - 8 * ux + 4 * uy, tipY - 8 * uy - 4 * ux);
+        context.lineTo(tipX - 8 * ux - 4 * uy, tipY - 8 * uy + 4 * ux);
+        context.closePath();
+        context.fill();
+    }
+
+    function drawClusters() {
+        context.strokeStyle = "#ccc";
+        view.cluster_edges.forEach(function (edge) {
+            var a = view.clusters[edge.source];
+            var b = view.clusters[edge.target];
+            var pa = toScreen(a.x, a.y);
+            var pb = toScreen(b.x, b.y);
+            context.lineWidth = 1 + Math.log(edge.count);
+            context.beginPath();
+            context.moveTo(pa[0], pa[1]);
+            context.lineTo(pb[0], pb[1]);
+            context.stroke();
         });
+        context.lineWidth = 1;
+
+        context.textAlign = "center";
+        context.textBaseline = "middle";
+        view.clusters.forEach(function (cluster) {
+            var p = toScreen(cluster.x, cluster.y);
+            var radius = clusterRadius(cluster);
+            if (!visible(p, radius)) {
+                return;
+            }
 
+            context.fillStyle = "#ccc";
+            context.beginPath();
+            context.arc(p[0], p[1], radius, 0, 2 * Math.PI);
+            context.fill();
 
-    svg.append('defs').append('marker')
-        .attr({'id':'arrowhead',
-               'viewBox':'-0 -5 10 10',
-               'refX':25,
-               'refY':0,
-               'orient':'auto',
-               'markerWidth':10,
-               'markerHeight':10,
-               'xoverflow':'visible'})
-        .append('svg:path')
-            .attr('d', 'M 0,-5 L 10 ,0 L 0,5')
-            .attr('fill', '#ccc')
-            .attr('stroke','#ccc');
-     
-
-    force.on("tick", function(){
-        edges.attr({"x1": function(d){return d.source.x;},
-                    "y1": function(d){return d.source.y;},
-                    "x2": function(d){return d.target.x;},
-                    "y2": function(d){return d.target.y;}
+            context.fillStyle = "black";
+            context.fillText(String(cluster.size), p[0], p[1]);
         });
+    }
+
+    function drawNodes() {
+        var edgeOnScreen = scale * EDGE_LENGTH;
 
-        nodes.attr({"cx":function(d){return d.x;},
-                    "cy":function(d){return d.y;}
+        context.strokeStyle = "#ccc";
+        context.fillStyle = "#ccc";
+        context.beginPath();
+        view.edges.forEach(function (edge) {
+            var a = view.nodes[edge.source];
+            var b = view.nodes[edge.target];
+            var pa = toScreen(a.x, a.y);
+            var pb = toScreen(b.x, b.y);
+            context.moveTo(pa[0], pa[1]);
+            context.lineTo(pb[0], pb[1]);
         });
+        context.stroke();
+
+        if (edgeOnScreen >= NODE_LABELS_BELOW) {
+            view.edges.forEach(function (edge) {
+                var a = view.nodes[edge.source];
+                var b = view.nodes[edge.target];
+                var pb = toScreen(b.x, b.y);
+                if (visible(pb, NODE_RADIUS)) {
+                    drawArrow(toScreen(a.x, a.y), pb, NODE_RADIUS);
+                }
+            });
+        }
+
+        if (edgeOnScreen >= EDGE_LABELS_BELOW) {
+            context.fillStyle = "black";
+            context.textAlign = "center";
+            context.textBaseline = "bottom";
+            view.edges.forEach(function (edge) {
+                var a = view.nodes[edge.source];
+                var b = view.nodes[edge.target];
+                var p = toScreen((a.x + b.x) / 2, (a.y + b.y) / 2);
+                if (visible(p, 0)) {
+                    context.fillText(edge.label, p[0], p[1] - 3);
+                }
+            });
+        }
+
+        context.textAlign = "left";
+        context.textBaseline = "middle";
+        view.nodes.forEach(function (node) {
+            var p = toScreen(node.x, node.y);
+            if (!visible(p, NODE_RADIUS + 200)) {
+                return;
+            }
 
-        nodelabels.attr("x", function(d) { return d.x; }) 
-                  .attr("y", function(d) { return d.y; });
+            context.fillStyle = node === hovered ? "#888" : "#ccc";
+            context.beginPath();
+            context.arc(p[0], p[1], NODE_RADIUS, 0, 2 * Math.PI);
+            context.fill();
 
-        edgepaths.attr('d', function(d) { 
-            var path='M '+d.source.x+' '+d.source.y+' L '+ d.target.x +' '+d.target.y;
-            return path});       
+            if (edgeOnScreen >= NODE_LABELS_BELOW || node === hovered) {
+                context.fillStyle = "red";
+                context.fillText(node.name, p[0] + NODE_RADIUS + 3, p[1]);
+            }
+        });
+    }
 
-        edgelabels.attr('transform',function(d,i){
-            if (d.target.x<d.source.x){
-                bbox = this.getBBox();
-                rx = bbox.x+bbox.width/2;
-                ry = bbox.y+bbox.height/2;
-                return 'rotate(180 '+rx+' '+ry+')';
+    var scheduled = false;
+    function draw() {
+        if (scheduled) {
+            return;
+        }
+        scheduled = true;
+
+        window.requestAnimationFrame(function () {
+            scheduled = false;
+            context.clearRect(0, 0, width, height);
+            context.font = "14px sans-serif";
+            if (clustered()) {
+                drawClusters();
             } else {
-                return 'rotate(0)';
+                drawNodes();
+            }
+        });
+    }
+
+    // Find the scenario or the cluster under the mouse
+    function pick(x, y) {
+        var items = clustered() ? view.clusters : view.nodes;
+        var best = null;
+        var bestDistance = Infinity;
+        items.forEach(function (item) {
+            var p = toScreen(item.x, item.y);
+            var radius = clustered() ? clusterRadius(item) : NODE_RADIUS;
+            var distance = Math.sqrt(
+                (p[0] - x) * (p[0] - x) + (p[1] - y) * (p[1] - y));
+            if (distance <= radius + 2 && distance < bestDistance) {
+                best = item;
+                bestDistance = distance;
             }
         });
+        return best;
+    }
+
+    function zoom(factor, x, y) {
+        offsetX = x - factor * (x - offsetX);
+        offsetY = y - factor * (y - offsetY);
+        scale *= factor;
+        draw();
+    }
+
+    canvas.addEventListener("wheel", function (event) {
+        event.preventDefault();
+        zoom(Math.exp(-event.deltaY * 0.002), event.clientX, event.clientY);
+    }, {passive: false});
+
+    canvas.addEventListener("mousedown", function (event) {
+        dragging = {x: event.clientX, y: event.clientY, moved: false};
+    });
+
+    canvas.addEventListener("mousemove", function (event) {
+        if (dragging !== null) {
+            var dx = event.clientX - dragging.x;
+            var dy = event.clientY - dragging.y;
+            if (dragging.moved || Math.abs(dx) + Math.abs(dy) > 3) {
+                dragging.moved = true;
+                offsetX += dx;
+                offsetY += dy;
+                dragging.x = event.clientX;
+                dragging.y = event.clientY;
+                draw();
+            }
+            return;
+        }
+
+        var item = pick(event.clientX, event.clientY);
+        var node = clustered() ? null : item;
+        canvas.style.cursor = item === null ? "default" : "pointer";
+        canvas.title = node === null ? "" : node.name;
+        if (node !== hovered) {
+            hovered = node;
+            draw();
+        }
+    });
+
+    canvas.addEventListener("mouseup", function (event) {
+        var wasClick = dragging !== null && !dragging.moved;
+        dragging = null;
+        if (!wasClick) {
+            return;
+        }
+
+        var item = pick(event.clientX, event.clientY);
+        if (item === null) {
+            return;
+        }
+
+        if (clustered()) {
+            // Zoom in so that the scenarios of the cluster are shown.
+            var p = toScreen(item.x, item.y);
+            offsetX += width / 2 - p[0];
+            offsetY += height / 2 - p[1];
+            zoom(NODE_LABELS_BELOW / (scale * EDGE_LENGTH), width / 2, height / 2);
+        } else {
+            window.location.href = item.url;
+        }
+    });
+
+    window.addEventListener("resize", function () {
+        resize();
+        draw();
     });
+
+    resize();
+    fit();
+    draw();
+})();
 </script>
 
 </body>
@@ -169,3 +361,343 @@ digraph G {
 }
 """
 )
+
+COVERAGE_HTML_TPL = jinja2.Template(
+    """\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Coverage of the Scenario Space</title>
+<script>
+{{ live_reload_script }}</script>
+<style type="text/css">
+body {
+    font-family: sans-serif;
+    margin: 2em;
+}
+table {
+    border-collapse: collapse;
+}
+th, td {
+    padding: 0.2em 0.8em;
+    border-bottom: 1px solid #ccc;
+    text-align: left;
+}
+td.number {
+    text-align: right;
+}
+</style>
+</head>
+<body>
+<a href="ontology.html">Back to ontology</a>
+
+<h1>Coverage of the Scenario Space</h1>
+
+<p>The {{ scenario_count }} scenario(s) cover {{ covered_count }} out of
+{{ voxel_count }} cells of the scenario space. Each cell shows how many scenarios
+cover it.</p>
+
+<img src="coverage.svg" alt="Coverage heatmap of the scenario space">
+
+<h2>Most Overlapping Scenarios</h2>
+{% if pairs %}
+<p>The {{ pairs|length }} pair(s) of scenarios with the highest Jaccard index of
+their volumetrics.</p>
+
+<table>
+<tr><th>Scenario</th><th>Scenario</th><th>Shared cells</th><th>Jaccard index</th></tr>
+{% for pair in pairs %}{#
+#}<tr><td><a href="{{ pair.first.url|e }}">{{ pair.first.title|e }}</a></td>{#
+#}<td><a href="{{ pair.second.url|e }}">{{ pair.second.title|e }}</a></td>{#
+#}<td class="number">{{ pair.shared }}</td>{#
+#}<td class="number">{{ pair.jaccard }}</td></tr>
+{% endfor %}</table>
+{% else %}
+<p>No two scenarios overlap.</p>
+{% endif %}
+</body>
+</html>
+"""
+)
+
+# Served in place of the ontology while the scenarios are rendered on request.
+# The page reloads once the ontology has been rendered.
+PENDING_ONTOLOGY_HTML_TPL = jinja2.Template(
+    """\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Ontology</title>
+<script>
+{{ live_reload_script }}</script>
+<style type="text/css">
+body {
+    font-family: sans-serif;
+    margin: 2em;
+}
+</style>
+</head>
+<body>
+<h1>Scenarios</h1>
+
+<p>The ontology is still being rendered. The {{ scenarios|length }} scenario(s) are
+rendered as you open them.</p>
+
+<ul>
+{% for scenario in scenarios %}{#
+#}<li><a href="{{ scenario.url|e }}">{{ scenario.identifier|e }}</a></li>
+{% endfor %}</ul>
+</body>
+</html>
+"""
+)
+
+# The index is sharded by the leading characters of the terms (see
+# ``rasaeco.search``) so that the page loads only the shards of the query.
+SEARCH_HTML_TPL = jinja2.Template(
+    """\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Search</title>
+<script>
+{{ live_reload_script }}</script>
+<style type="text/css">
+body {
+    font-family: sans-serif;
+    margin: 2em;
+}
+#query {
+    width: 30em;
+    font-size: large;
+}
+#status {
+    color: #888;
+}
+</style>
+</head>
+<body>
+<a href="ontology.html">Back to ontology</a>
+
+<h1>Search</h1>
+
+<input id="query" type="search" placeholder="Search the scenarios" autofocus>
+<p id="status"></p>
+<ol id="results"></ol>
+
+<script type="text/javascript">
+(function () {
+    var INDEX_DIR = "{{ index_dir }}";
+    var PREFIX_LENGTH = {{ prefix_length }};
+    var MIN_TERM_LENGTH = {{ min_term_length }};
+    var MAX_RESULTS = 50;
+
+    var query = document.getElementById("query");
+    var status = document.getElementById("status");
+    var results = document.getElementById("results");
+
+    var documents = null;
+
+    // Shard key → promise of the shard
+    var shards = {};
+
+    function fetchJson(url) {
+        return fetch(url).then(function (response) {
+            if (response.status === 404) {
+                return {};
+            }
+            if (!response.ok) {
+                throw new Error("Failed to fetch " + url + ": " + response.status);
+            }
+            return response.json();
+        });
+    }
+
+    function tokenize(text) {
+        var terms = text.toLowerCase().match(/[\\p{L}\\p{N}]+/gu) || [];
+        return terms.filter(function (term) {
+            return Array.from(term).length >= MIN_TERM_LENGTH;
+        });
+    }
+
+    function shardKey(term) {
+        return Array.from(term).slice(0, PREFIX_LENGTH).join("");
+    }
+
+    function shard(key) {
+        if (!(key in shards)) {
+            var hex = Array.from(new TextEncoder().encode(key)).map(function (byte) {
+                return (byte < 16 ? "0" : "") + byte.toString(16);
+            }).join("");
+
+            shards[key] = fetchJson(INDEX_DIR + "/shard-" + hex + ".json");
+        }
+        return shards[key];
+    }
+
+    // Sum the scores of the postings of the matching terms per document.
+    function score(terms, isPrefix) {
+        return Promise.all(terms.map(function (term) {
+            return shard(shardKey(term));
+        })).then(function (loaded) {
+            return terms.map(function (term, i) {
+                var scores = {};
+                var prefix = isPrefix && i === terms.length - 1;
+                Object.keys(loaded[i]).forEach(function (candidate) {
+                    if (candidate === term ||
+                            (prefix && candidate.lastIndexOf(term, 0) === 0)) {
+                        var postings = loaded[i][candidate];
+                        for (var j = 0; j + 1 < postings.length; j += 2) {
+                            scores[postings[j]] =
+                                (scores[postings[j]] || 0) + postings[j + 1];
+                        }
+                    }
+                });
+                return scores;
+            });
+        });
+    }
+
+    function show(matches, count) {
+        results.innerHTML = "";
+        matches.forEach(function (match) {
+            var document_ = documents[match.slot];
+            var item = document.createElement("li");
+            var link = document.createElement("a");
+            link.href = encodeURI(document_[0]) + "/scenario.html";
+            link.textContent = document_[1];
+            item.appendChild(link);
+            results.appendChild(item);
+        });
+        status.textContent = count + " scenario(s) found.";
+    }
+
+    var latest = 0;
+
+    function search() {
+        var text = query.value;
+        var terms = tokenize(text);
+        var generation = ++latest;
+
+        if (terms.length === 0) {
+            results.innerHTML = "";
+            status.textContent = "";
+            return;
+        }
+
+        // The last term is still being typed so that we match it as a prefix.
+        var isPrefix = /[\\p{L}\\p{N}]$/u.test(text);
+
+        score(terms, isPrefix).then(function (perTerm) {
+            if (generation !== latest) {
+                return;
+            }
+
+            // All the terms need to match.
+            var matches = [];
+            Object.keys(perTerm[0]).forEach(function (slot) {
+                var total = 0;
+                for (var i = 0; i < perTerm.length; i++) {
+                    if (!(slot in perTerm[i])) {
+                        return;
+                    }
+                    total += perTerm[i][slot];
+                }
+                if (documents[slot]) {
+                    matches.push({slot: slot, score: total});
+                }
+            });
+
+            matches.sort(function (a, b) {
+                return b.score - a.score || a.slot - b.slot;
+            });
+            show(matches.slice(0, MAX_RESULTS), matches.length);
+        }).catch(function (error) {
+            status.textContent = error.message;
+        });
+    }
+
+    status.textContent = "Loading the index...";
+    fetchJson(INDEX_DIR + "/documents.json").then(function (data) {
+        documents = data.documents || [];
+        status.textContent = "";
+        query.addEventListener("input", search);
+        search();
+    }).catch(function (error) {
+        status.textContent = error.message +
+            " The search needs the pages to be served over HTTP.";
+    });
+})();
+</script>
+</body>
+</html>
+"""
+)
+
+GLOSSARY_HTML_TPL = jinja2.Template(
+    """\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Glossary</title>
+<script>
+{{ live_reload_script }}</script>
+<style type="text/css">
+body {
+    font-family: sans-serif;
+    margin: 2em;
+}
+table {
+    border-collapse: collapse;
+}
+th, td {
+    padding: 0.2em 0.8em;
+    border-bottom: 1px solid #ccc;
+    text-align: left;
+    vertical-align: top;
+}
+td.kind {
+    color: #555555;
+}
+</style>
+</head>
+<body>
+<a href="ontology.html">Back to ontology</a>
+
+<h1>Glossary</h1>
+
+{% if entries %}
+<p>The {{ entries|length }} definition(s) of all the scenarios together with
+the scenarios referencing them.</p>
+
+{% set groups = entries|groupby("initial") %}
+<p>{% for group in groups %}{#
+#}<a href="#initial-{{ loop.index }}">{{ group.grouper|e }}</a>{#
+#}{% if not loop.last %} {% endif %}{#
+#}{% endfor %}</p>
+
+{% for group in groups %}
+<h2><a name="initial-{{ loop.index }}">{{ group.grouper|e }}</a></h2>
+<table>
+<tr><th>Name</th><th>Kind</th><th>Defined in</th><th>Referenced from</th></tr>
+{% for entry in group.list %}{#
+#}<tr><td><a href="{{ entry.url|e }}">{{ entry.name|e }}</a></td>{#
+#}<td class="kind">{{ entry.kind|e }}</td>{#
+#}<td>{{ entry.title|e }}</td>{#
+#}<td>{% for referrer in entry.referrers %}{#
+#}<a href="{{ referrer.url|e }}">{{ referrer.title|e }}</a>{#
+#}{% if not loop.last %}, {% endif %}{#
+#}{% endfor %}</td></tr>
+{% endfor %}</table>
+{% endfor %}
+{% else %}
+<p>No scenario defines anything.</p>
+{% endif %}
+</body>
+</html>
+"""
+)
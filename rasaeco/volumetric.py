@@ -0,0 +1,468 @@
+"""Render the volumetric of a scenario as a 3D voxel plot in SVG and PNG."""
+import dataclasses
+import io
+import xml.sax.saxutils
+from typing import Iterable, List, Sequence, Tuple, Union
+
+import PIL.Image
+import PIL.ImageDraw
+import PIL.ImageFont
+import icontract
+import numpy as np
+
+import rasaeco.model
+
+#: Shape of the voxel grid as (phases, levels, aspects)
+SHAPE = (
+    len(rasaeco.model.PHASES),
+    len(rasaeco.model.LEVELS),
+    len(rasaeco.model.ASPECTS),
+)
+
+# The camera is placed like in the default view of a 3D plot: azimuth -60° and
+# elevation 30°. The camera thus sees the faces pointing in +x, -y and +z direction.
+_AZIMUTH = np.radians(-60.0)
+_ELEVATION = np.radians(30.0)
+
+# Unit vector pointing from the scene towards the camera
+_TOWARDS_CAMERA = np.array(
+    [
+        np.cos(_ELEVATION) * np.cos(_AZIMUTH),
+        np.cos(_ELEVATION) * np.sin(_AZIMUTH),
+        np.sin(_ELEVATION),
+    ]
+)
+
+# Orthographic projection to the screen where x goes right and y goes down
+_PROJECTION = np.array(
+    [
+        [-np.sin(_AZIMUTH), np.sin(_ELEVATION) * np.cos(_AZIMUTH)],
+        [np.cos(_AZIMUTH), np.sin(_ELEVATION) * np.sin(_AZIMUTH)],
+        [0.0, -np.cos(_ELEVATION)],
+    ]
+)
+
+# The grid is stretched to a box with the aspect ratio 4:4:3 so that the 5 phases
+# do not look squeezed next to the 7 levels and 7 aspects.
+_SCALE = np.array([4.0 / SHAPE[0], 4.0 / SHAPE[1], 3.0 / SHAPE[2]])
+
+# Faces visible to the camera as (direction to the neighbour, corners, RGB fill).
+# The corners are given relative to the lower corner of the voxel.
+_FACES = [
+    (
+        (1, 0, 0),
+        np.array([[1, 0, 0], [1, 1, 0], [1, 1, 1], [1, 0, 1]]),
+        (22, 84, 127),
+    ),
+    (
+        (0, -1, 0),
+        np.array([[0, 0, 0], [1, 0, 0], [1, 0, 1], [0, 0, 1]]),
+        (27, 103, 156),
+    ),
+    (
+        (0, 0, 1),
+        np.array([[0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]]),
+        (31, 119, 180),
+    ),
+]
+
+# Panes behind the voxels as corners in grid coordinates
+_PANES = np.array(
+    [
+        # Bottom
+        [[0, 0, 0], [SHAPE[0], 0, 0], [SHAPE[0], SHAPE[1], 0], [0, SHAPE[1], 0]],
+        # Back
+        [
+            [0, SHAPE[1], 0],
+            [SHAPE[0], SHAPE[1], 0],
+            [SHAPE[0], SHAPE[1], SHAPE[2]],
+            [0, SHAPE[1], SHAPE[2]],
+        ],
+        # Left
+        [[0, 0, 0], [0, SHAPE[1], 0], [0, SHAPE[1], SHAPE[2]], [0, 0, SHAPE[2]]],
+    ]
+)
+
+_PANE_FILL = (242, 242, 242)
+_GRID_STROKE = (204, 204, 204)
+_EDGE_STROKE = (0, 0, 0)
+
+_PHASE_COLOR = (0, 128, 0)
+_LEVEL_COLOR = (255, 0, 0)
+_ASPECT_COLOR = (0, 0, 255)
+
+
+# Number of bytes needed to store an occupancy mask
+_MASK_BYTES = (rasaeco.model.VOXEL_COUNT + 7) // 8
+
+
+@icontract.require(
+    lambda masks: all(0 <= mask < (1 << rasaeco.model.VOXEL_COUNT) for mask in masks)
+)
+@icontract.ensure(lambda masks, result: result.shape == (len(masks),) + SHAPE)
+def unpack(masks: Sequence[int]) -> np.ndarray:
+    """
+    Convert the occupancy masks to boolean voxel grids.
+
+    Return the grids stacked as (masks × phases × levels × aspects).
+    """
+    data = b"".join(mask.to_bytes(_MASK_BYTES, byteorder="little") for mask in masks)
+
+    bits = np.unpackbits(
+        np.frombuffer(data, dtype=np.uint8).reshape(len(masks), _MASK_BYTES),
+        axis=1,
+        bitorder="little",
+    )
+
+    return bits[:, : rasaeco.model.VOXEL_COUNT].astype(bool).reshape((-1,) + SHAPE)
+
+
+def occupancy(scenario: rasaeco.model.Scenario) -> np.ndarray:
+    """Compute the boolean voxel grid (phases × levels × aspects) of the scenario."""
+    result = unpack(masks=[scenario.occupancy])[0]
+    assert result.shape == SHAPE
+    return result
+
+
+def count(mask: int) -> int:
+    """Count the occupied voxels of the mask."""
+    return bin(mask).count("1")
+
+
+def union(masks: Iterable[int]) -> int:
+    """Compute the mask of the voxels occupied by any of the masks."""
+    result = 0
+    for mask in masks:
+        result |= mask
+
+    return result
+
+
+def intersection(masks: Iterable[int]) -> int:
+    """Compute the mask of the voxels occupied by all the masks, if any."""
+    result = (1 << rasaeco.model.VOXEL_COUNT) - 1
+    for mask in masks:
+        result &= mask
+
+    return result
+
+
+def overlap(masks: Sequence[int], other_masks: Sequence[int]) -> np.ndarray:
+    """
+    Count the voxels shared by each pair of masks.
+
+    Return the counts as a matrix (masks × other masks).
+    """
+    # The sums of products of booleans count the shared voxels.
+    return np.matmul(
+        unpack(masks=masks).reshape(len(masks), -1).astype(np.int32),
+        unpack(masks=other_masks).reshape(len(other_masks), -1).T.astype(np.int32),
+    )
+
+
+def jaccard(masks: Sequence[int], other_masks: Sequence[int]) -> np.ndarray:
+    """
+    Compute the Jaccard index for each pair of masks.
+
+    Two empty masks are deemed to have the index 0.
+
+    Return the indices as a matrix (masks × other masks).
+    """
+    shared = overlap(masks=masks, other_masks=other_masks)
+
+    counts = np.array([count(mask) for mask in masks], dtype=np.int32)
+    other_counts = np.array([count(mask) for mask in other_masks], dtype=np.int32)
+
+    united = counts[:, None] + other_counts[None, :] - shared
+
+    return np.divide(
+        shared,
+        united,
+        out=np.zeros(shared.shape, dtype=np.float64),
+        where=united > 0,
+    )
+
+
+@dataclasses.dataclass
+class Label:
+    """Represent a text placed on the plot."""
+
+    x: float
+    y: float
+    text: str
+    color: Tuple[int, int, int]
+    size: float
+
+    #: Either "start", "middle" or "end" as in SVG
+    anchor: str
+
+
+@dataclasses.dataclass
+class Plot:
+    """Represent a projected voxel plot ready to be drawn."""
+
+    width: int
+    height: int
+
+    #: Quadrilaterals as an array (polygon, corner, x/y) in pixels, back to front
+    polygons: np.ndarray
+
+    #: Fill of each polygon
+    fills: List[Tuple[int, int, int]]
+
+    #: Stroke of each polygon
+    strokes: List[Tuple[int, int, int]]
+
+    labels: List[Label]
+
+
+def _to_screen(points: np.ndarray) -> np.ndarray:
+    """Project the points given in grid coordinates (..., 3) to the screen (..., 2)."""
+    return (points * _SCALE) @ _PROJECTION
+
+
+@icontract.require(lambda voxels: voxels.shape == SHAPE)
+def project(voxels: np.ndarray, width: int, height: int, thumbnail: bool) -> Plot:
+    """
+    Project the voxel grid to a plot of the given size in pixels.
+
+    The full plot labels every phase, level and aspect, while the ``thumbnail``
+    only names the axes.
+    """
+    ##
+    # Collect the visible faces
+    ##
+
+    filled = np.argwhere(voxels)
+    padded = np.pad(voxels, 1)
+
+    face_corners = []  # type: List[np.ndarray]
+    face_depths = []  # type: List[np.ndarray]
+    face_fills = []  # type: List[Tuple[int, int, int]]
+
+    for direction, corners, fill in _FACES:
+        neighbours = padded[
+            filled[:, 0] + 1 + direction[0],
+            filled[:, 1] + 1 + direction[1],
+            filled[:, 2] + 1 + direction[2],
+        ]
+        exposed = filled[~neighbours]
+
+        face_corners.append(exposed[:, np.newaxis, :] + corners[np.newaxis, :, :])
+        face_depths.append(((exposed + 0.5) * _SCALE) @ _TOWARDS_CAMERA)
+        face_fills.extend([fill] * len(exposed))
+
+    all_corners = np.concatenate(face_corners) if face_corners else np.zeros((0, 4, 3))
+    depths = np.concatenate(face_depths) if face_depths else np.zeros((0,))
+
+    # Painter's algorithm: the voxels are regular so that drawing the faces ordered
+    # by the depth of their voxels gives the correct occlusion.
+    order = np.argsort(depths, kind="stable")
+
+    ##
+    # Fit the bounding box of the grid to the canvas
+    ##
+
+    box = np.array(
+        [[x, y, z] for x in (0, SHAPE[0]) for y in (0, SHAPE[1]) for z in (0, SHAPE[2])]
+    )
+    box_screen = _to_screen(box)
+    box_min = box_screen.min(axis=0)
+    box_max = box_screen.max(axis=0)
+
+    # Leave space for the labels
+    if thumbnail:
+        margin_left, margin_right, margin_top, margin_bottom = 0.02, 0.3, 0.02, 0.2
+    else:
+        margin_left, margin_right, margin_top, margin_bottom = 0.2, 0.26, 0.04, 0.12
+
+    available = np.array(
+        [
+            width * (1.0 - margin_left - margin_right),
+            height * (1.0 - margin_top - margin_bottom),
+        ]
+    )
+    scale = float(np.min(available / (box_max - box_min)))
+    offset = (
+        np.array([width * margin_left, height * margin_top])
+        + (available - (box_max - box_min) * scale) / 2.0
+        - box_min * scale
+    )
+
+    def to_canvas(points: np.ndarray) -> np.ndarray:
+        """Project the points in grid coordinates to the canvas in pixels."""
+        return _to_screen(points) * scale + offset
+
+    ##
+    # Compose the plot
+    ##
+
+    grid_lines = []  # type: List[np.ndarray]
+    for x in range(1, SHAPE[0]):
+        grid_lines.append(np.array([[x, 0, 0], [x, SHAPE[1], 0]]))
+        grid_lines.append(np.array([[x, SHAPE[1], 0], [x, SHAPE[1], SHAPE[2]]]))
+    for y in range(1, SHAPE[1]):
+        grid_lines.append(np.array([[0, y, 0], [SHAPE[0], y, 0]]))
+        grid_lines.append(np.array([[0, y, 0], [0, y, SHAPE[2]]]))
+    for z in range(1, SHAPE[2]):
+        grid_lines.append(np.array([[0, 0, z], [0, SHAPE[1], z]]))
+        grid_lines.append(np.array([[0, SHAPE[1], z], [SHAPE[0], SHAPE[1], z]]))
+
+    # Grid lines are drawn as degenerate quadrilaterals so that all the shapes
+    # can be kept in a single array.
+    grid_quads = np.stack(grid_lines)[:, [0, 1, 1, 0], :]
+
+    polygons = np.concatenate(
+        [
+            to_canvas(_PANES.astype(float)),
+            to_canvas(grid_quads.astype(float)),
+            to_canvas(all_corners[order].astype(float)),
+        ]
+    )
+
+    fills = (
+        [_PANE_FILL] * len(_PANES)
+        + [_GRID_STROKE] * len(grid_quads)
+        + [face_fills[i] for i in order]
+    )
+
+    strokes = (
+        [_GRID_STROKE] * len(_PANES)
+        + [_GRID_STROKE] * len(grid_quads)
+        + [_EDGE_STROKE] * len(order)
+    )
+
+    labels = []  # type: List[Label]
+    if thumbnail:
+        size = height * 0.13
+
+        x, y = to_canvas(np.array([SHAPE[0] / 2.0, -0.5, 0.0]))
+        labels.append(Label(x, y + size, "Phases", _PHASE_COLOR, size, "middle"))
+
+        x, y = to_canvas(np.array([SHAPE[0] + 0.5, SHAPE[1] / 2.0, 0.0]))
+        labels.append(Label(x, y + size, "Levels", _LEVEL_COLOR, size, "start"))
+
+        # The aspects are aligned to the right border as the label is the longest.
+        _, y = to_canvas(np.array([SHAPE[0], SHAPE[1], SHAPE[2] / 2.0]))
+        labels.append(Label(width - 1.0, y, "Aspects", _ASPECT_COLOR, size, "end"))
+    else:
+        size = height * 0.03
+
+        for i, phase in enumerate(rasaeco.model.PHASES):
+            x, y = to_canvas(np.array([i + 0.5, -0.6, 0.0]))
+            labels.append(Label(x, y + size, phase, _PHASE_COLOR, size, "end"))
+
+        for i, level in enumerate(rasaeco.model.LEVELS):
+            x, y = to_canvas(np.array([SHAPE[0] + 0.6, i + 0.5, 0.0]))
+            labels.append(Label(x, y + size, level, _LEVEL_COLOR, size, "start"))
+
+        for i, aspect in enumerate(rasaeco.model.ASPECTS):
+            x, y = to_canvas(np.array([SHAPE[0], SHAPE[1] + 0.6, i + 0.5]))
+            labels.append(
+                Label(x, y + size / 2.0, aspect, _ASPECT_COLOR, size, "start")
+            )
+
+    return Plot(
+        width=width,
+        height=height,
+        polygons=polygons,
+        fills=fills,
+        strokes=strokes,
+        labels=labels,
+    )
+
+
+def _hex(color: Tuple[int, int, int]) -> str:
+    """Represent the color in the hexadecimal notation."""
+    return "#{:02x}{:02x}{:02x}".format(*color)
+
+
+def to_svg(plot: Plot) -> str:
+    """Represent the plot as an SVG document."""
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" version="1.1" '
+        f'width="{plot.width}" height="{plot.height}" '
+        f'viewBox="0 0 {plot.width} {plot.height}">\n'
+    ]
+
+    coordinates = np.round(plot.polygons, 2)
+    for polygon, fill, stroke in zip(coordinates, plot.fills, plot.strokes):
+        points = " ".join(f"{x:g},{y:g}" for x, y in polygon)
+        parts.append(
+            f'<polygon points="{points}" fill="{_hex(fill)}" '
+            f'stroke="{_hex(stroke)}" stroke-width="0.5" stroke-linejoin="round"/>\n'
+        )
+
+    for label in plot.labels:
+        parts.append(
+            f'<text x="{label.x:.2f}" y="{label.y:.2f}" '
+            f'font-family="sans-serif" font-size="{label.size:.2f}" '
+            f'text-anchor="{label.anchor}" fill="{_hex(label.color)}">'
+            f"{xml.sax.saxutils.escape(label.text)}</text>\n"
+        )
+
+    parts.append("</svg>\n")
+
+    return "".join(parts)
+
+
+# The polygons are rasterized at a larger size and then downsampled to smooth
+# the edges as PIL does not anti-alias the polygons.
+_SUPERSAMPLING = 4
+
+
+def _font(
+    size: float,
+) -> Union[PIL.ImageFont.ImageFont, PIL.ImageFont.FreeTypeFont]:
+    """Load the default font of the given size, if the version of PIL allows."""
+    try:
+        return PIL.ImageFont.load_default(size=size)
+    except TypeError:
+        return PIL.ImageFont.load_default()
+
+
+def to_png(plot: Plot) -> bytes:
+    """Rasterize the plot to a PNG image."""
+    image = PIL.Image.new(
+        "RGB",
+        (plot.width * _SUPERSAMPLING, plot.height * _SUPERSAMPLING),
+        (255, 255, 255),
+    )
+    draw = PIL.ImageDraw.Draw(image)
+
+    coordinates = plot.polygons * _SUPERSAMPLING
+    for polygon, fill, stroke in zip(coordinates, plot.fills, plot.strokes):
+        points = [(float(x), float(y)) for x, y in polygon]
+        draw.polygon(points, fill=fill)
+        draw.line(points + [points[0]], fill=stroke, width=max(1, _SUPERSAMPLING // 2))
+
+    image = image.resize(
+        (plot.width, plot.height), resample=PIL.Image.Resampling.LANCZOS
+    )
+
+    # The text is drawn after downsampling so that it remains legible.
+    # The anchors are computed manually since the bitmap fonts do not support them.
+    draw = PIL.ImageDraw.Draw(image)
+    for label in plot.labels:
+        font = _font(size=label.size)
+
+        x = label.x
+        if label.anchor == "middle":
+            x -= draw.textlength(label.text, font=font) / 2.0
+        elif label.anchor == "end":
+            x -= draw.textlength(label.text, font=font)
+
+        draw.text((x, label.y - label.size), label.text, fill=label.color, font=font)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@icontract.require(lambda suffix: suffix.lower() in [".svg", ".png"])
+def encode(plot: Plot, suffix: str) -> bytes:
+    """Encode the plot as SVG or PNG depending on the file ``suffix``."""
+    if suffix.lower() == ".svg":
+        return to_svg(plot=plot).encode("utf-8")
+
+    return to_png(plot=plot)
@@ -1,7 +1,9 @@
 """Perform integration tests."""
 import io
+import json
 import os
 import pathlib
+import pstats
 import queue
 import shutil
 import tempfile
@@ -36,6 +38,31 @@ class TestOnSamples(unittest.TestCase):
             self.assertEqual("", stderr.getvalue())
             self.assertEqual(exit_code, 0)
 
+    def test_render_once_in_parallel(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+
+        scenarios_dir = this_dir.parent.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = os.path.join(tmp_dir, "sample_scenarios")
+
+            shutil.copytree(src=str(scenarios_dir), dst=tmp_scenarios_dir)
+
+            argv = ["once", "--scenarios_dir", tmp_scenarios_dir, "--jobs", "2"]
+
+            stdout = io.StringIO()
+            stderr = io.StringIO()
+
+            exit_code = rasaeco.pyrasaeco_render.run(
+                argv=argv, stdout=stdout, stderr=stderr
+            )
+
+            self.assertEqual("", stderr.getvalue())
+            self.assertEqual(exit_code, 0)
+
+            for pth in pathlib.Path(tmp_scenarios_dir).glob("**/scenario.md"):
+                self.assertTrue((pth.parent / "scenario.html").exists(), str(pth))
+
     def test_continuously(self) -> None:
         this_dir = pathlib.Path(os.path.realpath(__file__)).parent
 
@@ -71,6 +98,41 @@ class TestOnSamples(unittest.TestCase):
             # This is merely a smoke test.
             self.assertEqual("", stderr.getvalue())
 
+    def test_continuously_with_measurements(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+
+        scenarios_dir = this_dir.parent.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(os.path.join(tmp_dir, "sample_scenarios"))
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            profile = pathlib.Path(tmp_dir) / "profile.prof"
+            trace = pathlib.Path(tmp_dir) / "trace.json"
+
+            stdout = io.StringIO()
+            stderr = io.StringIO()
+
+            stop = queue.Queue()  # type: queue.Queue[bool]
+            worker_thread = threading.Thread(
+                target=rasaeco.pyrasaeco_render._render_continuously,
+                args=(stdout, stderr, tmp_scenarios_dir, stop),
+                kwargs={"profile": profile, "trace": trace},
+            )
+            worker_thread.start()
+            try:
+                time.sleep(2)
+            finally:
+                stop.put(True)
+                worker_thread.join()
+
+            self.assertEqual("", stderr.getvalue())
+
+            # The measurements of the initial rendering are stored.
+            pstats.Stats(str(profile))
+            events = json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]
+            self.assertIn("html", [event["name"] for event in events])
+
 
 if __name__ == "__main__":
     unittest.main()
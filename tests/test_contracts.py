@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import icontract
+
+import rasaeco.contracts
+import rasaeco.model
+
+
+class TestContracts(unittest.TestCase):
+    def test_that_the_contracts_are_checked_in_the_tests(self) -> None:
+        self.assertTrue(
+            rasaeco.contracts.ENABLED,
+            f"The tests need to be run without "
+            f"{rasaeco.contracts.FAST_ENVIRONMENT_VARIABLE}=1",
+        )
+
+        with self.assertRaises(icontract.ViolationError):
+            rasaeco.model.AspectRange(first="cost", last="as-planned")
+
+    def test_that_the_contracts_are_skipped_in_fast_mode(self) -> None:
+        env = os.environ.copy()
+        env[rasaeco.contracts.FAST_ENVIRONMENT_VARIABLE] = "1"
+
+        # The contracts are disabled on import so we need a separate process.
+        subprocess.check_call(
+            [
+                sys.executable,
+                "-c",
+                "import rasaeco.model; "
+                "rasaeco.model.AspectRange(first='cost', last='as-planned')",
+            ],
+            env=env,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import itertools
+import unittest
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+import rasaeco.coverage
+import rasaeco.model
+import rasaeco.volumetric
+
+
+def _mask(*voxels: int) -> int:
+    result = 0
+    for voxel in voxels:
+        result |= 1 << int(voxel)
+
+    return result
+
+
+class TestCoverage(unittest.TestCase):
+    def test_count(self) -> None:
+        coverage = rasaeco.coverage.count(masks=[_mask(0, 1), _mask(1), 0])
+
+        self.assertEqual(rasaeco.volumetric.SHAPE, coverage.shape)
+        self.assertEqual(1, coverage[0, 0, 0])
+        self.assertEqual(2, coverage[0, 0, 1])
+        self.assertEqual(3, int(coverage.sum()))
+
+    def test_most_overlapping_against_brute_force(self) -> None:
+        random = np.random.RandomState(seed=0)
+        masks = [
+            _mask(*random.choice(rasaeco.model.VOXEL_COUNT, size=5, replace=False))
+            for _ in range(40)
+        ] + [0, 0]
+
+        jaccard = rasaeco.volumetric.jaccard(masks=masks, other_masks=masks)
+        shared = rasaeco.volumetric.overlap(masks=masks, other_masks=masks)
+
+        expected = sorted(
+            [
+                (-jaccard[i, j], -shared[i, j], i, j)
+                for i, j in itertools.combinations(range(len(masks)), 2)
+                if shared[i, j] > 0
+            ]
+        )[:10]
+
+        pairs = rasaeco.coverage.most_overlapping(masks=masks, limit=10)
+
+        self.assertListEqual(
+            [(i, j) for _, _, i, j in expected],
+            [(pair.first, pair.second) for pair in pairs],
+        )
+
+        for pair in pairs:
+            self.assertEqual(shared[pair.first, pair.second], pair.shared)
+            self.assertAlmostEqual(jaccard[pair.first, pair.second], pair.jaccard)
+
+    def test_that_disjoint_masks_do_not_overlap(self) -> None:
+        self.assertListEqual(
+            [], rasaeco.coverage.most_overlapping(masks=[_mask(0), _mask(1)], limit=5)
+        )
+
+    def test_to_svg(self) -> None:
+        coverage = rasaeco.coverage.count(masks=[_mask(0, 1), _mask(1)])
+
+        root = ET.fromstring(rasaeco.coverage.to_svg(coverage=coverage))
+        self.assertEqual(
+            rasaeco.model.VOXEL_COUNT,
+            len(root.findall("{http://www.w3.org/2000/svg}rect")),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import os
+import pathlib
+import shutil
+import tempfile
+import unittest
+from typing import List
+
+import rasaeco.dependency
+import rasaeco.glossary
+import rasaeco.meta
+import rasaeco.model
+import rasaeco.render
+
+
+def _summary(
+    title: str, references: List[rasaeco.dependency.Reference]
+) -> rasaeco.dependency.Summary:
+    """Summarize a scenario with only the title and the references."""
+    return rasaeco.dependency.Summary(
+        digest="",
+        meta=rasaeco.meta.Meta(title=title, contact="", relations=[], volumetric=[]),
+        definitions=rasaeco.model.Definitions(
+            model_set=set(), def_set=set(), test_set=set(), acceptance_set=set()
+        ),
+        references=references,
+        relation_targets=set(),
+        validated=True,
+    )
+
+
+def _reference(tag: str, scenario_id: str, name: str) -> rasaeco.dependency.Reference:
+    """Create a reference without the element text."""
+    return rasaeco.dependency.Reference(
+        tag=tag, scenario_id=scenario_id, name=name, element_text=""
+    )
+
+
+class TestIndex(unittest.TestCase):
+    def test_that_the_referrers_are_listed_once_in_order(self) -> None:
+        summaries = {
+            "b": _summary(
+                title="B",
+                references=[
+                    _reference(tag="ref", scenario_id="a", name="x"),
+                    _reference(tag="modelref", scenario_id="a", name="m"),
+                    _reference(tag="ref", scenario_id="a", name="y"),
+                    _reference(tag="ref", scenario_id="a", name="x"),
+                    _reference(tag="scenarioref", scenario_id="a", name="a"),
+                ],
+            ),
+            "a": _summary(
+                title="A",
+                references=[_reference(tag="ref", scenario_id="a", name="x")],
+            ),
+            "c": _summary(
+                title="C",
+                references=[_reference(tag="ref", scenario_id="a", name="x")],
+            ),
+        }
+
+        backlinks_map = rasaeco.glossary.index(summaries=summaries)
+
+        self.assertEqual(["a"], list(backlinks_map))
+        self.assertDictEqual(
+            {
+                ("def", "x"): [("b", "B"), ("c", "C")],
+                ("model", "m"): [("b", "B")],
+                ("def", "y"): [("b", "B")],
+            },
+            {
+                key: [(referrer.identifier, referrer.title) for referrer in referrers]
+                for key, referrers in backlinks_map["a"].items()
+            },
+        )
+
+
+class TestGlossary(unittest.TestCase):
+    def test_that_the_backlinks_are_rendered(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+
+            glossary = (tmp_scenarios_dir / "glossary.html").read_text(encoding="utf-8")
+            self.assertIn(
+                '<a href="scaffolding/scenario.html#def-misplaced_scaffold">'
+                "misplaced scaffold</a>",
+                glossary,
+            )
+            self.assertIn('<a href="z_dummy_scenario/scenario.html">', glossary)
+
+            # The model and the definition of the scaffolding are referenced.
+            html_pth = tmp_scenarios_dir / "scaffolding" / "scenario.html"
+            self.assertEqual(
+                2,
+                html_pth.read_text(encoding="utf-8").count(
+                    'Referenced from: <a href="../z_dummy_scenario/scenario.html">'
+                ),
+            )
+
+            # Removing a reference re-renders the page of the referenced scenario.
+            scenario_pth = tmp_scenarios_dir / "z_dummy_scenario" / "scenario.md"
+            scenario_pth.write_text(
+                scenario_pth.read_text(encoding="utf-8").replace(
+                    '<ref name="scaffolding#misplaced_scaffold"/>s',
+                    "misplaced scaffolds",
+                ),
+                encoding="utf-8",
+            )
+
+            errors = rasaeco.render.once(
+                scenarios_dir=tmp_scenarios_dir, changed=[scenario_pth]
+            )
+            self.assertEqual([], errors)
+
+            self.assertEqual(
+                1,
+                html_pth.read_text(encoding="utf-8").count(
+                    'Referenced from: <a href="../z_dummy_scenario/scenario.html">'
+                ),
+            )
+
+    def test_that_the_backlinks_are_quoted(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            (tmp_scenarios_dir / "grüezi").mkdir()
+            (tmp_scenarios_dir / "grüezi" / "scenario.md").write_text(
+                "<rasaeco-meta>\n"
+                "{\n"
+                '    "title": "Grüezi",\n'
+                '    "contact": "someone",\n'
+                '    "relations": [],\n'
+                '    "volumetric": []\n'
+                "}\n"
+                "</rasaeco-meta>\n\n"
+                'Beware of the <ref name="scaffolding#misplaced_scaffold" />.\n',
+                encoding="utf-8",
+            )
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+
+            glossary = (tmp_scenarios_dir / "glossary.html").read_text(encoding="utf-8")
+            self.assertIn('<a href="gr%C3%BCezi/scenario.html">', glossary)
+
+            html_pth = tmp_scenarios_dir / "scaffolding" / "scenario.html"
+            self.assertIn(
+                'Referenced from: <a href="../gr%C3%BCezi/scenario.html">Grüezi</a>',
+                html_pth.read_text(encoding="utf-8"),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,341 @@
+import os
+import pathlib
+import shutil
+import tempfile
+import unittest
+from typing import Dict, Tuple
+
+import rasaeco
+import rasaeco.dependency
+import rasaeco.manifest
+import rasaeco.plot_cache
+import rasaeco.render
+
+
+class TestIncremental(unittest.TestCase):
+    def test_that_unchanged_artefacts_are_skipped(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            report = rasaeco.manifest.Report()
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir, report=report)
+            self.assertEqual([], errors)
+            self.assertEqual([], report.skipped)
+
+            report = rasaeco.manifest.Report()
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir, report=report)
+            self.assertEqual([], errors)
+            self.assertEqual([], report.rendered)
+
+            # Change only the body of a scenario
+            pth = tmp_scenarios_dir / "z_dummy_scenario" / "scenario.md"
+            pth.write_text(
+                pth.read_text(encoding="utf-8") + "\n\nmodified", encoding="utf-8"
+            )
+
+            report = rasaeco.manifest.Report()
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir, report=report)
+            self.assertEqual([], errors)
+            self.assertEqual(
+                [pathlib.Path("z_dummy_scenario/scenario.html")],
+                [pth.relative_to(tmp_scenarios_dir) for pth in report.rendered],
+            )
+
+    def test_that_the_stages_are_timed(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            report = rasaeco.manifest.Report()
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir, report=report)
+            self.assertEqual([], errors)
+
+            self.assertListEqual(
+                [
+                    "intermediate",
+                    "references",
+                    "ontology",
+                    "plots",
+                    "ontology_page",
+                    "coverage",
+                    "glossary",
+                    "search",
+                    "html",
+                ],
+                list(report.timings),
+            )
+            self.assertTrue(all(seconds >= 0.0 for seconds in report.timings.values()))
+
+    def test_that_rendering_anew_leaves_the_artefacts_untouched(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            cache_dir = tmp_scenarios_dir / rasaeco.manifest.CACHE_DIR
+
+            def snapshot() -> Dict[pathlib.Path, Tuple[bytes, int]]:
+                return {
+                    pth: (pth.read_bytes(), pth.stat().st_mtime_ns)
+                    for pth in tmp_scenarios_dir.glob("**/*")
+                    if pth.is_file() and cache_dir not in pth.parents
+                }
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+
+            before = snapshot()
+
+            # Render everything anew
+            shutil.rmtree(str(cache_dir))
+
+            report = rasaeco.manifest.Report()
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir, report=report)
+            self.assertEqual([], errors)
+            self.assertEqual([], report.skipped)
+
+            self.assertDictEqual(before, snapshot())
+
+    def test_that_everything_is_rendered_anew_by_another_version(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+
+            version = rasaeco.__version__
+            rasaeco.__version__ = version + ".post1"
+            try:
+                report = rasaeco.manifest.Report()
+                errors = rasaeco.render.once(
+                    scenarios_dir=tmp_scenarios_dir, report=report
+                )
+                self.assertEqual([], errors)
+            finally:
+                rasaeco.__version__ = version
+
+            self.assertEqual([], report.skipped)
+
+    def test_that_the_graph_of_another_version_is_discarded(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+
+            graph, note = rasaeco.dependency.load(scenarios_dir=tmp_scenarios_dir)
+            self.assertIsNone(note)
+            self.assertIn("scaffolding", graph.summaries)
+
+            version = rasaeco.__version__
+            rasaeco.__version__ = version + ".post1"
+            try:
+                graph, note = rasaeco.dependency.load(scenarios_dir=tmp_scenarios_dir)
+                self.assertIsNotNone(note)
+                self.assertEqual(dict(), graph.summaries)
+
+                # The scenarios are parsed and validated anew.
+                report = rasaeco.manifest.Report()
+                errors = rasaeco.render.once(
+                    scenarios_dir=tmp_scenarios_dir, report=report
+                )
+                self.assertEqual([], errors)
+                self.assertFalse(
+                    any(
+                        explanation.startswith("Skipping the validation")
+                        for explanation in report.explanations
+                    )
+                )
+            finally:
+                rasaeco.__version__ = version
+
+    def test_that_plots_are_rendered_anew_when_the_style_changes(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+
+            style = rasaeco.plot_cache.STYLE
+            rasaeco.plot_cache.STYLE = style + 1
+            try:
+                report = rasaeco.manifest.Report()
+                errors = rasaeco.render.once(
+                    scenarios_dir=tmp_scenarios_dir, report=report
+                )
+                self.assertEqual([], errors)
+            finally:
+                rasaeco.plot_cache.STYLE = style
+
+            self.assertEqual(
+                [],
+                [pth for pth in report.skipped if pth.name.startswith("volumetric")],
+            )
+            self.assertIn(
+                tmp_scenarios_dir / "scaffolding" / "volumetric_thumb.svg",
+                report.rendered,
+            )
+
+    def test_that_intermediate_xml_is_written_only_on_demand(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+            self.assertEqual([], list(tmp_scenarios_dir.glob("**/scenario.xml")))
+
+            # The scenarios did not change, but the XML is still expected.
+            errors = rasaeco.render.once(
+                scenarios_dir=tmp_scenarios_dir, write_xml=True
+            )
+            self.assertEqual([], errors)
+            self.assertEqual(
+                sorted(pth.parent for pth in tmp_scenarios_dir.glob("**/scenario.md")),
+                sorted(pth.parent for pth in tmp_scenarios_dir.glob("**/scenario.xml")),
+            )
+
+    def test_that_cancelled_rendering_renders_nothing_more(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            report = rasaeco.manifest.Report()
+            errors = rasaeco.render.once(
+                scenarios_dir=tmp_scenarios_dir,
+                report=report,
+                should_cancel=lambda: True,
+            )
+            self.assertEqual([], errors)
+            self.assertTrue(report.cancelled)
+            self.assertEqual([], report.rendered)
+
+            report = rasaeco.manifest.Report()
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir, report=report)
+            self.assertEqual([], errors)
+            self.assertFalse(report.cancelled)
+            self.assertEqual([], report.skipped)
+
+    def test_that_only_changed_paths_are_rendered(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+
+            # Add a new scenario
+            shutil.copytree(
+                src=str(tmp_scenarios_dir / "z_dummy_scenario"),
+                dst=str(tmp_scenarios_dir / "extra_scenario"),
+                ignore=shutil.ignore_patterns("*.html", "*.png", "*.svg"),
+            )
+            extra_pth = tmp_scenarios_dir / "extra_scenario" / "scenario.md"
+
+            report = rasaeco.manifest.Report()
+            errors = rasaeco.render.once(
+                scenarios_dir=tmp_scenarios_dir, report=report, changed=[extra_pth]
+            )
+            self.assertEqual([], errors)
+
+            # The page of the scaffolding lists the new scenario as referencing
+            # its definitions.
+            self.assertEqual(
+                {"extra_scenario", "scaffolding", "."},
+                {
+                    pth.parent.relative_to(tmp_scenarios_dir).as_posix()
+                    for pth in report.rendered
+                },
+            )
+            self.assertEqual(
+                [], [pth for pth in report.skipped if "z_dummy_scenario" in str(pth)]
+            )
+
+            # Move the new scenario, leaving its artefacts behind
+            moved_pth = tmp_scenarios_dir / "moved_scenario" / "scenario.md"
+            moved_pth.parent.mkdir()
+            extra_pth.rename(moved_pth)
+
+            report = rasaeco.manifest.Report()
+            errors = rasaeco.render.once(
+                scenarios_dir=tmp_scenarios_dir,
+                report=report,
+                changed=[extra_pth, moved_pth],
+            )
+            self.assertEqual([], errors)
+            self.assertEqual([], list(extra_pth.parent.iterdir()))
+            self.assertTrue((moved_pth.parent / "scenario.html").exists())
+            self.assertTrue((moved_pth.parent / "volumetric.svg").exists())
+
+            # The text artefacts are compressed next to them.
+            self.assertTrue((moved_pth.parent / "scenario.html.gz").exists())
+            self.assertTrue((moved_pth.parent / "volumetric.svg.gz").exists())
+            self.assertFalse((moved_pth.parent / "volumetric.png.gz").exists())
+
+    def test_that_referencing_scenarios_are_revalidated(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+
+            # Remove the definition referenced from the other, unchanged scenario
+            pth = tmp_scenarios_dir / "scaffolding" / "scenario.md"
+            pth.write_text(
+                pth.read_text(encoding="utf-8").replace(
+                    '<def name="misplaced_scaffold">', '<def name="renamed_scaffold">'
+                ),
+                encoding="utf-8",
+            )
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertTrue(
+                any(
+                    "z_dummy_scenario" in error and "misplaced_scaffold" in error
+                    for error in errors
+                ),
+                str(errors),
+            )
+
+            # The errors must persist even though nothing changed in the meanwhile.
+            self.assertEqual(
+                errors, rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
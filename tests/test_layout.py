@@ -0,0 +1,73 @@
+import pathlib
+import tempfile
+import unittest
+
+import numpy as np
+
+import rasaeco.layout
+
+
+class TestLayout(unittest.TestCase):
+    def test_that_force_directed_layout_is_deterministic(self) -> None:
+        edges = [(0, 1), (1, 2), (2, 0), (3, 4)]
+
+        positions = rasaeco.layout.force_directed(node_count=5, edges=edges)
+        self.assertEqual((5, 2), positions.shape)
+        self.assertTrue(np.all(np.isfinite(positions)))
+
+        other_positions = rasaeco.layout.force_directed(node_count=5, edges=edges)
+        self.assertTrue(np.array_equal(positions, other_positions))
+
+    def test_that_related_nodes_are_closer(self) -> None:
+        # Two triangles which are not related to each other
+        edges = [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3)]
+
+        positions = rasaeco.layout.force_directed(node_count=6, edges=edges)
+
+        def distance(i: int, j: int) -> float:
+            return float(np.linalg.norm(positions[i] - positions[j]))
+
+        within = max(distance(i, j) for i, j in edges)
+        between = min(distance(i, j) for i in range(3) for j in range(3, 6))
+        self.assertLess(within, between)
+
+    def test_cluster(self) -> None:
+        positions = rasaeco.layout.force_directed(
+            node_count=100, edges=[(i, i + 1) for i in range(99)]
+        )
+
+        clusters = rasaeco.layout.cluster(positions=positions)
+        self.assertEqual((100,), clusters.shape)
+
+        # There are at most as many clusters as the cells in the grid.
+        self.assertLessEqual(len(set(clusters.tolist())), 16)
+        self.assertListEqual(
+            list(range(len(set(clusters.tolist())))), sorted(set(clusters.tolist()))
+        )
+
+    def test_that_layout_is_cached_for_the_same_graph(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = pathlib.Path(tmp_dir) / "layout.json"
+
+            edges = [(0, 1), (1, 2)]
+            key = rasaeco.layout.key(node_count=3, edges=edges)
+            self.assertIsNone(rasaeco.layout.fetch(path=path, key=key, node_count=3))
+
+            positions = rasaeco.layout.force_directed(node_count=3, edges=edges)
+            self.assertIsNone(
+                rasaeco.layout.store(path=path, key=key, positions=positions)
+            )
+
+            fetched = rasaeco.layout.fetch(path=path, key=key, node_count=3)
+            assert fetched is not None
+            self.assertTrue(np.array_equal(positions, fetched))
+
+            other_key = rasaeco.layout.key(node_count=3, edges=[(0, 1)])
+            self.assertNotEqual(key, other_key)
+            self.assertIsNone(
+                rasaeco.layout.fetch(path=path, key=other_key, node_count=3)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
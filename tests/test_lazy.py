@@ -0,0 +1,245 @@
+import http.client
+import io
+import os
+import pathlib
+import shutil
+import tempfile
+import threading
+import unittest
+from typing import Dict, List, Optional
+
+import rasaeco.lazy
+import rasaeco.pyrasaeco_render
+import rasaeco.render
+
+
+class TestLazy(unittest.TestCase):
+    def test_that_pages_are_rendered_on_request_as_in_full(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            renderer = rasaeco.lazy.Renderer(scenarios_dir=tmp_scenarios_dir)
+
+            pages = dict()  # type: Dict[str, bytes]
+            for identifier in ["scaffolding", "z_dummy_scenario"]:
+                page, errors = renderer.fetch(url_path=f"/{identifier}/scenario.html")
+                self.assertEqual([], errors)
+                assert page is not None
+                pages[identifier] = page
+
+                # Only the plots are written.
+                directory = tmp_scenarios_dir / identifier
+                self.assertFalse((directory / "scenario.html").exists())
+                self.assertTrue((directory / "volumetric.svg").exists())
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+
+            # The scaffolding lists the dummy scenario as referencing its definitions
+            # only once the dependency graph is known; see below.
+            pth = tmp_scenarios_dir / "z_dummy_scenario" / "scenario.html"
+            self.assertEqual(pth.read_bytes(), pages["z_dummy_scenario"])
+
+            for identifier in pages:
+                # The rendered page is up-to-date now.
+                self.assertEqual(
+                    (None, []), renderer.fetch(url_path=f"/{identifier}/scenario.html")
+                )
+
+            # Touching a scenario without changing it keeps its page up-to-date.
+            scenario_pth = tmp_scenarios_dir / "scaffolding" / "scenario.md"
+            html_pth = scenario_pth.parent / "scenario.html"
+            html_stat = html_pth.stat()
+            os.utime(
+                str(scenario_pth),
+                ns=(html_stat.st_atime_ns, html_stat.st_mtime_ns + 1_000_000_000),
+            )
+
+            self.assertEqual(
+                (None, []), renderer.fetch(url_path="/scaffolding/scenario.html")
+            )
+
+            # The backlinks are taken from the dependency graph of the last rendering.
+            expected = html_pth.read_bytes()
+            html_pth.unlink()
+
+            page, errors = renderer.fetch(url_path="/scaffolding/scenario.html")
+            self.assertEqual([], errors)
+            assert page is not None
+            self.assertEqual(expected, page)
+            self.assertNotEqual(pages["scaffolding"], page)
+
+            # The page is stale once the scenario changes.
+            scenario_pth = tmp_scenarios_dir / "z_dummy_scenario" / "scenario.md"
+            scenario_pth.write_text(
+                scenario_pth.read_text(encoding="utf-8") + "\n\nmodified",
+                encoding="utf-8",
+            )
+
+            page, errors = renderer.fetch(url_path="/z_dummy_scenario/scenario.html")
+            self.assertEqual([], errors)
+            assert page is not None
+            self.assertIn(b"modified", page)
+
+    def test_that_stale_plots_are_rendered_on_request(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+
+            renderer = rasaeco.lazy.Renderer(scenarios_dir=tmp_scenarios_dir)
+
+            plot_pth = tmp_scenarios_dir / "scaffolding" / "volumetric.svg"
+            before = plot_pth.read_bytes()
+
+            # The plot is up-to-date after the full rendering.
+            self.assertEqual(
+                (None, []), renderer.fetch(url_path="/scaffolding/volumetric.svg")
+            )
+
+            scenario_pth = tmp_scenarios_dir / "scaffolding" / "scenario.md"
+            scenario_pth.write_text(
+                scenario_pth.read_text(encoding="utf-8").replace(
+                    '"phase_from": "construction"', '"phase_from": "planning"'
+                ),
+                encoding="utf-8",
+            )
+
+            self.assertEqual(
+                (None, []), renderer.fetch(url_path="/scaffolding/volumetric.svg")
+            )
+            after = plot_pth.read_bytes()
+            self.assertNotEqual(before, after)
+
+            # The plot rendered on request is not rendered again.
+            calls = []  # type: List[str]
+            original = rasaeco.render.render_on_request
+
+            def render_on_request(**kwargs):  # type: ignore
+                calls.append(kwargs["identifier"])
+                return original(**kwargs)
+
+            rasaeco.render.render_on_request = render_on_request  # type: ignore
+            try:
+                self.assertEqual(
+                    (None, []), renderer.fetch(url_path="/scaffolding/volumetric.svg")
+                )
+            finally:
+                rasaeco.render.render_on_request = original  # type: ignore
+
+            self.assertEqual([], calls)
+
+            # The full rendering produces the same plot.
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+            self.assertEqual(after, plot_pth.read_bytes())
+
+    def test_that_a_scenario_is_rendered_once_at_a_time(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            renderer = rasaeco.lazy.Renderer(scenarios_dir=tmp_scenarios_dir)
+
+            calls = []  # type: List[str]
+            original = rasaeco.render.render_on_request
+
+            def render_on_request(**kwargs):  # type: ignore
+                calls.append(kwargs["identifier"])
+                return original(**kwargs)
+
+            pages = []  # type: List[Optional[bytes]]
+
+            def fetch() -> None:
+                page, _ = renderer.fetch(url_path="/scaffolding/scenario.html")
+                pages.append(page)
+
+            rasaeco.render.render_on_request = render_on_request  # type: ignore
+            try:
+                threads = [threading.Thread(target=fetch) for _ in range(4)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            finally:
+                rasaeco.render.render_on_request = original  # type: ignore
+
+            self.assertEqual(["scaffolding"], calls)
+            self.assertEqual(4, len(pages))
+            self.assertEqual(1, len(set(pages)))
+            self.assertIsNotNone(pages[0])
+
+    def test_that_the_server_renders_on_request(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            server = rasaeco.pyrasaeco_render.ThreadedServer(
+                port=0,
+                scenarios_dir=tmp_scenarios_dir,
+                stdout=io.StringIO(),
+                stderr=io.StringIO(),
+                lazy=rasaeco.lazy.Renderer(scenarios_dir=tmp_scenarios_dir),
+            )
+
+            with server:
+                connection = http.client.HTTPConnection(
+                    "localhost", server.port, timeout=5.0
+                )
+                try:
+                    # The scenarios are listed while the ontology is missing.
+                    connection.request("GET", "/")
+                    response = connection.getresponse()
+                    self.assertEqual(200, response.status)
+                    self.assertIn(b"scaffolding/scenario.html", response.read())
+
+                    for path in [
+                        "/scaffolding/scenario.html",
+                        "/scaffolding/volumetric_thumb.png",
+                    ]:
+                        connection.request("GET", path)
+                        response = connection.getresponse()
+                        self.assertEqual(200, response.status, path)
+                        self.assertGreater(len(response.read()), 0)
+                finally:
+                    connection.close()
+
+    def test_resolve(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        renderer = rasaeco.lazy.Renderer(scenarios_dir=scenarios_dir)
+
+        self.assertEqual(
+            ("scaffolding", "volumetric.svg"),
+            renderer.resolve(url_path="/scaffolding/volumetric.svg?reload=1"),
+        )
+        self.assertIsNone(renderer.resolve(url_path="/ontology.html"))
+        self.assertIsNone(renderer.resolve(url_path="/scaffolding/scenario.md"))
+        self.assertIsNone(renderer.resolve(url_path="/does_not_exist/scenario.html"))
+        self.assertIsNone(renderer.resolve(url_path="/scenario.html"))
+
+        # The URL paths can not escape the scenarios directory.
+        self.assertEqual(
+            ("scaffolding", "scenario.html"),
+            renderer.resolve(url_path="/../../scaffolding/scenario.html"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
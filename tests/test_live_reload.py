@@ -0,0 +1,68 @@
+import pathlib
+import unittest
+
+import rasaeco.live_reload
+
+
+class TestPages(unittest.TestCase):
+    def test_that_artefacts_are_mapped_to_the_pages_showing_them(self) -> None:
+        scenarios_dir = pathlib.Path("/some/scenarios")
+
+        pages = rasaeco.live_reload.pages(
+            scenarios_dir=scenarios_dir,
+            rendered=[
+                scenarios_dir / "ontology.html",
+                scenarios_dir / "ontology.dot",
+                scenarios_dir / "coverage.svg",
+                scenarios_dir / "group/some_scenario/scenario.html",
+                scenarios_dir / "another_scenario/volumetric.svg",
+                scenarios_dir / "another_scenario/volumetric_thumb.png",
+                pathlib.Path("/somewhere/else/scenario.html"),
+            ],
+        )
+
+        self.assertListEqual(
+            [
+                "/another_scenario/scenario.html",
+                "/coverage.html",
+                "/group/some_scenario/scenario.html",
+                "/ontology.html",
+            ],
+            pages,
+        )
+
+
+class TestHub(unittest.TestCase):
+    def test_that_pages_are_dispatched_to_all_subscriptions(self) -> None:
+        hub = rasaeco.live_reload.Hub()
+
+        first = hub.subscribe()
+        second = hub.subscribe()
+
+        hub.publish([])
+        hub.publish(["/ontology.html"])
+
+        hub.unsubscribe(second)
+        hub.publish(["/some_scenario/scenario.html"])
+
+        self.assertListEqual(["/ontology.html"], first.get_nowait())
+        self.assertListEqual(["/some_scenario/scenario.html"], first.get_nowait())
+        self.assertTrue(first.empty())
+
+        self.assertListEqual(["/ontology.html"], second.get_nowait())
+        self.assertTrue(second.empty())
+
+    def test_that_closing_releases_the_subscriptions(self) -> None:
+        hub = rasaeco.live_reload.Hub()
+
+        subscription = hub.subscribe()
+        hub.close()
+
+        self.assertIsNone(subscription.get_nowait())
+
+        # Subscriptions after the closing are released immediately.
+        self.assertIsNone(hub.subscribe().get_nowait())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import pathlib
+import tempfile
+import unittest
+import unittest.mock
+
+import rasaeco.intermediate
+import rasaeco.markdown_cache
+
+
+class TestMarkdownCache(unittest.TestCase):
+    def test_that_unchanged_markdown_is_not_converted_again(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenario_pth = (
+            this_dir.parent / "sample_scenarios" / "scaffolding" / "scenario.md"
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_dir = pathlib.Path(tmp_dir)
+
+            (
+                intermediate,
+                errors,
+            ) = rasaeco.intermediate.render_scenario_to_intermediate(
+                scenario_path=scenario_pth, markdown_cache_dir=cache_dir
+            )
+            self.assertEqual([], errors)
+            assert intermediate is not None
+            self.assertEqual(1, len(list(cache_dir.glob("*.html"))))
+
+            with unittest.mock.patch(
+                "marko.convert", side_effect=AssertionError("Unexpected conversion")
+            ):
+                (
+                    cached_intermediate,
+                    errors,
+                ) = rasaeco.intermediate.render_scenario_to_intermediate(
+                    scenario_path=scenario_pth, markdown_cache_dir=cache_dir
+                )
+
+            self.assertEqual([], errors)
+            assert cached_intermediate is not None
+            self.assertEqual(intermediate.text, cached_intermediate.text)
+            self.assertEqual(
+                intermediate.definitions.def_set,
+                cached_intermediate.definitions.def_set,
+            )
+
+    def test_that_key_depends_on_version(self) -> None:
+        key = rasaeco.markdown_cache.key(body="some body")
+
+        with unittest.mock.patch("rasaeco.__version__", "0.0.0-other"):
+            self.assertNotEqual(key, rasaeco.markdown_cache.key(body="some body"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+
+import rasaeco.meta
+
+
+class TestFindMeta(unittest.TestCase):
+    def test_that_the_block_is_found(self) -> None:
+        text = "# Title\n<rasaeco-meta>\n{}\n</rasaeco-meta>\nBody\n"
+
+        meta_range, errors = rasaeco.meta.find_meta(text=text)
+        self.assertListEqual([], errors)
+        assert meta_range is not None
+
+        self.assertEqual(
+            "<rasaeco-meta>", text[meta_range.block_start : meta_range.text_start]
+        )
+        self.assertEqual("\n{}\n", text[meta_range.text_start : meta_range.text_end])
+        self.assertEqual("</rasaeco-meta>\nBody\n", text[meta_range.text_end :])
+
+    def test_errors(self) -> None:
+        for text, expected in [
+            ("</rasaeco-meta>", "No opening <rasaeco-meta> could be found."),
+            ("<rasaeco-meta>", "No closing </rasaeco-meta> could be found."),
+            (
+                "</rasaeco-meta>\n<rasaeco-meta>",
+                "Opening <rasaeco-meta> comes after closing </rasaeco-meta>.",
+            ),
+        ]:
+            meta_range, errors = rasaeco.meta.find_meta(text=text)
+            self.assertIsNone(meta_range)
+            self.assertListEqual([expected], errors)
+
+
+class TestExtractMeta(unittest.TestCase):
+    def test_that_the_line_of_the_json_error_is_reported(self) -> None:
+        text = "# Title\n\n<rasaeco-meta>\n{\n  oops\n}\n</rasaeco-meta>\n"
+
+        meta, errors = rasaeco.meta.extract_meta(text=text)
+        self.assertIsNone(meta)
+        self.assertEqual(1, len(errors))
+        self.assertTrue(
+            errors[0].startswith(
+                "Failed to parse the JSON in <rasaeco-meta> at line 5: "
+            ),
+            errors[0],
+        )
+
+    def test_that_a_valid_meta_is_extracted(self) -> None:
+        text = (
+            "<rasaeco-meta>\n"
+            '{"title": "T", "contact": "C",\n'
+            ' "relations": [{"target": "other", "nature": "refines"}],\n'
+            ' "volumetric": [{\n'
+            '   "aspect_from": "as-planned", "aspect_to": "cost",\n'
+            '   "phase_from": "planning", "phase_to": "operation",\n'
+            '   "level_from": "zone", "level_to": "zone"}]}\n'
+            "</rasaeco-meta>\n"
+        )
+
+        meta, errors = rasaeco.meta.extract_meta(text=text)
+        self.assertListEqual([], errors)
+        assert meta is not None
+
+        self.assertEqual("T", meta["title"])
+        self.assertEqual("cost", meta["volumetric"][0]["aspect_to"])
+
+    def test_that_all_the_errors_are_reported_with_line_numbers(self) -> None:
+        text = (
+            "# Title\n"
+            "<rasaeco-meta>\n"
+            "{\n"
+            '  "title": 1,\n'
+            '  "relations": [{"target": "other", "oops": "refines"}],\n'
+            '  "volumetric": [\n'
+            "    {\n"
+            '      "aspect_from": "cost", "aspect_to": "as-planned",\n'
+            '      "phase_from": "planning", "phase_to": "operation",\n'
+            '      "level_from": "zone", "level_to": "nowhere"\n'
+            "    }\n"
+            "  ]\n"
+            "}\n"
+            "</rasaeco-meta>\n"
+        )
+
+        meta, errors = rasaeco.meta.extract_meta(text=text)
+        self.assertIsNone(meta)
+        self.assertListEqual(
+            [
+                "Missing key 'contact' in meta at line 2: "
+                "expected keys are: ['title', 'contact', 'relations', 'volumetric']",
+                "Invalid meta['title'] at line 4: expected a string, but got a number",
+                "Unexpected key 'oops' in meta['relations'][0] at line 5: "
+                "expected keys are: ['target', 'nature']",
+                "Missing key 'nature' in meta['relations'][0] at line 5: "
+                "expected keys are: ['target', 'nature']",
+                "Invalid aspect range in cubelet 1 at line 8: "
+                "Invalid aspect range: 'cost' comes after 'as-planned'.",
+                "Invalid level range in cubelet 1 at line 10: "
+                "Unexpected end of a level range: 'nowhere'; possible levels are: "
+                "['device/person', 'machine/crew', 'zone', 'site', 'office', "
+                "'company', 'network']",
+            ],
+            errors,
+        )
+
+    def test_that_a_non_object_is_reported_at_the_opening_tag(self) -> None:
+        text = "# Title\n\n<rasaeco-meta>\n[]\n</rasaeco-meta>\n"
+
+        meta, errors = rasaeco.meta.extract_meta(text=text)
+        self.assertIsNone(meta)
+        self.assertListEqual(
+            ["Invalid meta at line 3: expected an object, but got an array"], errors
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import pathlib
+import tempfile
+import unittest
+from typing import List
+
+import rasaeco.plot_cache
+
+
+class TestPlotCache(unittest.TestCase):
+    def test_key(self) -> None:
+        occupancy = 0
+        other_occupancy = 1 << 42
+
+        keys = {
+            rasaeco.plot_cache.key(occupancy=occupancy, variant="full", suffix=".svg"),
+            rasaeco.plot_cache.key(occupancy=occupancy, variant="thumb", suffix=".svg"),
+            rasaeco.plot_cache.key(occupancy=occupancy, variant="full", suffix=".png"),
+            rasaeco.plot_cache.key(
+                occupancy=other_occupancy, variant="full", suffix=".svg"
+            ),
+        }
+        self.assertEqual(4, len(keys))
+
+    def test_that_plot_is_produced_only_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            directory = pathlib.Path(tmp_dir) / "plots"
+
+            produced = []  # type: List[bool]
+
+            def produce() -> bytes:
+                produced.append(True)
+                return b"some plot"
+
+            for name in ["first.svg", "second.svg"]:
+                error = rasaeco.plot_cache.fetch_or_produce(
+                    directory=directory,
+                    key="some-key.svg",
+                    path=pathlib.Path(tmp_dir) / name,
+                    produce=produce,
+                )
+                self.assertIsNone(error)
+
+            self.assertEqual(1, len(produced))
+            for name in ["first.svg", "second.svg"]:
+                self.assertEqual(
+                    b"some plot", (pathlib.Path(tmp_dir) / name).read_bytes()
+                )
+
+    def test_that_using_a_plot_leaves_the_linked_plots_untouched(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            directory = pathlib.Path(tmp_dir) / "plots"
+
+            first = pathlib.Path(tmp_dir) / "first.svg"
+            error = rasaeco.plot_cache.fetch_or_produce(
+                directory=directory,
+                key="some-key.svg",
+                path=first,
+                produce=lambda: b"some plot",
+            )
+            self.assertIsNone(error)
+
+            os.utime(str(first), (1000, 1000))
+
+            error = rasaeco.plot_cache.fetch_or_produce(
+                directory=directory,
+                key="some-key.svg",
+                path=pathlib.Path(tmp_dir) / "second.svg",
+                produce=lambda: b"some plot",
+            )
+            self.assertIsNone(error)
+
+            self.assertEqual(1000, first.stat().st_mtime)
+
+            # The use is still recorded for the eviction.
+            other = directory / "other-key.svg"
+            other.write_bytes(b"x" * 9)
+            os.utime(str(other), (2000, 2000))
+
+            removed = rasaeco.plot_cache.evict(directory=directory, limit=9)
+            self.assertEqual([directory / "other-key.svg"], removed)
+
+    def test_that_least_recently_used_plots_are_evicted(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            directory = pathlib.Path(tmp_dir)
+
+            for i, name in enumerate(["old.svg", "middle.svg", "new.svg"]):
+                pth = directory / name
+                pth.write_bytes(b"x" * 10)
+                os.utime(str(pth), (1000 + i, 1000 + i))
+
+            removed = rasaeco.plot_cache.evict(directory=directory, limit=20)
+
+            self.assertEqual([directory / "old.svg"], removed)
+            self.assertEqual(
+                ["middle.svg", "new.svg"],
+                sorted(pth.name for pth in directory.iterdir()),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
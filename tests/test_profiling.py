@@ -0,0 +1,129 @@
+import json
+import unittest
+from typing import List
+
+import rasaeco.profiling
+
+
+def _double(value: int) -> int:
+    return 2 * value
+
+
+class TestProfiling(unittest.TestCase):
+    def test_measure(self) -> None:
+        with rasaeco.profiling.measure(name="some-stage") as span:
+            sum(range(10000))
+
+        self.assertEqual("some-stage", span.name)
+        self.assertIsNone(span.scenario)
+        self.assertGreaterEqual(span.wall, 0.0)
+        self.assertGreaterEqual(span.cpu, 0.0)
+
+    def test_that_the_tasks_are_measured_in_order(self) -> None:
+        for jobs in [1, 2]:
+            spans = []  # type: List[rasaeco.profiling.Span]
+
+            results = rasaeco.profiling.map_in_order(
+                function=_double,
+                kwargs_list=[{"value": value} for value in range(5)],
+                jobs=jobs,
+                name="double",
+                scenarios=[f"scenario{value}" for value in range(5)],
+                spans=spans,
+            )
+
+            self.assertListEqual([0, 2, 4, 6, 8], results)
+            self.assertListEqual(
+                [f"scenario{value}" for value in range(5)],
+                [span.scenario for span in spans],
+            )
+            self.assertTrue(all(span.name == "double" for span in spans))
+
+    def test_report_and_trace(self) -> None:
+        spans = [
+            rasaeco.profiling.Span(
+                name="html",
+                scenario=None,
+                start=0.0,
+                wall=3.0,
+                cpu=2.0,
+                peak_memory=None,
+                pid=1,
+            ),
+            rasaeco.profiling.Span(
+                name="html",
+                scenario="fast/scenario.md",
+                start=0.0,
+                wall=1.0,
+                cpu=1.0,
+                peak_memory=1024 * 1024,
+                pid=2,
+            ),
+            rasaeco.profiling.Span(
+                name="html",
+                scenario="slow/scenario.md",
+                start=1.0,
+                wall=2.0,
+                cpu=1.0,
+                peak_memory=1024 * 1024,
+                pid=2,
+            ),
+        ]
+
+        report = rasaeco.profiling.format_report(spans=spans, limit=1)
+        self.assertEqual(
+            "Stages (wall time, CPU time, peak memory):\n"
+            "  html               3.000 s     2.000 s          n/a\n"
+            "The 1 slowest scenarios (wall time, CPU time):\n"
+            "      2.000 s     1.000 s  slow/scenario.md (html 2.000 s)",
+            report,
+        )
+
+        trace = json.loads(rasaeco.profiling.to_chrome_trace(spans=spans))
+        self.assertListEqual(
+            ["html", "html: fast/scenario.md", "html: slow/scenario.md"],
+            [event["name"] for event in trace["traceEvents"]],
+        )
+        self.assertEqual(1000000, trace["traceEvents"][2]["ts"])
+        self.assertEqual(2000000, trace["traceEvents"][2]["dur"])
+
+    def test_that_the_stages_are_reported_in_the_order_they_started(self) -> None:
+        # The nested stage ends, and is thus recorded, before the enclosing one.
+        spans = [
+            rasaeco.profiling.Span(
+                name="references",
+                scenario=None,
+                start=1.0,
+                wall=0.5,
+                cpu=0.5,
+                peak_memory=None,
+                pid=1,
+            ),
+            rasaeco.profiling.Span(
+                name="ontology",
+                scenario=None,
+                start=0.0,
+                wall=2.0,
+                cpu=2.0,
+                peak_memory=None,
+                pid=1,
+            ),
+        ]
+
+        report = rasaeco.profiling.format_report(spans=spans)
+        self.assertEqual(
+            "Stages (wall time, CPU time, peak memory):\n"
+            "  ontology           2.000 s     2.000 s          n/a\n"
+            "  references         0.500 s     0.500 s          n/a",
+            report,
+        )
+
+        trace = json.loads(rasaeco.profiling.to_chrome_trace(spans=spans))
+        self.assertListEqual(
+            ["ontology", "references"],
+            [event["name"] for event in trace["traceEvents"]],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import pathlib
+import unittest
+from typing import List
+
+import rasaeco.model
+import rasaeco.query
+
+
+def new_scenario(
+    identifier: str,
+    contact: str,
+    volumetric: List[rasaeco.model.Cubelet],
+    model_set: List[str],
+) -> rasaeco.model.Scenario:
+    return rasaeco.model.Scenario(
+        identifier=identifier,
+        title=identifier.replace("_", " ").title(),
+        contact=contact,
+        volumetric=volumetric,
+        definitions=rasaeco.model.Definitions(
+            model_set=set(model_set),
+            def_set=set(),
+            test_set=set(),
+            acceptance_set=set(),
+        ),
+        relative_path=pathlib.Path(identifier) / "scenario.md",
+    )
+
+
+def new_cubelet(
+    phases: str, levels: str, aspects: str = "as-planned"
+) -> rasaeco.model.Cubelet:
+    return rasaeco.model.Cubelet(
+        phase_range=rasaeco.model.PhaseRange(*phases.split("..")),
+        level_range=rasaeco.model.LevelRange(*levels.split("..")),
+        aspect_range=rasaeco.model.AspectRange(aspects, aspects),
+    )
+
+
+def new_index() -> rasaeco.query.Index:
+    scenarios = [
+        new_scenario(
+            identifier="crane",
+            contact="alice",
+            volumetric=[new_cubelet("construction..construction", "site..site")],
+            model_set=["crane", "load"],
+        ),
+        new_scenario(
+            identifier="planning",
+            contact="bob",
+            volumetric=[new_cubelet("planning..construction", "zone..office")],
+            model_set=["schedule"],
+        ),
+        new_scenario(
+            identifier="maintenance",
+            contact="alice",
+            volumetric=[new_cubelet("operation..operation", "device/person..zone")],
+            model_set=["load"],
+        ),
+    ]
+
+    relations = [
+        rasaeco.model.Relation(source="crane", target="planning", nature="refines"),
+        rasaeco.model.Relation(source="maintenance", target="crane", nature="uses"),
+        rasaeco.model.Relation(source="planning", target="crane", nature="uses"),
+    ]
+
+    return rasaeco.query.Index(
+        ontology=rasaeco.model.Ontology(scenarios=scenarios, relations=relations)
+    )
+
+
+class TestIndex(unittest.TestCase):
+    def test_touching(self) -> None:
+        index = new_index()
+
+        self.assertListEqual(
+            ["crane", "planning"],
+            index.touching(phase="construction", level="site").identifiers(),
+        )
+        self.assertListEqual(
+            ["maintenance"], index.touching(phase="operation").identifiers()
+        )
+        self.assertListEqual([], index.touching(aspect="cost").identifiers())
+        self.assertEqual(index.all(), index.touching())
+
+    def test_relations(self) -> None:
+        index = new_index()
+
+        self.assertListEqual(["refines", "uses"], index.natures())
+        self.assertListEqual(
+            ["maintenance", "planning"],
+            [relation.source for relation in index.relations("uses")],
+        )
+        self.assertListEqual(
+            ["planning", "maintenance"], index.sources("uses").identifiers()
+        )
+        self.assertListEqual(["crane"], index.targets("uses").identifiers())
+        self.assertListEqual([], index.relations("contradicts"))
+
+    def test_definitions_and_contacts(self) -> None:
+        index = new_index()
+
+        self.assertListEqual(
+            ["crane", "maintenance"], index.defining("model", "load").identifiers()
+        )
+        self.assertFalse(index.defining("test", "load"))
+        self.assertListEqual(
+            ["crane", "load", "schedule"], index.defined_names("model")
+        )
+
+        self.assertListEqual(["alice", "bob"], index.contacts())
+        self.assertListEqual(
+            ["crane", "maintenance"], index.by_contact("alice").identifiers()
+        )
+
+    def test_that_several_contacts_are_indexed_individually(self) -> None:
+        index = rasaeco.query.Index(
+            ontology=rasaeco.model.Ontology(
+                scenarios=[
+                    new_scenario(
+                        identifier="crane",
+                        contact="alice, carol",
+                        volumetric=[],
+                        model_set=[],
+                    ),
+                    new_scenario(
+                        identifier="planning",
+                        contact="carol",
+                        volumetric=[],
+                        model_set=[],
+                    ),
+                ],
+                relations=[],
+            )
+        )
+
+        self.assertListEqual(["alice", "carol"], index.contacts())
+        self.assertListEqual(["crane"], index.by_contact("alice").identifiers())
+        self.assertListEqual(
+            ["crane", "planning"], index.by_contact("carol").identifiers()
+        )
+        self.assertFalse(index.by_contact("alice, carol"))
+
+    def test_set_algebra(self) -> None:
+        index = new_index()
+
+        alice = index.by_contact("alice")
+        on_site = index.touching(level="site")
+
+        self.assertListEqual(["crane"], (alice & on_site).identifiers())
+        self.assertListEqual(
+            ["crane", "planning", "maintenance"], (alice | on_site).identifiers()
+        )
+        self.assertListEqual(["maintenance"], (alice - on_site).identifiers())
+        self.assertListEqual(
+            ["planning", "maintenance"], (alice ^ on_site).identifiers()
+        )
+        self.assertListEqual(["planning"], (~alice).identifiers())
+
+        self.assertEqual(2, len(alice))
+        self.assertIn("crane", alice)
+        self.assertNotIn("planning", alice)
+        self.assertNotIn("unknown", alice)
+        self.assertEqual(alice, index.select(["maintenance", "crane"]))
+
+        with self.assertRaises(ValueError):
+            _ = alice & new_index().all()
+
+
+if __name__ == "__main__":
+    unittest.main()
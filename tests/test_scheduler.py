@@ -0,0 +1,62 @@
+import pathlib
+import threading
+import time
+import unittest
+from typing import List, Optional, Set
+
+import rasaeco.scheduler
+
+
+class TestScheduler(unittest.TestCase):
+    def test_that_burst_is_coalesced_into_a_single_batch(self) -> None:
+        scheduler = rasaeco.scheduler.Scheduler(window=0.2)
+
+        batches = []  # type: List[Optional[Set[pathlib.Path]]]
+
+        def consume() -> None:
+            while True:
+                batch = scheduler.next_batch()
+                batches.append(batch)
+                if batch is None:
+                    return
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        try:
+            for name in ["a.md", "b.md", "a.md", "c.md"]:
+                scheduler.notify(pathlib.Path(name))
+                time.sleep(0.01)
+
+            self.assertTrue(scheduler.has_pending())
+
+            time.sleep(0.5)
+            self.assertFalse(scheduler.has_pending())
+        finally:
+            scheduler.stop()
+            consumer.join()
+
+        self.assertEqual(
+            [{pathlib.Path("a.md"), pathlib.Path("b.md"), pathlib.Path("c.md")}, None],
+            batches,
+        )
+
+    def test_that_stop_releases_the_waiting_thread(self) -> None:
+        scheduler = rasaeco.scheduler.Scheduler(window=10.0)
+        scheduler.notify(pathlib.Path("a.md"))
+
+        result = []  # type: List[Optional[Set[pathlib.Path]]]
+        consumer = threading.Thread(
+            target=lambda: result.append(scheduler.next_batch())
+        )
+        consumer.start()
+
+        scheduler.stop()
+        consumer.join(timeout=5.0)
+
+        self.assertFalse(consumer.is_alive())
+        self.assertEqual([None], result)
+        self.assertTrue(scheduler.has_pending())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+import json
+import os
+import pathlib
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Mapping
+
+import rasaeco.render
+import rasaeco.search
+
+
+def _search(scenarios_dir: pathlib.Path, term: str) -> List[str]:
+    """Look up the identifiers of the scenarios containing the term, best first."""
+    documents = json.loads(
+        rasaeco.search.documents_path(scenarios_dir=scenarios_dir).read_text(
+            encoding="utf-8"
+        )
+    )["documents"]
+
+    pth = rasaeco.search.shard_path(
+        scenarios_dir=scenarios_dir, key=rasaeco.search.shard_key(term)
+    )
+    if not pth.exists():
+        return []
+
+    postings = json.loads(pth.read_text(encoding="utf-8")).get(term, [])
+    return [documents[slot][0] for slot in postings[0::2]]
+
+
+def _shard_mtimes(scenarios_dir: pathlib.Path) -> Mapping[str, int]:
+    """Collect the modification times of the shards of the index."""
+    return {
+        pth.name: pth.stat().st_mtime_ns
+        for pth in (scenarios_dir / rasaeco.search.INDEX_DIR).glob("shard-*.json")
+    }
+
+
+class TestTerms(unittest.TestCase):
+    def test_tokenize(self) -> None:
+        self.assertListEqual(
+            ["reception", "platform", "über", "42"],
+            rasaeco.search.tokenize("Reception_platform, a Über-42!"),
+        )
+
+    def test_extract_terms(self) -> None:
+        root = ET.fromstring(
+            "<html><h1>Bridge</h1><p>A <def name='bridge_deck'>deck</def> "
+            "over the river.</p></html>"
+        )
+
+        terms = rasaeco.search.extract_terms(root=root, title="Bridge Inspection")
+
+        expected = {
+            "bridge": (
+                rasaeco.search.TITLE_WEIGHT
+                + rasaeco.search.HEADING_WEIGHT
+                + rasaeco.search.DEFINITION_WEIGHT
+                + rasaeco.search.TEXT_WEIGHT
+            ),
+            "inspection": rasaeco.search.TITLE_WEIGHT,
+            "deck": rasaeco.search.DEFINITION_WEIGHT + rasaeco.search.TEXT_WEIGHT,
+            "over": rasaeco.search.TEXT_WEIGHT,
+            "the": rasaeco.search.TEXT_WEIGHT,
+            "river": rasaeco.search.TEXT_WEIGHT,
+        }  # type: Dict[str, int]
+        self.assertDictEqual(expected, terms)
+
+
+class TestIndex(unittest.TestCase):
+    def test_that_the_sample_scenarios_are_indexed(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+
+            self.assertTrue((tmp_scenarios_dir / "search.html").exists())
+
+            found = _search(scenarios_dir=tmp_scenarios_dir, term="scaffolding")
+            self.assertEqual("scaffolding", found[0])
+
+    def test_that_the_index_is_updated_incrementally(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+
+            self.assertEqual([], _search(tmp_scenarios_dir, "zyzzyva"))
+            before = _shard_mtimes(scenarios_dir=tmp_scenarios_dir)
+
+            scenario_pth = tmp_scenarios_dir / "z_dummy_scenario" / "scenario.md"
+            scenario_pth.write_text(
+                scenario_pth.read_text(encoding="utf-8") + "\n\nzyzzyva\n",
+                encoding="utf-8",
+            )
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+
+            self.assertEqual(
+                ["z_dummy_scenario"], _search(tmp_scenarios_dir, "zyzzyva")
+            )
+
+            # Only the shards of the terms of the changed scenario are rewritten.
+            after = _shard_mtimes(scenarios_dir=tmp_scenarios_dir)
+            rewritten = {
+                name for name in after if before.get(name, None) != after[name]
+            }
+            self.assertIn(
+                rasaeco.search.shard_path(
+                    scenarios_dir=tmp_scenarios_dir, key="zy"
+                ).name,
+                rewritten,
+            )
+            self.assertLess(len(rewritten), len(after))
+
+    def test_that_a_removed_scenario_frees_its_slot(self) -> None:
+        this_dir = pathlib.Path(os.path.realpath(__file__)).parent
+        scenarios_dir = this_dir.parent / "sample_scenarios"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_scenarios_dir = pathlib.Path(tmp_dir) / "sample_scenarios"
+            shutil.copytree(src=str(scenarios_dir), dst=str(tmp_scenarios_dir))
+
+            # The sample scenarios relate to each other so that we add a scenario
+            # which can be removed without breaking the ontology.
+            (tmp_scenarios_dir / "zyzzyva").mkdir()
+            (tmp_scenarios_dir / "zyzzyva" / "scenario.md").write_text(
+                "<rasaeco-meta>\n"
+                "{\n"
+                '    "title": "Zyzzyva",\n'
+                '    "contact": "someone",\n'
+                '    "relations": [],\n'
+                '    "volumetric": []\n'
+                "}\n"
+                "</rasaeco-meta>\n\n"
+                "A weevil.\n",
+                encoding="utf-8",
+            )
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+            self.assertEqual(["zyzzyva"], _search(tmp_scenarios_dir, "weevil"))
+
+            shutil.rmtree(str(tmp_scenarios_dir / "zyzzyva"))
+
+            errors = rasaeco.render.once(scenarios_dir=tmp_scenarios_dir)
+            self.assertEqual([], errors)
+
+            self.assertEqual([], _search(tmp_scenarios_dir, "weevil"))
+
+            documents = json.loads(
+                rasaeco.search.documents_path(
+                    scenarios_dir=tmp_scenarios_dir
+                ).read_text(encoding="utf-8")
+            )["documents"]
+            self.assertNotIn(
+                "zyzzyva", [document[0] for document in documents if document]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,249 @@
+import contextlib
+import gzip
+import http.client
+import http.server
+import io
+import pathlib
+import socket
+import tempfile
+import threading
+import unittest
+from typing import Any, Iterator, List, Tuple
+
+import rasaeco.live_reload
+import rasaeco.output
+import rasaeco.pyrasaeco_render
+import rasaeco.serving
+
+
+@contextlib.contextmanager
+def _serving(
+    handler_class: Any, workers: int, max_pending: int
+) -> Iterator[Tuple[int, rasaeco.serving.PooledHTTPServer]]:
+    """Serve in a background thread and shut down on exit."""
+    server = rasaeco.serving.PooledHTTPServer(
+        ("localhost", 0), handler_class, workers=workers, max_pending=max_pending
+    )
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        yield server.server_address[1], server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = 5.0
+
+    # Set by the tests to block the requests to /barrier and /wait
+    barrier = None  # type: Any
+    release = threading.Event()
+
+    def log_message(self, format, *args):  # type: ignore
+        pass
+
+    def do_GET(self) -> None:
+        if self.path == "/barrier":
+            self.barrier.wait(timeout=5.0)
+        elif self.path == "/wait":
+            self.release.wait(timeout=5.0)
+
+        body = self.path.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestPooledHTTPServer(unittest.TestCase):
+    def test_that_the_connection_is_kept_alive(self) -> None:
+        with _serving(_Handler, workers=1, max_pending=0) as (port, _):
+            connection = http.client.HTTPConnection("localhost", port, timeout=5.0)
+            try:
+                for path in ["/first", "/second"]:
+                    connection.request("GET", path)
+                    response = connection.getresponse()
+                    self.assertEqual(200, response.status)
+                    self.assertEqual(path.encode("utf-8"), response.read())
+            finally:
+                connection.close()
+
+    def test_that_requests_are_handled_concurrently(self) -> None:
+        _Handler.barrier = threading.Barrier(3)
+
+        statuses = []  # type: List[int]
+
+        def get() -> None:
+            connection = http.client.HTTPConnection("localhost", port, timeout=5.0)
+            try:
+                connection.request("GET", "/barrier")
+                statuses.append(connection.getresponse().status)
+            finally:
+                connection.close()
+
+        with _serving(_Handler, workers=3, max_pending=0) as (port, _):
+            # The requests can only pass the barrier if they are handled at once.
+            threads = [threading.Thread(target=get) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertListEqual([200, 200, 200], statuses)
+
+    def test_that_connections_beyond_the_limits_are_turned_away(self) -> None:
+        _Handler.release.clear()
+
+        with _serving(_Handler, workers=1, max_pending=0) as (port, _):
+            busy = http.client.HTTPConnection("localhost", port, timeout=5.0)
+            busy.request("GET", "/wait")
+
+            try:
+                rejected = http.client.HTTPConnection("localhost", port, timeout=5.0)
+                try:
+                    rejected.request("GET", "/another")
+                    self.assertEqual(503, rejected.getresponse().status)
+                finally:
+                    rejected.close()
+            finally:
+                _Handler.release.set()
+                self.assertEqual(200, busy.getresponse().status)
+                busy.close()
+
+
+class TestThreadedServer(unittest.TestCase):
+    def test_that_event_streams_do_not_occupy_the_workers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            scenarios_dir = pathlib.Path(tmp_dir)
+            (scenarios_dir / "ontology.html").write_text("oi", encoding="utf-8")
+
+            hub = rasaeco.live_reload.Hub()
+            server = rasaeco.pyrasaeco_render.ThreadedServer(
+                port=0,
+                scenarios_dir=scenarios_dir,
+                stdout=io.StringIO(),
+                stderr=io.StringIO(),
+                hub=hub,
+                workers=1,
+                # The worker might not have been released yet when the next
+                # request arrives.
+                max_pending=1,
+            )
+
+            with server:
+                events = socket.create_connection(("localhost", server.port))
+                events.settimeout(5.0)
+                try:
+                    events.sendall(
+                        f"GET {rasaeco.live_reload.EVENTS_PATH} HTTP/1.1\r\n"
+                        f"Host: localhost\r\n\r\n".encode("utf-8")
+                    )
+
+                    header = b""
+                    while b"\r\n\r\n" not in header:
+                        header += events.recv(1024)
+                    self.assertTrue(header.startswith(b"HTTP/1.1 200"), header)
+
+                    # The only worker is still available to serve the pages.
+                    connection = http.client.HTTPConnection(
+                        "localhost", server.port, timeout=5.0
+                    )
+                    try:
+                        connection.request("GET", "/")
+                        response = connection.getresponse()
+                        self.assertEqual(200, response.status)
+                        self.assertEqual(b"oi", response.read())
+                    finally:
+                        connection.close()
+
+                    hub.publish(["/ontology.html"])
+
+                    data = header.split(b"\r\n\r\n", 1)[1]
+                    while b"\n\n" not in data:
+                        data += events.recv(1024)
+                    self.assertEqual(b'data: ["/ontology.html"]\n\n', data)
+                finally:
+                    events.close()
+
+    def test_that_unchanged_files_are_not_sent_again(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            scenarios_dir = pathlib.Path(tmp_dir)
+            pth = scenarios_dir / "ontology.html"
+            rasaeco.output.write_if_changed(pth, b"<html>oi</html>")
+
+            server = rasaeco.pyrasaeco_render.ThreadedServer(
+                port=0,
+                scenarios_dir=scenarios_dir,
+                stdout=io.StringIO(),
+                stderr=io.StringIO(),
+            )
+
+            with server:
+                connection = http.client.HTTPConnection(
+                    "localhost", server.port, timeout=5.0
+                )
+                try:
+                    connection.request("GET", "/ontology.html")
+                    response = connection.getresponse()
+                    self.assertEqual(200, response.status)
+                    self.assertIsNone(response.getheader("Content-Encoding"))
+                    self.assertEqual(b"<html>oi</html>", response.read())
+                    etag = response.getheader("ETag")
+                    self.assertIsNotNone(etag)
+
+                    connection.request(
+                        "GET",
+                        "/ontology.html",
+                        headers={"Accept-Encoding": "gzip, deflate"},
+                    )
+                    response = connection.getresponse()
+                    self.assertEqual(200, response.status)
+                    self.assertEqual("gzip", response.getheader("Content-Encoding"))
+                    self.assertEqual(
+                        b"<html>oi</html>", gzip.decompress(response.read())
+                    )
+                    compressed_etag = response.getheader("ETag")
+                    self.assertNotEqual(etag, compressed_etag)
+
+                    for headers in [
+                        {"If-None-Match": etag},
+                        {"If-None-Match": compressed_etag, "Accept-Encoding": "gzip"},
+                    ]:
+                        connection.request("GET", "/ontology.html", headers=headers)
+                        response = connection.getresponse()
+                        self.assertEqual(304, response.status)
+                        self.assertEqual(b"", response.read())
+
+                    # The entity tag follows the content.
+                    rasaeco.output.write_if_changed(pth, b"<html>tchau</html>")
+
+                    connection.request(
+                        "GET", "/ontology.html", headers={"If-None-Match": etag}
+                    )
+                    response = connection.getresponse()
+                    self.assertEqual(200, response.status)
+                    self.assertEqual(b"<html>tchau</html>", response.read())
+                    self.assertNotEqual(etag, response.getheader("ETag"))
+                finally:
+                    connection.close()
+
+
+class TestNegotiation(unittest.TestCase):
+    def test_matches(self) -> None:
+        self.assertTrue(rasaeco.serving.matches('"a", W/"b"', '"b"'))
+        self.assertTrue(rasaeco.serving.matches("*", '"b"'))
+        self.assertFalse(rasaeco.serving.matches('"a"', '"b"'))
+        self.assertFalse(rasaeco.serving.matches(None, '"b"'))
+
+    def test_accepts_gzip(self) -> None:
+        self.assertTrue(rasaeco.serving.accepts_gzip("deflate, gzip;q=0.5"))
+        self.assertFalse(rasaeco.serving.accepts_gzip("gzip;q=0"))
+        self.assertFalse(rasaeco.serving.accepts_gzip("br"))
+        self.assertFalse(rasaeco.serving.accepts_gzip(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
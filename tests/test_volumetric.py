@@ -0,0 +1,118 @@
+import io
+import pathlib
+import unittest
+import xml.etree.ElementTree as ET
+
+import PIL.Image
+import numpy as np
+
+import rasaeco.model
+import rasaeco.volumetric
+
+
+def _scenario_with_single_cubelet() -> rasaeco.model.Scenario:
+    return rasaeco.model.Scenario(
+        identifier="some_scenario",
+        title="Some Scenario",
+        contact="Some Contact",
+        volumetric=[
+            rasaeco.model.Cubelet(
+                aspect_range=rasaeco.model.AspectRange(
+                    first="as-planned", last="safety"
+                ),
+                phase_range=rasaeco.model.PhaseRange(
+                    first="construction", last="operation"
+                ),
+                level_range=rasaeco.model.LevelRange(first="site", last="site"),
+            )
+        ],
+        definitions=rasaeco.model.Definitions(
+            model_set=set(), def_set=set(), test_set=set(), acceptance_set=set()
+        ),
+        relative_path=pathlib.Path("some_scenario/scenario.md"),
+    )
+
+
+class TestVolumetric(unittest.TestCase):
+    def test_occupancy(self) -> None:
+        voxels = rasaeco.volumetric.occupancy(scenario=_scenario_with_single_cubelet())
+
+        self.assertEqual(rasaeco.volumetric.SHAPE, voxels.shape)
+        self.assertEqual(2 * 1 * 6, int(voxels.sum()))
+        self.assertTrue(voxels[1, 3, 0])
+        self.assertTrue(voxels[2, 3, 5])
+        self.assertFalse(voxels[2, 3, 6])
+
+    def test_occupancy_mask(self) -> None:
+        scenario = _scenario_with_single_cubelet()
+
+        self.assertEqual(2 * 1 * 6, rasaeco.volumetric.count(scenario.occupancy))
+        occupied = rasaeco.model.voxel_bit(phase=1, level=3, aspect=5)
+        self.assertTrue(scenario.occupancy >> occupied & 1)
+
+        not_occupied = rasaeco.model.voxel_bit(phase=2, level=3, aspect=6)
+        self.assertFalse(scenario.occupancy >> not_occupied & 1)
+
+        self.assertTrue(
+            np.array_equal(
+                rasaeco.volumetric.occupancy(scenario=scenario),
+                rasaeco.volumetric.unpack(masks=[scenario.occupancy])[0],
+            )
+        )
+
+    def test_set_operations_on_masks(self) -> None:
+        first = 0b0111
+        second = 0b1100
+        empty = 0
+
+        self.assertEqual(0b1111, rasaeco.volumetric.union([first, second]))
+        self.assertEqual(0b0100, rasaeco.volumetric.intersection([first, second]))
+
+        self.assertListEqual(
+            [[3, 1, 0], [1, 2, 0], [0, 0, 0]],
+            rasaeco.volumetric.overlap(
+                masks=[first, second, empty], other_masks=[first, second, empty]
+            ).tolist(),
+        )
+
+        self.assertListEqual(
+            [[1.0, 0.25, 0.0], [0.25, 1.0, 0.0], [0.0, 0.0, 0.0]],
+            rasaeco.volumetric.jaccard(
+                masks=[first, second, empty], other_masks=[first, second, empty]
+            ).tolist(),
+        )
+
+    def test_that_only_the_visible_faces_are_drawn(self) -> None:
+        voxels = rasaeco.volumetric.occupancy(scenario=_scenario_with_single_cubelet())
+
+        empty_plot = rasaeco.volumetric.project(
+            voxels=voxels & False, width=300, height=255, thumbnail=False
+        )
+        plot = rasaeco.volumetric.project(
+            voxels=voxels, width=300, height=255, thumbnail=False
+        )
+
+        # The column of 2 × 1 × 6 voxels exposes 6 faces to the right,
+        # 2 × 6 faces to the front and 2 faces on the top.
+        self.assertEqual(6 + 12 + 2, len(plot.polygons) - len(empty_plot.polygons))
+
+    def test_svg_and_png(self) -> None:
+        plot = rasaeco.volumetric.project(
+            voxels=rasaeco.volumetric.occupancy(
+                scenario=_scenario_with_single_cubelet()
+            ),
+            width=100,
+            height=75,
+            thumbnail=True,
+        )
+
+        root = ET.fromstring(rasaeco.volumetric.to_svg(plot=plot))
+        self.assertEqual("100", root.attrib["width"])
+        self.assertEqual("75", root.attrib["height"])
+
+        with PIL.Image.open(io.BytesIO(rasaeco.volumetric.to_png(plot=plot))) as image:
+            self.assertEqual((100, 75), image.size)
+
+
+if __name__ == "__main__":
+    unittest.main()